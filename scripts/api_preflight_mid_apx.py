@@ -8,7 +8,8 @@ from dotenv import load_dotenv
 repo_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(repo_root / "src"))
 
-from battery_tracker.sources.elexon_mid import BASE_URL, DATASETS_PATH  # noqa: E402
+from battery_tracker.sources.elexon_mid import DATASETS_PATH  # noqa: E402
+from battery_tracker.sources.http import get_base_url  # noqa: E402
 
 
 START_TS = "2025-01-01T00:00:00Z"
@@ -18,7 +19,7 @@ PROVIDER = "APXMIDP"
 
 def main() -> None:
     load_dotenv()
-    url = BASE_URL + DATASETS_PATH
+    url = get_base_url() + DATASETS_PATH
     params = {"from": START_TS, "to": END_TS, "dataProvider": PROVIDER}
 
     response = requests.get(url, params=params, timeout=30)
@@ -6,12 +6,15 @@ from pathlib import Path
 import requests
 from dotenv import load_dotenv
 
-BASE_URL = "https://data.elexon.co.uk/bmrs/api/v1"
-SYSTEM_PRICES_PATH = "/balancing/settlement/system-prices/{settlement_date}"
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.sources.elexon import SYSTEM_PRICES_PATH  # noqa: E402
+from battery_tracker.sources.http import get_base_url  # noqa: E402
 
 
 def build_url(settlement_date: str) -> str:
-    return BASE_URL + SYSTEM_PRICES_PATH.format(settlement_date=settlement_date)
+    return get_base_url() + SYSTEM_PRICES_PATH.format(settlement_date=settlement_date)
 
 
 def main() -> None:
@@ -48,8 +51,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    # Allow imports from the src directory if needed
-    repo_root = Path(__file__).resolve().parent.parent
-    sys.path.insert(0, str(repo_root / "src"))
-
     main()
@@ -1,5 +1,6 @@
 import os
 import sys
+from argparse import ArgumentParser
 from glob import glob
 from pathlib import Path
 
@@ -27,6 +28,13 @@ def read_migration_files() -> list[str]:
     return sorted(files)
 
 
+def read_profile_files(profile: str) -> list[str]:
+    profile_dir = Path(__file__).resolve().parent.parent / "sql" / "profiles" / profile
+    if not profile_dir.is_dir():
+        raise RuntimeError(f"Unknown storage profile: {profile}")
+    return sorted(glob(str(profile_dir / "*.sql")))
+
+
 def apply_migration_file(cursor, path: str) -> None:
     with open(path, "r", encoding="utf-8") as f:
         sql = f.read()
@@ -38,8 +46,18 @@ def apply_migration_file(cursor, path: str) -> None:
 
 
 def main() -> None:
+    parser = ArgumentParser(description="Apply SQL migrations to DATABASE_URL")
+    parser.add_argument(
+        "--profile",
+        help="Also apply an opt-in storage profile from sql/profiles (e.g. compact)",
+    )
+    args = parser.parse_args()
+
     database_url = get_database_url()
     migration_files = read_migration_files()
+    if args.profile:
+        # Profiles run after the base migrations, which must leave them in place.
+        migration_files += read_profile_files(args.profile)
     if not migration_files:
         print("No migration files found.")
         return
@@ -0,0 +1,72 @@
+import os
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
+from battery_tracker.ingest.fpn import backfill_fpn_for_fleet, load_bm_units  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Backfill physical notifications for a fleet of BM Units")
+    parser.add_argument("--bmu", action="append", default=[], help="BM Unit ID (repeatable)")
+    parser.add_argument("--bmu-file", help="File with one BM Unit ID per line")
+    parser.add_argument("--start", required=True, help="Start timestamp, e.g. 2025-01-01T00:00:00Z")
+    parser.add_argument("--end", required=True, help="End timestamp, e.g. 2025-02-01T00:00:00Z")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent window fetches")
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=None,
+        help="Upper bound on request rate to the Elexon API (overrides ELEXON_MAX_REQUESTS_PER_SECOND)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse responses incrementally to bound memory per worker (requires ijson)",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Normalize each response as NumPy arrays instead of per record (requires numpy)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Re-fetch windows the job ledger already records as done",
+    )
+    args = parser.parse_args()
+
+    bm_units = list(args.bmu)
+    if args.bmu_file:
+        bm_units.extend(unit for unit in load_bm_units(args.bmu_file) if unit not in bm_units)
+    if not bm_units:
+        parser.error("Provide at least one --bmu or a --bmu-file")
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    backfill_fpn_for_fleet(
+        database_url,
+        bm_units,
+        args.start,
+        args.end,
+        max_workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        stream=args.stream,
+        columnar=args.columnar,
+        resume=not args.no_resume,
+    )
+
+
+if __name__ == "__main__":
+    main()
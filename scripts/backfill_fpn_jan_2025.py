@@ -1,5 +1,6 @@
 import os
 import sys
+from argparse import ArgumentParser
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -7,7 +8,9 @@ from dotenv import load_dotenv
 repo_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(repo_root / "src"))
 
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
 from battery_tracker.ingest.fpn import backfill_fpn_for_bmu  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
 
 
 START_TS = "2025-01-01T00:00:00Z"
@@ -16,12 +19,48 @@ DEFAULT_BM_UNIT = "T_DRAXX-1"
 
 
 def main() -> None:
+    parser = ArgumentParser(description="Backfill physical notifications for January 2025")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent window fetches")
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=None,
+        help="Upper bound on request rate to the Elexon API (overrides ELEXON_MAX_REQUESTS_PER_SECOND)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse responses incrementally to bound memory per worker (requires ijson)",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Normalize each response as NumPy arrays instead of per record (requires numpy)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Re-fetch windows the job ledger already records as done",
+    )
+    args = parser.parse_args()
+
     load_dotenv()
+    configure_observability()
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
 
-    backfill_fpn_for_bmu(database_url, DEFAULT_BM_UNIT, START_TS, END_TS)
+    backfill_fpn_for_bmu(
+        database_url,
+        DEFAULT_BM_UNIT,
+        START_TS,
+        END_TS,
+        max_workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        stream=args.stream,
+        columnar=args.columnar,
+        resume=not args.no_resume,
+    )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import os
 import sys
+from argparse import ArgumentParser
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -7,7 +8,9 @@ from dotenv import load_dotenv
 repo_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(repo_root / "src"))
 
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
 from battery_tracker.ingest.wholesale_prices import backfill_mid_to_table  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
 
 
 START_TS = "2025-01-01T00:00:00Z"
@@ -17,12 +20,43 @@ TABLE_NAME = "wholesale_day_ahead_price_n2ex"
 
 
 def main() -> None:
+    parser = ArgumentParser(description="Backfill N2EX MID prices for January 2025")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent window fetches")
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=None,
+        help="Upper bound on request rate to the Elexon API (overrides ELEXON_MAX_REQUESTS_PER_SECOND)",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Normalize each response as NumPy arrays instead of per record (requires numpy)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Re-fetch windows the job ledger already records as done",
+    )
+    args = parser.parse_args()
+
     load_dotenv()
+    configure_observability()
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
 
-    backfill_mid_to_table(database_url, PROVIDER, TABLE_NAME, START_TS, END_TS)
+    backfill_mid_to_table(
+        database_url,
+        PROVIDER,
+        TABLE_NAME,
+        START_TS,
+        END_TS,
+        max_workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        columnar=args.columnar,
+        resume=not args.no_resume,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import date
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
+from battery_tracker.ingest.system_sell_price import (  # noqa: E402
+    SYSTEM_PRICE_FLUSH_ROWS,
+    backfill_system_sell_price_range,
+)
+from battery_tracker.observability import configure_observability  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Backfill every system price field for a range of settlement dates")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 1, 1), help="First settlement date")
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2025, 12, 31), help="Last settlement date")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent day fetches")
+    parser.add_argument(
+        "--flush-rows",
+        type=int,
+        default=SYSTEM_PRICE_FLUSH_ROWS,
+        help="Rows buffered per write transaction (default: about a month of settlement periods)",
+    )
+    parser.add_argument("--no-resume", action="store_true", help="Refetch days already recorded in the ledger")
+    args = parser.parse_args()
+    if args.end < args.start:
+        parser.error("--end must not be before --start")
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    rows = backfill_system_sell_price_range(
+        database_url,
+        args.start,
+        args.end,
+        max_workers=args.workers,
+        flush_rows=args.flush_rows,
+        resume=not args.no_resume,
+    )
+    print(f"Wrote {rows} system price rows for {args.start} to {args.end}")
+
+
+if __name__ == "__main__":
+    main()
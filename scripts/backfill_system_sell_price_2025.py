@@ -1,5 +1,6 @@
 import os
 import sys
+from argparse import ArgumentParser
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -9,15 +10,25 @@ repo_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(repo_root / "src"))
 
 from battery_tracker.ingest import backfill_system_sell_price_2025  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
 
 
 def main() -> None:
+    parser = ArgumentParser(description="Backfill system sell prices for 2025")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Re-fetch days the job ledger already records as done",
+    )
+    args = parser.parse_args()
+
     load_dotenv()
+    configure_observability()
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
 
-    backfill_system_sell_price_2025(database_url)
+    backfill_system_sell_price_2025(database_url, resume=not args.no_resume)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+import csv
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.analytics.revenue import (  # noqa: E402
+    PERIOD_REVENUE_COLUMNS,
+    REVENUE_SUMMARY_COLUMNS,
+    period_revenue,
+    revenue_summary,
+)
+from battery_tracker.ingest.fpn import load_bm_units  # noqa: E402
+from battery_tracker.ingest.settlement import settlement_day_start  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Value stored physical notifications against SSP, N2EX and APX prices")
+    parser.add_argument("--bmu", action="append", default=[], help="BM Unit ID (repeatable)")
+    parser.add_argument("--bmu-file", help="File with one BM Unit ID per line")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First settlement date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="Last settlement date (YYYY-MM-DD)")
+    parser.add_argument("--periods-csv", help="Also write per-period revenue to this CSV file")
+    args = parser.parse_args()
+
+    bm_units = list(args.bmu)
+    if args.bmu_file:
+        bm_units.extend(unit for unit in load_bm_units(args.bmu_file) if unit not in bm_units)
+    if not bm_units:
+        parser.error("Pass at least one --bmu or a --bmu-file")
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    start = settlement_day_start(args.start)
+    end = settlement_day_start(args.end + timedelta(days=1))
+    with psycopg2.connect(database_url) as conn:
+        summary = revenue_summary(conn, bm_units, start, end)
+        periods = period_revenue(conn, bm_units, start, end) if args.periods_csv else []
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(REVENUE_SUMMARY_COLUMNS)
+    writer.writerows(summary)
+    if args.periods_csv:
+        with open(args.periods_csv, "w", newline="", encoding="utf-8") as f:
+            period_writer = csv.writer(f)
+            period_writer.writerow(PERIOD_REVENUE_COLUMNS)
+            period_writer.writerows(periods)
+        print(f"Wrote {len(periods)} period rows to {args.periods_csv}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.fpn import load_bm_units  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
+from battery_tracker.warehouse.export import DEFAULT_EXPORT_DIR, export_table  # noqa: E402
+from battery_tracker.warehouse.tables import EXPORT_TABLES  # noqa: E402
+
+
+def month_bound(value: str) -> datetime:
+    return datetime.combine(date.fromisoformat(value), time(0, 0), tzinfo=timezone.utc)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Export warehouse tables to monthly Parquet partitions, only what changed")
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=tuple(EXPORT_TABLES),
+        help="Table to export (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--out",
+        default=os.getenv("PARQUET_EXPORT_DIR", DEFAULT_EXPORT_DIR),
+        help="Export directory (default: PARQUET_EXPORT_DIR or data/parquet)",
+    )
+    parser.add_argument("--start", type=month_bound, help="Export months from this UTC date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=month_bound, help="Export months before this UTC date (YYYY-MM-DD)")
+    parser.add_argument("--bmu", action="append", default=[], help="Only export this BM Unit's PN (repeatable)")
+    parser.add_argument("--bmu-file", help="File with one BM Unit ID per line to export PN for")
+    parser.add_argument("--full", action="store_true", help="Re-export every month, not only new or changed ones")
+    args = parser.parse_args()
+
+    bm_units = list(args.bmu)
+    if args.bmu_file:
+        bm_units.extend(unit for unit in load_bm_units(args.bmu_file) if unit not in bm_units)
+    tables = args.table or list(EXPORT_TABLES)
+    if bm_units and any(EXPORT_TABLES[table].key_column is None for table in tables):
+        parser.error("--bmu/--bmu-file only apply to --table final_physical_notifications")
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    with psycopg2.connect(database_url) as conn:
+        for table in tables:
+            export_table(conn, args.out, table, args.start, args.end, bm_units or None, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
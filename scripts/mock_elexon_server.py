@@ -0,0 +1,63 @@
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.observability import configure_logging  # noqa: E402
+from battery_tracker.sources.mock_elexon import DEFAULT_RETRY_AFTER, MockConfig, MockElexonServer  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Serve synthetic or recorded Elexon BMRS responses locally")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (0 picks a free port)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500/503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=DEFAULT_RETRY_AFTER,
+        help="Retry-After seconds sent with 429s",
+    )
+    parser.add_argument("--pn-segments", type=int, default=1, help="PN segments per settlement period")
+    parser.add_argument("--padding-bytes", type=int, default=0, help="Filler bytes added to every record")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic values and injected faults")
+    parser.add_argument("--replay-dir", help="Response cache directory recorded from the live API to replay")
+    parser.add_argument(
+        "--replay-only",
+        action="store_true",
+        help="Answer 404 instead of generating when a request was not recorded",
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    config = MockConfig(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        pn_segments=args.pn_segments,
+        padding_bytes=args.padding_bytes,
+        seed=args.seed,
+        replay_dir=args.replay_dir,
+        replay_only=args.replay_only,
+    )
+    server = MockElexonServer(config, args.host, args.port)
+    print(f"Serving mock Elexon API at {server.url}")
+    print(f"Point clients at it with ELEXON_BASE_URL={server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Requests served: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
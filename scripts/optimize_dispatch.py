@@ -0,0 +1,66 @@
+import csv
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import date
+from itertools import product
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.analytics.dispatch import BatteryConfig, load_daily_prices, optimize_batch  # noqa: E402
+from battery_tracker.analytics.revenue import PRICE_COLUMNS  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Theoretical best battery dispatch against stored prices")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First settlement date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="Last settlement date (YYYY-MM-DD)")
+    parser.add_argument("--price", default="n2ex", choices=["ssp", "n2ex", "apx"], help="Price series to trade")
+    parser.add_argument("--power", type=float, action="append", required=True, help="Power in MW (repeatable)")
+    parser.add_argument("--energy", type=float, action="append", required=True, help="Energy in MWh (repeatable)")
+    parser.add_argument("--efficiency", type=float, action="append", help="Round-trip efficiency (repeatable)")
+    parser.add_argument("--max-cycles", type=float, action="append", help="Daily cycle limit (repeatable)")
+    parser.add_argument("--soc-steps", type=int, default=40, help="State-of-charge grid resolution")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    # Every combination of the repeated options is one battery configuration.
+    configs = [
+        BatteryConfig(power, energy, efficiency, max_cycles, soc_steps=args.soc_steps)
+        for power, energy, efficiency, max_cycles in product(
+            args.power, args.energy, args.efficiency or [0.9], args.max_cycles or [None]
+        )
+    ]
+    price_column = next(column for column in PRICE_COLUMNS if column.startswith(args.price))
+    with psycopg2.connect(database_url) as conn:
+        days, prices = load_daily_prices(conn, args.start, args.end, price_column)
+    print(f"Optimizing {len(configs)} configurations over {len(days)} days", file=sys.stderr, flush=True)
+
+    results = optimize_batch(days, prices, configs, max_workers=args.workers)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["power_mw", "energy_mwh", "round_trip_efficiency", "max_cycles_per_day", "revenue_gbp", "cycles"])
+    for config, day_results in results.items():
+        writer.writerow(
+            [
+                config.power_mw,
+                config.energy_mwh,
+                config.round_trip_efficiency,
+                config.max_cycles_per_day,
+                round(sum(result.revenue_gbp for result in day_results), 2),
+                round(sum(result.cycles for result in day_results), 2),
+            ]
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.market_price import refresh_market_half_hourly  # noqa: E402
+from battery_tracker.ingest.settlement import settlement_day_start  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Recompute market_half_hourly for a range of settlement dates")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First settlement date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="Last settlement date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    with psycopg2.connect(database_url) as conn:
+        refresh_market_half_hourly(
+            conn, settlement_day_start(args.start), settlement_day_start(args.end + timedelta(days=1))
+        )
+        conn.commit()
+    print(f"Refreshed market_half_hourly from {args.start} to {args.end}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
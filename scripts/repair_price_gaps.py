@@ -0,0 +1,48 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import date
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.gaps import PRICE_TABLES, find_missing_periods, repair_gaps  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Find and re-fetch missing settlement periods in the price tables")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First settlement date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="Last settlement date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=PRICE_TABLES,
+        help="Table to scan (repeatable, default: all price tables)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report gaps without re-fetching")
+    args = parser.parse_args()
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    for table_name in args.table or PRICE_TABLES:
+        if not args.dry_run:
+            repair_gaps(database_url, table_name, args.start, args.end)
+            continue
+        with psycopg2.connect(database_url) as conn:
+            gaps = find_missing_periods(conn, table_name, args.start, args.end)
+        print(f"{table_name}: {sum(gaps.values())} missing periods across {len(gaps)} days")
+        for settlement_date, missing in gaps.items():
+            print(f"  {settlement_date}: {missing} missing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.bench.cases import (  # noqa: E402
+    DEFAULT_PIPELINE_DAYS,
+    DEFAULT_PIPELINE_LATENCY,
+    DEFAULT_PIPELINE_UNITS,
+    DEFAULT_SIZES,
+    normalization_cases,
+    pipeline_cases,
+    write_cases,
+)
+from battery_tracker.bench.runner import (  # noqa: E402
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WARMUP,
+    REGRESSED,
+    compare,
+    load_results,
+    run_suite,
+    save_results,
+)
+from battery_tracker.ingest.bulk import COPY_METHOD, VALUES_METHOD  # noqa: E402
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
+from battery_tracker.sources.mock_elexon import MockConfig  # noqa: E402
+
+GROUPS = ("parse", "normalize", "write", "pipeline")
+DATABASE_GROUPS = ("write", "pipeline")
+
+
+def parse_sizes(value: str) -> tuple:
+    return tuple(int(size) for size in value.split(","))
+
+
+def print_result(result) -> None:
+    print(
+        f"{result.name:<52} {result.median * 1000:10.2f} ms {result.throughput:14,.0f} {result.unit}/s",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark normalization, writes and full backfills against a baseline")
+    parser.add_argument("--group", action="append", choices=GROUPS, help="Group to run (repeatable, default: all)")
+    parser.add_argument("--filter", action="append", default=[], help="Only run cases whose name contains this")
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=DEFAULT_SIZES,
+        help="Comma-separated payload sizes in records (default: 1000,10000)",
+    )
+    parser.add_argument("--method", action="append", choices=(COPY_METHOD, VALUES_METHOD), help="Upsert method to time")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Untimed runs per case before timing")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("BENCH_DATABASE_URL"),
+        help="Scratch database for write and pipeline cases (default: BENCH_DATABASE_URL)",
+    )
+    parser.add_argument("--pipeline-days", type=int, default=DEFAULT_PIPELINE_DAYS, help="Days per pipeline backfill")
+    parser.add_argument("--pipeline-units", type=int, default=DEFAULT_PIPELINE_UNITS, help="BM Units per PN backfill")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=DEFAULT_PIPELINE_LATENCY * 1000,
+        help="Mock API latency per request in pipeline cases",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent fetches in pipeline cases")
+    parser.add_argument("--output", help="Results JSON path (default: bench_results/<UTC timestamp>.json)")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative change in median time flagged as a regression or improvement (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    configure_observability(level=os.getenv("LOG_LEVEL", "WARNING"))
+    # Read after load_dotenv so a BENCH_DATABASE_URL in .env is picked up.
+    database_url = args.database_url or os.getenv("BENCH_DATABASE_URL")
+
+    groups = args.group or list(GROUPS)
+    if not database_url:
+        skipped = [group for group in groups if group in DATABASE_GROUPS]
+        if skipped:
+            print(f"Skipping {', '.join(skipped)}: set BENCH_DATABASE_URL or pass --database-url", file=sys.stderr)
+        groups = [group for group in groups if group not in DATABASE_GROUPS]
+
+    conn = psycopg2.connect(database_url) if "write" in groups else None
+    try:
+        cases = []
+        if "parse" in groups or "normalize" in groups:
+            cases.extend(case for case in normalization_cases(args.sizes) if case.group in groups)
+        if conn is not None:
+            cases.extend(write_cases(conn, args.sizes, args.method or (COPY_METHOD, VALUES_METHOD)))
+        if "pipeline" in groups:
+            config = MockConfig(latency=args.latency_ms / 1000)
+            cases.extend(
+                pipeline_cases(database_url, args.pipeline_days, args.pipeline_units, config, args.workers)
+            )
+        if args.filter:
+            cases = [case for case in cases if any(text in case.name for text in args.filter)]
+        if not cases:
+            parser.error("No benchmark cases selected")
+
+        results = run_suite(cases, args.repeat, args.warmup, progress=print_result)
+    finally:
+        if conn is not None:
+            conn.rollback()
+            conn.close()
+
+    output = args.output or repo_root / "bench_results" / f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    config = {key: value for key, value in vars(args).items() if key not in ("database_url", "output", "baseline")}
+    print(f"Saved results to {save_results(output, results, config)}")
+
+    if not args.baseline:
+        return
+    comparisons = compare(results, load_results(args.baseline), args.threshold)
+    print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+    for comparison in comparisons:
+        change = f"{comparison.change:+.1%}" if comparison.change is not None else ""
+        print(f"{comparison.name:<52} {comparison.status:<10} {change}")
+    regressions = [comparison for comparison in comparisons if comparison.status == REGRESSED]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
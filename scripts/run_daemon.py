@@ -0,0 +1,98 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
+from battery_tracker.ingest.daemon import (  # noqa: E402
+    DEFAULT_DATASETS,
+    DEFAULT_DB_POOL_SIZE,
+    DEFAULT_INTERVALS,
+    DEFAULT_MAX_WINDOWS_PER_POLL,
+    default_schedules,
+    run_daemon,
+)
+from battery_tracker.ingest.fpn import load_bm_units  # noqa: E402
+from battery_tracker.ingest.incremental import DEFAULT_LOOKBACK, DEFAULT_START  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
+
+
+def parse_interval(value: str) -> tuple:
+    dataset, _, minutes = value.partition("=")
+    if dataset not in DEFAULT_INTERVALS or not minutes:
+        raise ValueError(f"Expected DATASET=MINUTES with DATASET one of {', '.join(DEFAULT_INTERVALS)}: {value}")
+    return dataset, timedelta(minutes=float(minutes))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Poll Elexon datasets on their own cadences and write new data as it lands")
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        choices=tuple(DEFAULT_INTERVALS),
+        help="Dataset to poll (repeatable, default: n2ex, apx and system_prices, plus pn when BM Units are given)",
+    )
+    parser.add_argument("--bmu", action="append", default=[], help="BM Unit ID for pn (repeatable)")
+    parser.add_argument("--bmu-file", help="File with one BM Unit ID per line for pn")
+    parser.add_argument(
+        "--interval",
+        action="append",
+        default=[],
+        help="Override a poll interval as DATASET=MINUTES (repeatable), e.g. n2ex=2",
+    )
+    parser.add_argument(
+        "--lookback-minutes",
+        type=int,
+        default=int(DEFAULT_LOOKBACK.total_seconds() // 60),
+        help="How far behind the high-water mark to re-fetch for late revisions",
+    )
+    parser.add_argument(
+        "--default-start",
+        default=DEFAULT_START.isoformat(),
+        help="Start timestamp used when a table is empty",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent window fetches")
+    parser.add_argument(
+        "--db-pool-size", type=int, default=DEFAULT_DB_POOL_SIZE, help="Database connections shared by all datasets"
+    )
+    parser.add_argument(
+        "--max-windows",
+        type=int,
+        default=DEFAULT_MAX_WINDOWS_PER_POLL,
+        help="Most windows fetched per key in one poll; a key further behind is polled again at once",
+    )
+    args = parser.parse_args()
+
+    bm_units = list(args.bmu)
+    if args.bmu_file:
+        bm_units.extend(unit for unit in load_bm_units(args.bmu_file) if unit not in bm_units)
+    datasets = args.dataset or [dataset for dataset in DEFAULT_DATASETS if dataset != "pn" or bm_units]
+    if "pn" in datasets and not bm_units:
+        parser.error("pn requires --bmu or --bmu-file")
+    try:
+        intervals = dict(parse_interval(value) for value in args.interval)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    default_start = datetime.fromisoformat(args.default_start.replace("Z", "+00:00"))
+    if default_start.tzinfo is None:
+        default_start = default_start.replace(tzinfo=timezone.utc)
+    schedules = default_schedules(datasets, bm_units, intervals, timedelta(minutes=args.lookback_minutes))
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    run_daemon(database_url, schedules, args.workers, args.db_pool_size, default_start, args.max_windows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
+from battery_tracker.ingest.engine import run_dataset  # noqa: E402
+from battery_tracker.ingest.registry import REGISTRY  # noqa: E402
+from battery_tracker.observability import configure_observability  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Backfill any registered Elexon dataset")
+    parser.add_argument("--dataset", required=True, choices=sorted(REGISTRY), help="Registered dataset name")
+    parser.add_argument("--key", action="append", help="Per-request key such as a BM Unit ID (repeatable)")
+    parser.add_argument("--start", required=True, help="Start timestamp, e.g. 2025-01-01T00:00:00Z")
+    parser.add_argument("--end", required=True, help="End timestamp, e.g. 2025-02-01T00:00:00Z")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent window fetches")
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=None,
+        help="Upper bound on request rate to the Elexon API (overrides ELEXON_MAX_REQUESTS_PER_SECOND)",
+    )
+    parser.add_argument("--stream", action="store_true", help="Parse responses incrementally (requires ijson)")
+    parser.add_argument("--columnar", action="store_true", help="Normalize with NumPy arrays (requires numpy)")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Re-fetch windows the job ledger already records as done",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    run_dataset(
+        database_url,
+        args.dataset,
+        args.start,
+        args.end,
+        keys=args.key or [None],
+        max_workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        stream=args.stream,
+        columnar=args.columnar,
+        resume=not args.no_resume,
+    )
+
+
+if __name__ == "__main__":
+    main()
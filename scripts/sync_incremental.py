@@ -0,0 +1,83 @@
+import os
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root / "src"))
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS  # noqa: E402
+from battery_tracker.ingest.fpn import load_bm_units  # noqa: E402
+from battery_tracker.ingest.incremental import (  # noqa: E402
+    DEFAULT_LOOKBACK,
+    DEFAULT_START,
+    sync_fpn,
+    sync_mid,
+    sync_system_sell_price,
+)
+from battery_tracker.observability import configure_observability  # noqa: E402
+
+MID_DATASETS = {
+    "n2ex": ("N2EXMIDP", "wholesale_day_ahead_price_n2ex"),
+    "apx": ("APXMIDP", "wholesale_intraday_price_apx"),
+}
+DATASETS = ("ssp", "n2ex", "apx", "fpn")
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Fetch only new data since each table's high-water mark")
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        choices=DATASETS,
+        help="Dataset to sync (repeatable, default: ssp, n2ex and apx, plus fpn when BM Units are given)",
+    )
+    parser.add_argument("--bmu", action="append", default=[], help="BM Unit ID for fpn (repeatable)")
+    parser.add_argument("--bmu-file", help="File with one BM Unit ID per line for fpn")
+    parser.add_argument(
+        "--lookback-minutes",
+        type=int,
+        default=int(DEFAULT_LOOKBACK.total_seconds() // 60),
+        help="How far behind the high-water mark to re-fetch for late revisions",
+    )
+    parser.add_argument(
+        "--default-start",
+        default=DEFAULT_START.isoformat(),
+        help="Start timestamp used when a table is empty",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent window fetches")
+    args = parser.parse_args()
+
+    bm_units = list(args.bmu)
+    if args.bmu_file:
+        bm_units.extend(unit for unit in load_bm_units(args.bmu_file) if unit not in bm_units)
+    datasets = args.dataset or [dataset for dataset in DATASETS if dataset != "fpn" or bm_units]
+    if "fpn" in datasets and not bm_units:
+        parser.error("fpn requires --bmu or --bmu-file")
+
+    lookback = timedelta(minutes=args.lookback_minutes)
+    default_start = datetime.fromisoformat(args.default_start.replace("Z", "+00:00"))
+    if default_start.tzinfo is None:
+        default_start = default_start.replace(tzinfo=timezone.utc)
+
+    load_dotenv()
+    configure_observability()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set. Create a .env file in the repo root.")
+
+    for dataset in datasets:
+        if dataset == "ssp":
+            sync_system_sell_price(database_url, lookback, default_start)
+        elif dataset == "fpn":
+            sync_fpn(database_url, bm_units, lookback, default_start, max_workers=args.workers)
+        else:
+            provider, table_name = MID_DATASETS[dataset]
+            sync_mid(database_url, provider, table_name, lookback, default_start, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+CREATE TABLE IF NOT EXISTS ingest_job_ledger (
+    dataset TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    job_key TEXT NOT NULL DEFAULT '',
+    window_start TIMESTAMPTZ NOT NULL,
+    window_end TIMESTAMPTZ NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('done', 'failed')),
+    row_count INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    duration_seconds DOUBLE PRECISION,
+    last_error TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (dataset, table_name, job_key, window_start, window_end)
+);
+
+CREATE INDEX IF NOT EXISTS ingest_job_ledger_status_idx ON ingest_job_ledger (status, dataset);
@@ -0,0 +1,66 @@
+-- Range-partition final_physical_notifications by UTC month. Ingest creates the
+-- partition for each incoming month through ensure_final_physical_notifications_partition.
+
+CREATE OR REPLACE FUNCTION ensure_final_physical_notifications_partition(p_ts TIMESTAMPTZ)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', p_ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    partition_name TEXT := 'final_physical_notifications_' || to_char(month_start AT TIME ZONE 'UTC', '"y"YYYY"m"MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF final_physical_notifications FOR VALUES FROM (%L) TO (%L)',
+        partition_name,
+        month_start,
+        month_start + INTERVAL '1 month'
+    );
+EXCEPTION
+    -- Another writer created the same partition concurrently.
+    WHEN duplicate_table THEN
+        NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    month TIMESTAMPTZ;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = to_regclass('final_physical_notifications') AND relkind = 'p'
+    ) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE final_physical_notifications RENAME TO final_physical_notifications_unpartitioned;
+    ALTER TABLE final_physical_notifications_unpartitioned
+        RENAME CONSTRAINT final_physical_notifications_pkey TO final_physical_notifications_unpartitioned_pkey;
+
+    CREATE TABLE final_physical_notifications (
+        ts TIMESTAMPTZ NOT NULL,
+        bmu_id TEXT NOT NULL,
+        fpn_mw NUMERIC NOT NULL,
+        ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (ts, bmu_id)
+    ) PARTITION BY RANGE (ts);
+
+    FOR month IN
+        SELECT DISTINCT date_trunc('month', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        FROM final_physical_notifications_unpartitioned
+    LOOP
+        PERFORM ensure_final_physical_notifications_partition(month);
+    END LOOP;
+
+    INSERT INTO final_physical_notifications (ts, bmu_id, fpn_mw, ingested_at)
+    SELECT ts, bmu_id, fpn_mw, ingested_at FROM final_physical_notifications_unpartitioned;
+
+    DROP TABLE final_physical_notifications_unpartitioned;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS final_physical_notifications_bmu_ts_idx
+    ON final_physical_notifications (bmu_id, ts);
@@ -0,0 +1,20 @@
+-- Settlement period calendar: one row per GB settlement period, starting at local
+-- midnight (Europe/London), so clock-change days have 46 or 50 periods.
+CREATE TABLE IF NOT EXISTS settlement_period (
+    settlement_date DATE NOT NULL,
+    settlement_period SMALLINT NOT NULL,
+    start_ts TIMESTAMPTZ NOT NULL UNIQUE,
+    PRIMARY KEY (settlement_date, settlement_period)
+);
+
+INSERT INTO settlement_period (settlement_date, settlement_period, start_ts)
+SELECT day::date,
+       ROW_NUMBER() OVER (PARTITION BY day ORDER BY periods.start_ts),
+       periods.start_ts
+FROM generate_series('2015-01-01'::timestamp, '2035-12-31'::timestamp, INTERVAL '1 day') AS day
+CROSS JOIN LATERAL generate_series(
+    day AT TIME ZONE 'Europe/London',
+    ((day + INTERVAL '1 day') AT TIME ZONE 'Europe/London') - INTERVAL '30 minutes',
+    INTERVAL '30 minutes'
+) AS periods(start_ts)
+WHERE NOT EXISTS (SELECT 1 FROM settlement_period);
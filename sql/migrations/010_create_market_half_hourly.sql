@@ -0,0 +1,56 @@
+-- One row per settlement period with all three price series and their spreads.
+-- Kept up to date by ingest calling refresh_market_half_hourly for the ts range it
+-- just wrote, rather than a full materialized view refresh.
+CREATE TABLE IF NOT EXISTS market_half_hourly (
+    ts TIMESTAMPTZ PRIMARY KEY,
+    settlement_date DATE NOT NULL,
+    settlement_period SMALLINT NOT NULL,
+    ssp_gbp_per_mwh NUMERIC,
+    n2ex_gbp_per_mwh NUMERIC,
+    apx_gbp_per_mwh NUMERIC,
+    ssp_minus_n2ex NUMERIC,
+    apx_minus_n2ex NUMERIC,
+    ssp_minus_apx NUMERIC,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS market_half_hourly_settlement_date_idx ON market_half_hourly (settlement_date);
+
+CREATE OR REPLACE FUNCTION refresh_market_half_hourly(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO market_half_hourly (
+        ts, settlement_date, settlement_period,
+        ssp_gbp_per_mwh, n2ex_gbp_per_mwh, apx_gbp_per_mwh,
+        ssp_minus_n2ex, apx_minus_n2ex, ssp_minus_apx
+    )
+    SELECT sp.start_ts,
+           sp.settlement_date,
+           sp.settlement_period,
+           ssp.ssp_gbp_per_mwh,
+           n2ex.price_gbp_per_mwh,
+           apx.price_gbp_per_mwh,
+           ssp.ssp_gbp_per_mwh - n2ex.price_gbp_per_mwh,
+           apx.price_gbp_per_mwh - n2ex.price_gbp_per_mwh,
+           ssp.ssp_gbp_per_mwh - apx.price_gbp_per_mwh
+    FROM settlement_period AS sp
+    LEFT JOIN system_sell_price AS ssp ON ssp.ts = sp.start_ts
+    LEFT JOIN wholesale_day_ahead_price_n2ex AS n2ex ON n2ex.ts = sp.start_ts
+    LEFT JOIN wholesale_intraday_price_apx AS apx ON apx.ts = sp.start_ts
+    WHERE sp.start_ts >= p_start
+      AND sp.start_ts < p_end
+      AND COALESCE(ssp.ssp_gbp_per_mwh, n2ex.price_gbp_per_mwh, apx.price_gbp_per_mwh) IS NOT NULL
+    ON CONFLICT (ts) DO UPDATE SET
+        ssp_gbp_per_mwh = EXCLUDED.ssp_gbp_per_mwh,
+        n2ex_gbp_per_mwh = EXCLUDED.n2ex_gbp_per_mwh,
+        apx_gbp_per_mwh = EXCLUDED.apx_gbp_per_mwh,
+        ssp_minus_n2ex = EXCLUDED.ssp_minus_n2ex,
+        apx_minus_n2ex = EXCLUDED.apx_minus_n2ex,
+        ssp_minus_apx = EXCLUDED.ssp_minus_apx,
+        refreshed_at = NOW();
+$$;
+
+-- Initial fill from whatever prices are already stored.
+SELECT refresh_market_half_hourly('2015-01-01T00:00:00Z', '2036-01-01T00:00:00Z')
+WHERE NOT EXISTS (SELECT 1 FROM market_half_hourly);
@@ -0,0 +1,4 @@
+-- Store each PN record as a linear segment from (ts, fpn_mw) to (time_to, level_to).
+-- Rows loaded before this migration leave both NULL and are read as flat steps.
+ALTER TABLE final_physical_notifications ADD COLUMN IF NOT EXISTS time_to TIMESTAMPTZ;
+ALTER TABLE final_physical_notifications ADD COLUMN IF NOT EXISTS level_to NUMERIC;
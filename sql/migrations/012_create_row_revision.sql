@@ -0,0 +1,13 @@
+-- Previous values of rows that an upsert changed. Rows re-sent with identical
+-- values are not rewritten and leave no revision.
+CREATE TABLE IF NOT EXISTS row_revision (
+    id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    key JSONB NOT NULL,
+    old_values JSONB NOT NULL,
+    new_values JSONB NOT NULL,
+    old_ingested_at TIMESTAMPTZ,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS row_revision_table_changed_idx ON row_revision (table_name, changed_at);
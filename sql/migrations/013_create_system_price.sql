@@ -0,0 +1,18 @@
+-- Every field of the Elexon system-prices response, one row per settlement period.
+-- system_sell_price keeps only the SSP and is written alongside; this table is
+-- separate so it survives the compact profile turning that table into a view.
+-- record holds the full source record, including fields without their own column.
+CREATE TABLE IF NOT EXISTS system_price (
+    ts TIMESTAMPTZ PRIMARY KEY,
+    settlement_date DATE NOT NULL,
+    settlement_period SMALLINT NOT NULL,
+    ssp_gbp_per_mwh NUMERIC NOT NULL,
+    sbp_gbp_per_mwh NUMERIC,
+    net_imbalance_volume_mwh NUMERIC,
+    price_derivation_code TEXT,
+    reserve_scarcity_price_gbp_per_mwh NUMERIC,
+    bsad_defaulted BOOLEAN,
+    published_at TIMESTAMPTZ,
+    record JSONB NOT NULL,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
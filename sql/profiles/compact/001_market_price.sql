@@ -0,0 +1,61 @@
+-- Compact storage profile: every half-hourly price series in one long float8 table,
+-- with the original tables replaced by read-only views of the same name.
+-- Not applied by default; run scripts/apply_migrations.py --profile compact.
+
+CREATE TABLE IF NOT EXISTS market_price_source (
+    source_id SMALLINT PRIMARY KEY,
+    table_name TEXT NOT NULL UNIQUE
+);
+
+INSERT INTO market_price_source (source_id, table_name)
+VALUES
+    (1, 'system_sell_price'),
+    (2, 'wholesale_day_ahead_price_n2ex'),
+    (3, 'wholesale_intraday_price_apx')
+ON CONFLICT (source_id) DO NOTHING;
+
+-- Fixed-width columns first and the smallint last to avoid alignment padding.
+CREATE TABLE IF NOT EXISTS market_price (
+    ts TIMESTAMPTZ NOT NULL,
+    price_gbp_per_mwh DOUBLE PRECISION NOT NULL,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    source_id SMALLINT NOT NULL REFERENCES market_price_source (source_id),
+    PRIMARY KEY (ts, source_id)
+);
+
+DO $$
+DECLARE
+    source RECORD;
+    value_column TEXT;
+BEGIN
+    FOR source IN SELECT source_id, table_name FROM market_price_source ORDER BY source_id LOOP
+        value_column := CASE source.table_name
+            WHEN 'system_sell_price' THEN 'ssp_gbp_per_mwh'
+            ELSE 'price_gbp_per_mwh'
+        END;
+
+        IF EXISTS (
+            SELECT 1 FROM pg_class
+            WHERE oid = to_regclass(source.table_name) AND relkind = 'r'
+        ) THEN
+            EXECUTE format(
+                'INSERT INTO market_price (ts, price_gbp_per_mwh, ingested_at, source_id) '
+                'SELECT ts, %I::double precision, ingested_at, %s FROM %I '
+                'ON CONFLICT (ts, source_id) DO NOTHING',
+                value_column,
+                source.source_id,
+                source.table_name
+            );
+            EXECUTE format('DROP TABLE %I', source.table_name);
+        END IF;
+
+        EXECUTE format(
+            'CREATE OR REPLACE VIEW %I AS '
+            'SELECT ts, price_gbp_per_mwh AS %I, ingested_at FROM market_price WHERE source_id = %s',
+            source.table_name,
+            value_column,
+            source.source_id
+        );
+    END LOOP;
+END;
+$$;
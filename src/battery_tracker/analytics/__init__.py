@@ -0,0 +1,23 @@
+"""Analytics over stored battery tracker data."""
+
+from battery_tracker.analytics.dispatch import BatteryConfig, optimize_batch, optimize_days
+from battery_tracker.analytics.resample import resample_segments
+from battery_tracker.analytics.revenue import (
+    period_energy,
+    period_revenue,
+    revenue_summary,
+    summarize,
+    value_energy,
+)
+
+__all__ = [
+    "BatteryConfig",
+    "optimize_batch",
+    "optimize_days",
+    "period_energy",
+    "period_revenue",
+    "resample_segments",
+    "revenue_summary",
+    "summarize",
+    "value_energy",
+]
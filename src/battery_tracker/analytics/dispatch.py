@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from battery_tracker.analytics.revenue import PRICE_COLUMNS
+
+# Perfect-foresight dispatch by dynamic programming over a discretized state of
+# charge. Each settlement day is solved independently, starting and ending at the
+# same state of charge, and all days for one battery are solved together as arrays.
+# Days that would exceed the daily cycle limit are re-solved with the energy
+# discharged so far added to the state.
+PERIOD_HOURS = 0.5
+DEFAULT_SOC_STEPS = 40
+
+
+@dataclass(frozen=True)
+class BatteryConfig:
+    """A battery to optimize. ``max_cycles_per_day`` counts full discharges of ``energy_mwh``."""
+
+    power_mw: float
+    energy_mwh: float
+    round_trip_efficiency: float = 0.9
+    max_cycles_per_day: Optional[float] = None
+    initial_soc_fraction: float = 0.5
+    soc_steps: int = DEFAULT_SOC_STEPS
+
+    def __post_init__(self) -> None:
+        if self.power_mw <= 0 or self.energy_mwh <= 0:
+            raise ValueError("power_mw and energy_mwh must be > 0")
+        if not 0 < self.round_trip_efficiency <= 1:
+            raise ValueError("round_trip_efficiency must be in (0, 1]")
+        if not 0 <= self.initial_soc_fraction <= 1:
+            raise ValueError("initial_soc_fraction must be in [0, 1]")
+        if self.soc_steps < 1:
+            raise ValueError("soc_steps must be >= 1")
+
+
+@dataclass(frozen=True)
+class DispatchResult:
+    config: BatteryConfig
+    settlement_date: date
+    revenue_gbp: float
+    charged_mwh: float
+    discharged_mwh: float
+    # Net export in MW per settlement period, only kept when requested.
+    schedule_mw: Optional[Tuple[float, ...]] = None
+
+    @property
+    def cycles(self) -> float:
+        return self.discharged_mwh / self.config.energy_mwh / math.sqrt(self.config.round_trip_efficiency)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for dispatch optimization. Install it with `pip install numpy`.")
+
+
+def _move_limits(config: BatteryConfig, step_mwh: float) -> Tuple[int, int]:
+    efficiency = math.sqrt(config.round_trip_efficiency)
+    # Power limits apply at the grid connection, so charging stores less and
+    # discharging draws more from the battery than crosses the meter.
+    max_charge = int(config.power_mw * PERIOD_HOURS * efficiency / step_mwh + 1e-9)
+    max_discharge = int(config.power_mw * PERIOD_HOURS / efficiency / step_mwh + 1e-9)
+    return min(max_charge, config.soc_steps), min(max_discharge, config.soc_steps)
+
+
+def _solve(
+    prices: "np.ndarray", config: BatteryConfig, budget: Optional[int] = None
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Solve every day (row of ``prices``) at once; NaN prices only allow holding charge.
+
+    With ``budget``, the state also tracks state-of-charge steps discharged so far,
+    which may not exceed ``budget``. Returns (revenue, charged MWh, discharged MWh,
+    net export MWh per period).
+    """
+
+    days, periods = prices.shape
+    levels = config.soc_steps + 1
+    used_levels = 1 if budget is None else budget + 1
+    step = config.energy_mwh / config.soc_steps
+    efficiency = math.sqrt(config.round_trip_efficiency)
+    max_charge, max_discharge = _move_limits(config, step)
+    start = int(round(config.initial_soc_fraction * config.soc_steps))
+
+    offsets = np.arange(-max_discharge, max_charge + 1)
+    # Grid energy per move: negative while charging, positive while discharging.
+    grid_mwh = np.where(offsets > 0, -offsets * step / efficiency, -offsets * step * efficiency)
+
+    value = np.full((days, levels, used_levels), -np.inf)
+    value[:, start, :] = 0.0
+    choices = np.zeros((periods, days, levels, used_levels), dtype=np.int16)
+    missing = np.isnan(prices)
+    filled = np.where(missing, 0.0, prices)
+
+    for t in range(periods - 1, -1, -1):
+        best = np.full((days, levels, used_levels), -np.inf)
+        best_offset = np.zeros((days, levels, used_levels), dtype=np.int16)
+        for offset, energy_mwh in zip(offsets.tolist(), grid_mwh.tolist()):
+            spent = 0 if budget is None else max(-offset, 0)
+            if spent >= used_levels:
+                continue
+            # States s whose move s -> s + offset stays within [0, levels).
+            low, high = max(0, -offset), min(levels, levels - offset)
+            reward = filled[:, t] * energy_mwh
+            if offset != 0:
+                reward = np.where(missing[:, t], -np.inf, reward)
+            candidate = reward[:, None, None] + value[:, low + offset : high + offset, spent:]
+            current = best[:, low:high, : used_levels - spent]
+            better = candidate > current
+            np.copyto(current, candidate, where=better)
+            np.copyto(best_offset[:, low:high, : used_levels - spent], offset, where=better)
+        value = best
+        choices[t] = best_offset
+
+    rows = np.arange(days)
+    soc = np.full(days, start)
+    spent_so_far = np.zeros(days, dtype=np.int64)
+    energy = np.zeros((days, periods))
+    for t in range(periods):
+        offset = choices[t, rows, soc, spent_so_far]
+        energy[:, t] = np.where(offset > 0, -offset * step / efficiency, -offset * step * efficiency)
+        soc = soc + offset
+        if budget is not None:
+            spent_so_far = spent_so_far + np.maximum(-offset, 0)
+
+    revenue = np.sum(filled * energy, axis=1)
+    charged = -np.sum(np.minimum(energy, 0), axis=1)
+    discharged = np.sum(np.maximum(energy, 0), axis=1)
+    return revenue, charged, discharged, energy
+
+
+def optimize_days(
+    prices: "np.ndarray", config: BatteryConfig
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Optimal dispatch for each row of ``prices`` (GBP/MWh per settlement period, NaN-padded).
+
+    Returns (revenue GBP, charged MWh, discharged MWh, net export MWh per period), all per day.
+    """
+
+    _require_numpy()
+    prices = np.asarray(prices, dtype=np.float64)
+    result = _solve(prices, config)
+    if config.max_cycles_per_day is None or not len(prices):
+        return result
+
+    # Re-solve only the days that break the cycle limit, tracking discharge so far.
+    budget = int(config.max_cycles_per_day * config.soc_steps + 1e-9)
+    step = config.energy_mwh / config.soc_steps
+    battery_discharged = result[2] / math.sqrt(config.round_trip_efficiency)
+    over = np.flatnonzero(battery_discharged > budget * step + 1e-9)
+    if not len(over):
+        return result
+    limited = _solve(prices[over], config, budget)
+    for full, part in zip(result, limited):
+        full[over] = part
+    return result
+
+
+def load_daily_prices(
+    conn, start_date: date, end_date: date, price_column: str = "n2ex_gbp_per_mwh"
+) -> Tuple[List[date], "np.ndarray"]:
+    """Load one price series from market_half_hourly as a (days, 50) array, NaN where missing."""
+
+    _require_numpy()
+    if price_column not in PRICE_COLUMNS:
+        raise ValueError(f"Unknown price column: {price_column}")
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT sp.settlement_date, sp.settlement_period, m.{price_column}::float8
+            FROM settlement_period AS sp
+            LEFT JOIN market_half_hourly AS m ON m.ts = sp.start_ts
+            WHERE sp.settlement_date BETWEEN %s AND %s
+            ORDER BY sp.settlement_date, sp.settlement_period
+            """,
+            (start_date, end_date),
+        )
+        rows = cur.fetchall()
+    days = sorted({row[0] for row in rows})
+    day_index = {day: i for i, day in enumerate(days)}
+    prices = np.full((len(days), 50), np.nan)
+    for settlement_date, settlement_period, price in rows:
+        if price is not None:
+            prices[day_index[settlement_date], settlement_period - 1] = price
+    return days, prices
+
+
+def _optimize_task(
+    task: Tuple[BatteryConfig, List[date], "np.ndarray", bool]
+) -> List[DispatchResult]:
+    config, days, prices, keep_schedule = task
+    revenue, charged, discharged, energy = optimize_days(prices, config)
+    return [
+        DispatchResult(
+            config=config,
+            settlement_date=day,
+            revenue_gbp=float(revenue[i]),
+            charged_mwh=float(charged[i]),
+            discharged_mwh=float(discharged[i]),
+            schedule_mw=tuple((energy[i] / PERIOD_HOURS).tolist()) if keep_schedule else None,
+        )
+        for i, day in enumerate(days)
+    ]
+
+
+def optimize_batch(
+    days: Sequence[date],
+    prices: "np.ndarray",
+    configs: Sequence[BatteryConfig],
+    max_workers: Optional[int] = None,
+    days_per_task: int = 92,
+    keep_schedule: bool = False,
+) -> Dict[BatteryConfig, List[DispatchResult]]:
+    """Optimize every config over every day on a process pool.
+
+    Work is split into (config, block of days) tasks; ``max_workers=1`` runs in-process.
+    """
+
+    _require_numpy()
+    tasks = [
+        (config, list(days[i : i + days_per_task]), prices[i : i + days_per_task], keep_schedule)
+        for config in configs
+        for i in range(0, len(days), days_per_task)
+    ]
+    results: Dict[BatteryConfig, List[DispatchResult]] = {config: [] for config in configs}
+    if max_workers == 1:
+        outputs = map(_optimize_task, tasks)
+        for task, output in zip(tasks, outputs):
+            results[task[0]].extend(output)
+        return results
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for task, output in zip(tasks, executor.map(_optimize_task, tasks)):
+            results[task[0]].extend(output)
+    return results
+
+
+__all__ = [
+    "BatteryConfig",
+    "DispatchResult",
+    "load_daily_prices",
+    "optimize_batch",
+    "optimize_days",
+]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import Dict
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# PN segments go linearly from level_from at time_from to level_to at time_to (epoch
+# seconds). Energy is integrated exactly by evaluating the cumulative energy curve,
+# which is piecewise quadratic, at every bin edge. Segments are assumed not to overlap.
+PERIOD_SECONDS = 1800
+MINUTE_SECONDS = 60
+
+SEGMENT_KEYS = ("bmu_id", "time_from", "time_to", "level_from", "level_to")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required to resample PN segments. Install it with `pip install numpy`.")
+
+
+def complete_segments(segments: Dict[str, "np.ndarray"]) -> Dict[str, "np.ndarray"]:
+    """Fill missing ends of segments sorted by (bmu_id, time_from).
+
+    A missing ``time_to`` (NaN) runs to the unit's next segment but not past the end
+    of its settlement period; a missing ``level_to`` keeps the level flat.
+    """
+
+    _require_numpy()
+    bmu_id = segments["bmu_id"]
+    time_from = segments["time_from"].astype(np.float64)
+    level_from = segments["level_from"].astype(np.float64)
+    time_to = segments["time_to"].astype(np.float64)
+    level_to = segments["level_to"].astype(np.float64)
+
+    period_end = time_from - time_from % PERIOD_SECONDS + PERIOD_SECONDS
+    next_from = np.full(len(time_from), np.inf)
+    if len(time_from) > 1:
+        same_unit = bmu_id[1:] == bmu_id[:-1]
+        next_from[:-1] = np.where(same_unit, time_from[1:], np.inf)
+    completed = dict(segments)
+    completed["time_from"] = time_from
+    completed["level_from"] = level_from
+    completed["time_to"] = np.where(np.isnan(time_to), np.minimum(next_from, period_end), time_to)
+    completed["level_to"] = np.where(np.isnan(level_to), level_from, level_to)
+    return completed
+
+
+def cumulative_energy(
+    time_from: "np.ndarray",
+    time_to: "np.ndarray",
+    level_from: "np.ndarray",
+    level_to: "np.ndarray",
+    edges: "np.ndarray",
+) -> "np.ndarray":
+    """Energy in MWh delivered by one unit's sorted segments up to each time in ``edges``."""
+
+    _require_numpy()
+    duration = np.maximum(time_to - time_from, 0.0)
+    slope = np.divide(level_to - level_from, duration, out=np.zeros_like(duration), where=duration > 0)
+    area = (level_from + level_to) / 2 * duration
+    before = np.concatenate(([0.0], np.cumsum(area)))
+
+    index = np.searchsorted(time_from, edges, side="right") - 1
+    inside = index >= 0
+    safe = np.maximum(index, 0)
+    elapsed = np.clip(edges - time_from[safe], 0.0, duration[safe])
+    partial = level_from[safe] * elapsed + slope[safe] * elapsed**2 / 2
+    mw_seconds = np.where(inside, before[safe] + partial, 0.0)
+    return mw_seconds / 3600.0
+
+
+def resample_segments(segments: Dict[str, "np.ndarray"], bin_seconds: int = PERIOD_SECONDS) -> Dict[str, "np.ndarray"]:
+    """Integrate segments sorted by (bmu_id, time_from) into fixed bins per unit.
+
+    Returns ``bmu_id``, bin start ``ts`` (epoch seconds), ``mwh`` and average ``mw`` per
+    bin, covering each unit from its first segment to its last.
+    """
+
+    _require_numpy()
+    segments = complete_segments(segments)
+    bmu_id = segments["bmu_id"]
+    if not len(bmu_id):
+        empty = np.array([], dtype=np.float64)
+        return {"bmu_id": bmu_id, "ts": np.array([], dtype=np.int64), "mwh": empty, "mw": empty}
+
+    boundaries = np.flatnonzero(np.concatenate(([True], bmu_id[1:] != bmu_id[:-1], [True])))
+    units, starts, energy = [], [], []
+    for first, last in zip(boundaries[:-1], boundaries[1:]):
+        part = {key: segments[key][first:last] for key in SEGMENT_KEYS[1:]}
+        begin = int(part["time_from"][0] // bin_seconds * bin_seconds)
+        end = int(-(-np.max(part["time_to"]) // bin_seconds) * bin_seconds)
+        edges = np.arange(begin, max(end, begin + bin_seconds) + 1, bin_seconds, dtype=np.int64)
+        curve = cumulative_energy(
+            part["time_from"], part["time_to"], part["level_from"], part["level_to"], edges.astype(np.float64)
+        )
+        units.append(np.full(len(edges) - 1, bmu_id[first]))
+        starts.append(edges[:-1])
+        energy.append(np.diff(curve))
+
+    mwh = np.concatenate(energy)
+    return {
+        "bmu_id": np.concatenate(units),
+        "ts": np.concatenate(starts),
+        "mwh": mwh,
+        "mw": mwh * 3600.0 / bin_seconds,
+    }
+
+
+__all__ = [
+    "MINUTE_SECONDS",
+    "PERIOD_SECONDS",
+    "complete_segments",
+    "cumulative_energy",
+    "resample_segments",
+]
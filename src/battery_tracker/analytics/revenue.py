@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from battery_tracker.analytics.resample import PERIOD_SECONDS, SEGMENT_KEYS, resample_segments
+
+# PN rows are linear segments from (ts, fpn_mw) to (time_to, level_to). Rows without
+# an end (loaded before segments were stored) hold their level until the unit's next
+# row, never past the end of their own settlement period. Positive MW is export, so
+# revenue = MWh * price is what the unit earned (or paid when negative).
+PRICE_COLUMNS: Tuple[str, ...] = ("ssp_gbp_per_mwh", "n2ex_gbp_per_mwh", "apx_gbp_per_mwh")
+REVENUE_COLUMNS: Tuple[str, ...] = ("ssp_revenue_gbp", "n2ex_revenue_gbp", "apx_revenue_gbp")
+
+PERIOD_ENERGY_CTE = """
+    WITH points AS (
+        SELECT bmu_id,
+               ts,
+               fpn_mw,
+               COALESCE(level_to, fpn_mw) AS level_to,
+               time_to,
+               LEAD(ts) OVER (PARTITION BY bmu_id ORDER BY ts) AS next_ts,
+               to_timestamp(floor(extract(epoch FROM ts) / 1800) * 1800) AS period_start
+        FROM final_physical_notifications
+        WHERE bmu_id = ANY(%(bm_units)s)
+          AND ts >= %(start)s
+          AND ts < %(end)s
+    ),
+    -- PN segments are submitted per settlement period, so each one is credited to
+    -- the period it starts in.
+    energy AS (
+        SELECT bmu_id,
+               period_start AS ts,
+               SUM(
+                   (fpn_mw + level_to) / 2 * extract(
+                       epoch FROM COALESCE(
+                           time_to,
+                           LEAST(COALESCE(next_ts, 'infinity'), period_start + INTERVAL '30 minutes')
+                       ) - ts
+                   ) / 3600
+               ) AS mwh
+        FROM points
+        GROUP BY bmu_id, period_start
+    )
+"""
+
+PERIOD_REVENUE_COLUMNS: Tuple[str, ...] = (
+    "bmu_id",
+    "ts",
+    "settlement_date",
+    "settlement_period",
+    "mwh",
+    *PRICE_COLUMNS,
+    *REVENUE_COLUMNS,
+)
+PERIOD_REVENUE_QUERY = (
+    PERIOD_ENERGY_CTE
+    + """
+    SELECT energy.bmu_id,
+           energy.ts,
+           sp.settlement_date,
+           sp.settlement_period,
+           energy.mwh,
+           m.ssp_gbp_per_mwh,
+           m.n2ex_gbp_per_mwh,
+           m.apx_gbp_per_mwh,
+           energy.mwh * m.ssp_gbp_per_mwh,
+           energy.mwh * m.n2ex_gbp_per_mwh,
+           energy.mwh * m.apx_gbp_per_mwh
+    FROM energy
+    LEFT JOIN settlement_period AS sp ON sp.start_ts = energy.ts
+    LEFT JOIN market_half_hourly AS m ON m.ts = energy.ts
+    ORDER BY energy.bmu_id, energy.ts
+"""
+)
+
+REVENUE_SUMMARY_COLUMNS: Tuple[str, ...] = (
+    "bmu_id",
+    "periods",
+    "mwh_exported",
+    "mwh_imported",
+    "net_mwh",
+    *REVENUE_COLUMNS,
+)
+REVENUE_SUMMARY_QUERY = (
+    PERIOD_ENERGY_CTE
+    + """
+    SELECT energy.bmu_id,
+           COUNT(*),
+           SUM(GREATEST(energy.mwh, 0)),
+           SUM(LEAST(energy.mwh, 0)),
+           SUM(energy.mwh),
+           SUM(energy.mwh * m.ssp_gbp_per_mwh),
+           SUM(energy.mwh * m.n2ex_gbp_per_mwh),
+           SUM(energy.mwh * m.apx_gbp_per_mwh)
+    FROM energy
+    LEFT JOIN market_half_hourly AS m ON m.ts = energy.ts
+    GROUP BY energy.bmu_id
+    ORDER BY energy.bmu_id
+"""
+)
+
+
+def period_revenue(conn, bm_units: Sequence[str], start: datetime, end: datetime) -> List[Tuple]:
+    """Per-period MWh and revenue for each BM Unit in [start, end), computed in the database.
+
+    Rows follow ``PERIOD_REVENUE_COLUMNS``; prices and revenue are NULL where a price is missing.
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(PERIOD_REVENUE_QUERY, {"bm_units": list(bm_units), "start": start, "end": end})
+        return cur.fetchall()
+
+
+def revenue_summary(conn, bm_units: Sequence[str], start: datetime, end: datetime) -> List[Tuple]:
+    """Totals per BM Unit over [start, end), computed in the database. Rows follow ``REVENUE_SUMMARY_COLUMNS``."""
+
+    with conn.cursor() as cur:
+        cur.execute(REVENUE_SUMMARY_QUERY, {"bm_units": list(bm_units), "start": start, "end": end})
+        return cur.fetchall()
+
+
+# Array path: load the raw series once and do the alignment in NumPy, for callers
+# that go on to work with the arrays (e.g. the dispatch optimizer).
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for array revenue calculations. Install it with `pip install numpy`.")
+
+
+def load_pn_segments(conn, bm_units: Sequence[str], start: datetime, end: datetime) -> Dict[str, "np.ndarray"]:
+    """Load PN segments sorted by (bmu_id, time_from), times in epoch seconds and missing ends as NaN."""
+
+    _require_numpy()
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT bmu_id,
+                   extract(epoch FROM ts)::float8,
+                   extract(epoch FROM time_to)::float8,
+                   fpn_mw::float8,
+                   level_to::float8
+            FROM final_physical_notifications
+            WHERE bmu_id = ANY(%s) AND ts >= %s AND ts < %s
+            ORDER BY bmu_id, ts
+            """,
+            (list(bm_units), start, end),
+        )
+        rows = cur.fetchall()
+    if not rows:
+        empty = np.array([], dtype=np.float64)
+        return {"bmu_id": np.array([], dtype=str), **{key: empty for key in SEGMENT_KEYS[1:]}}
+    bmu_id, *values = zip(*rows)
+    segments = {"bmu_id": np.asarray(bmu_id)}
+    for key, column in zip(("time_from", "time_to", "level_from", "level_to"), values):
+        segments[key] = np.array(column, dtype=np.float64)
+    return segments
+
+
+def load_prices(conn, start: datetime, end: datetime) -> Dict[str, "np.ndarray"]:
+    """Load market_half_hourly prices as arrays keyed by period start in epoch seconds; missing prices are NaN."""
+
+    _require_numpy()
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT extract(epoch FROM ts)::bigint, {", ".join(f"{column}::float8" for column in PRICE_COLUMNS)}
+            FROM market_half_hourly
+            WHERE ts >= %s AND ts < %s
+            ORDER BY ts
+            """,
+            (start, end),
+        )
+        rows = cur.fetchall()
+    table = np.array(rows, dtype=np.float64).reshape(-1, 1 + len(PRICE_COLUMNS))
+    prices = {"ts": table[:, 0].astype(np.int64)}
+    for index, column in enumerate(PRICE_COLUMNS, start=1):
+        prices[column] = table[:, index]
+    return prices
+
+
+def period_energy(segments: Dict[str, "np.ndarray"]) -> Dict[str, "np.ndarray"]:
+    """Integrate PN segments into MWh per (bmu_id, settlement period start)."""
+
+    energy = resample_segments(segments, PERIOD_SECONDS)
+    return {"bmu_id": energy["bmu_id"], "ts": energy["ts"], "mwh": energy["mwh"]}
+
+
+def value_energy(energy: Dict[str, "np.ndarray"], prices: Dict[str, "np.ndarray"]) -> Dict[str, "np.ndarray"]:
+    """Attach each period's prices and revenue to ``energy``; NaN where a price is missing."""
+
+    _require_numpy()
+    valued = dict(energy)
+    index = np.searchsorted(prices["ts"], energy["ts"])
+    index = np.minimum(index, max(len(prices["ts"]) - 1, 0))
+    matched = (
+        np.zeros(len(energy["ts"]), dtype=bool) if not len(prices["ts"]) else prices["ts"][index] == energy["ts"]
+    )
+    for price_column, revenue_column in zip(PRICE_COLUMNS, REVENUE_COLUMNS):
+        price = np.full(len(energy["ts"]), np.nan)
+        if len(prices["ts"]):
+            price[matched] = prices[price_column][index[matched]]
+        valued[price_column] = price
+        valued[revenue_column] = energy["mwh"] * price
+    return valued
+
+
+def summarize(valued: Dict[str, "np.ndarray"]) -> Dict[str, Dict[str, float]]:
+    """Totals per BM Unit from ``value_energy`` output, matching ``REVENUE_SUMMARY_COLUMNS``."""
+
+    _require_numpy()
+    units, inverse = np.unique(valued["bmu_id"], return_inverse=True)
+    mwh = valued["mwh"]
+    totals = {
+        "periods": np.bincount(inverse, minlength=len(units)),
+        "mwh_exported": np.bincount(inverse, weights=np.maximum(mwh, 0), minlength=len(units)),
+        "mwh_imported": np.bincount(inverse, weights=np.minimum(mwh, 0), minlength=len(units)),
+        "net_mwh": np.bincount(inverse, weights=mwh, minlength=len(units)),
+    }
+    for column in REVENUE_COLUMNS:
+        totals[column] = np.bincount(inverse, weights=np.nan_to_num(valued[column]), minlength=len(units))
+    return {
+        str(unit): {name: float(values[i]) for name, values in totals.items()} for i, unit in enumerate(units.tolist())
+    }
+
+
+def to_datetimes(epoch_seconds: "np.ndarray") -> List[datetime]:
+    return [datetime.fromtimestamp(int(value), tz=timezone.utc) for value in epoch_seconds.tolist()]
+
+
+__all__ = [
+    "PERIOD_REVENUE_COLUMNS",
+    "PRICE_COLUMNS",
+    "REVENUE_COLUMNS",
+    "REVENUE_SUMMARY_COLUMNS",
+    "load_pn_segments",
+    "load_prices",
+    "period_energy",
+    "period_revenue",
+    "revenue_summary",
+    "summarize",
+    "to_datetimes",
+    "value_energy",
+]
@@ -0,0 +1,23 @@
+"""Benchmarks for normalization, writes and full backfills, with baseline comparison."""
+
+from battery_tracker.bench.cases import normalization_cases, pipeline_cases, write_cases
+from battery_tracker.bench.runner import (
+    BenchmarkCase,
+    BenchmarkResult,
+    compare,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkResult",
+    "compare",
+    "load_results",
+    "normalization_cases",
+    "pipeline_cases",
+    "run_suite",
+    "save_results",
+    "write_cases",
+]
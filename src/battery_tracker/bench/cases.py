@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+from psycopg2 import sql
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from battery_tracker.bench.runner import BenchmarkCase
+from battery_tracker.ingest.bulk import COPY_METHOD, VALUES_METHOD
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS
+from battery_tracker.ingest.engine import resolve_write_spec, run_dataset, write_window
+from battery_tracker.ingest.ledger import LEDGER_TABLE
+from battery_tracker.ingest.market_price import (
+    MARKET_HALF_HOURLY_TABLE,
+    MARKET_PRICE_TABLE,
+    PRICE_SOURCE_IDS,
+    compact_prices_enabled,
+)
+from battery_tracker.ingest.registry import REGISTRY, SSP, SYSTEM_PRICES, DatasetSpec
+from battery_tracker.ingest.settlement import PERIOD_LENGTH
+from battery_tracker.ingest.windows import to_iso
+from battery_tracker.sources.cache import configure_cache
+from battery_tracker.sources.http import configure_base_url, get_base_url
+from battery_tracker.sources.mock_elexon import MockConfig, MockElexonServer, SyntheticElexon
+from battery_tracker.sources.retry import configure_retry
+
+# Payloads come from the mock API's synthetic generator, starting at BENCH_START so
+# they never collide with ingested history. Write cases run each upsert inside a
+# transaction that is rolled back, so they leave the database untouched. Pipeline
+# cases run full backfills against an in-process mock server and commit, so they
+# clear their range before every run; point them at a scratch database.
+BENCH_START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+# Price tables a dataset writes besides its own table, through its after_write hook.
+DERIVED_PRICE_TABLES: Dict[str, Tuple[str, ...]] = {SYSTEM_PRICES.name: (SSP.table,)}
+BENCH_KEY = "T_BENCH-1"
+DEFAULT_SIZES = (1_000, 10_000)
+DEFAULT_PIPELINE_DAYS = 7
+DEFAULT_PIPELINE_UNITS = 2
+DEFAULT_PIPELINE_LATENCY = 0.05
+
+INSERT = "insert"
+UNCHANGED = "unchanged"
+UPDATE = "update"
+WRITE_SCENARIOS = (INSERT, UNCHANGED, UPDATE)
+
+
+def _key(spec: DatasetSpec) -> Optional[str]:
+    return BENCH_KEY if spec.key_param is not None else None
+
+
+def synthetic_records(
+    spec: DatasetSpec,
+    size: int,
+    synthetic: Optional[SyntheticElexon] = None,
+    start: datetime = BENCH_START,
+) -> List[Dict[str, Any]]:
+    """The first ``size`` records the mock API returns for consecutive windows of ``spec`` from ``start``."""
+
+    synthetic = synthetic or SyntheticElexon()
+    records: List[Dict[str, Any]] = []
+    window_start = start
+    while len(records) < size:
+        window = (window_start, window_start + spec.window)
+        path, params = spec.build_request(window, _key(spec))
+        batch = synthetic.records(path, params)
+        if batch is None:
+            raise ValueError(f"The mock API has no payload for dataset {spec.name}")
+        records.extend(batch)
+        window_start = window[1]
+    return records[:size]
+
+
+def _has_columnar(spec: DatasetSpec) -> bool:
+    return np is not None and spec.normalize_columns is not None
+
+
+def normalization_cases(sizes: Sequence[int] = DEFAULT_SIZES) -> List[BenchmarkCase]:
+    """JSON parsing and row/columnar normalization throughput for every registered dataset."""
+
+    cases = []
+    for spec in REGISTRY.values():
+        key = _key(spec)
+        for size in sizes:
+            records = synthetic_records(spec, size)
+            body = json.dumps({"data": records}).encode("utf-8")
+            cases.append(
+                BenchmarkCase(
+                    f"parse/{spec.name}/{size}",
+                    "parse",
+                    lambda _, s=spec, b=body: s.parse(json.loads(b)),
+                    size,
+                )
+            )
+            cases.append(
+                BenchmarkCase(
+                    f"normalize/{spec.name}/rows/{size}",
+                    "normalize",
+                    lambda _, s=spec, r=records, k=key: s.normalize(r, k),
+                    size,
+                )
+            )
+            if _has_columnar(spec):
+                cases.append(
+                    BenchmarkCase(
+                        f"normalize/{spec.name}/columns/{size}",
+                        "normalize",
+                        lambda _, s=spec, r=records, k=key: s.normalize_columns(r, k),
+                        size,
+                    )
+                )
+    return cases
+
+
+def _normalized(spec: DatasetSpec, records: List[Dict[str, Any]], columnar: bool) -> Any:
+    if columnar:
+        return spec.normalize_columns(records, _key(spec))
+    return spec.normalize(records, _key(spec))
+
+
+def _write_case(
+    conn,
+    spec: DatasetSpec,
+    size: int,
+    method: str,
+    scenario: str,
+    columnar: bool,
+) -> BenchmarkCase:
+    write_spec = resolve_write_spec(conn, spec, spec.table)
+    rows = _normalized(write_spec, synthetic_records(spec, size), columnar)
+    if scenario == UPDATE:
+        # Same keys, different values: every row is rewritten and gets a revision.
+        previous = _normalized(write_spec, synthetic_records(spec, size, SyntheticElexon(seed=1)), columnar)
+    else:
+        previous = rows if scenario == UNCHANGED else None
+
+    def setup() -> None:
+        conn.rollback()
+        if previous is not None:
+            write_window(conn, write_spec, previous, spec.table, columnar, method)
+
+    def run(_: Any) -> None:
+        write_window(conn, write_spec, rows, spec.table, columnar, method)
+
+    shape = "columns" if columnar else "rows"
+    return BenchmarkCase(
+        f"write/{spec.name}/{method}/{shape}/{scenario}/{size}",
+        "write",
+        run,
+        size,
+        unit="rows",
+        setup=setup,
+        teardown=lambda _: conn.rollback(),
+    )
+
+
+def write_cases(
+    conn,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    methods: Sequence[str] = (COPY_METHOD, VALUES_METHOD),
+    scenarios: Sequence[str] = WRITE_SCENARIOS,
+) -> List[BenchmarkCase]:
+    """Upsert throughput per dataset, method and scenario on ``conn``; nothing is committed.
+
+    Rows are written with ``write_window``, so partition creation, change detection,
+    revisions and the market_half_hourly refresh are included, as in a backfill.
+    Columnar writes are only timed with COPY.
+    """
+
+    cases = []
+    for spec in REGISTRY.values():
+        for size in sizes:
+            for method in methods:
+                for scenario in scenarios:
+                    cases.append(_write_case(conn, spec, size, method, scenario, columnar=False))
+                    if method == COPY_METHOD and _has_columnar(spec):
+                        cases.append(_write_case(conn, spec, size, method, scenario, columnar=True))
+    return cases
+
+
+def _delete_range(
+    cur, table: str, start: datetime, end: datetime, filters: Sequence[sql.Composable] = (), **params: Any
+) -> None:
+    conditions = [sql.SQL("ts >= %(start)s"), sql.SQL("ts < %(end)s"), *filters]
+    cur.execute(
+        sql.SQL("DELETE FROM {table} WHERE {conditions}").format(
+            table=sql.Identifier(table),
+            conditions=sql.SQL(" AND ").join(conditions),
+        ),
+        {"start": start, "end": end, **params},
+    )
+
+
+def clear_range(conn, spec: DatasetSpec, keys: Sequence[Optional[str]], start: datetime, end: datetime) -> None:
+    """Delete what a backfill of ``spec`` over [start, end) for ``keys`` wrote. The caller commits.
+
+    This covers the rows derived from the write (the price tables in
+    DERIVED_PRICE_TABLES and market_half_hourly) and the run's job ledger entries
+    as well, so every repeat starts from the same state.
+    """
+
+    write_spec = resolve_write_spec(conn, spec, spec.table)
+    filters: List[sql.Composable] = []
+    params: Dict[str, Any] = {}
+    if write_spec.table == MARKET_PRICE_TABLE:
+        filters.append(sql.SQL("source_id = %(source_id)s"))
+        params["source_id"] = PRICE_SOURCE_IDS[spec.table]
+    if spec.key_param is not None:
+        (key_column,) = [column for column in spec.conflict_columns if column != "ts"]
+        filters.append(sql.SQL("{} = ANY(%(keys)s)").format(sql.Identifier(key_column)))
+        params["keys"] = list(keys)
+    derived = DERIVED_PRICE_TABLES.get(spec.name, ())
+    with conn.cursor() as cur:
+        _delete_range(cur, write_spec.table, start, end, filters, **params)
+        for table in derived:
+            if compact_prices_enabled(conn):
+                source_filter = [sql.SQL("source_id = %(source_id)s")]
+                _delete_range(cur, MARKET_PRICE_TABLE, start, end, source_filter, source_id=PRICE_SOURCE_IDS[table])
+            else:
+                _delete_range(cur, table, start, end)
+        if spec.table in PRICE_SOURCE_IDS or derived:
+            _delete_range(cur, MARKET_HALF_HOURLY_TABLE, start, end)
+        cur.execute(
+            sql.SQL(
+                "DELETE FROM {ledger} WHERE dataset = %s AND table_name = %s AND job_key = ANY(%s)"
+                " AND window_start >= %s AND window_end <= %s"
+            ).format(ledger=sql.Identifier(LEDGER_TABLE)),
+            (spec.name, spec.table, [key or "" for key in keys], start, end),
+        )
+
+
+def pipeline_cases(
+    database_url: str,
+    days: int = DEFAULT_PIPELINE_DAYS,
+    bm_units: int = DEFAULT_PIPELINE_UNITS,
+    config: MockConfig = MockConfig(latency=DEFAULT_PIPELINE_LATENCY),
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    repeat: int = 3,
+) -> List[BenchmarkCase]:
+    """Time ``run_dataset`` end to end for every registered dataset against a local mock API.
+
+    The response cache and any request rate limit are switched off for the run.
+    """
+
+    start = BENCH_START
+    end = start + timedelta(days=days)
+    cases = []
+    for spec in REGISTRY.values():
+        if spec.key_param is not None:
+            keys: List[Optional[str]] = [f"T_BENCH-{i}" for i in range(1, bm_units + 1)]
+        else:
+            keys = [None]
+        per_period = config.pn_segments if spec.key_param is not None else 1
+        items = int((end - start) / PERIOD_LENGTH) * per_period * len(keys)
+
+        def setup(spec: DatasetSpec = spec, keys: List[Optional[str]] = keys) -> Dict[str, Any]:
+            conn = psycopg2.connect(database_url)
+            try:
+                clear_range(conn, spec, keys, start, end)
+                conn.commit()
+            finally:
+                conn.close()
+            configure_cache(None)
+            configure_retry()
+            state = {"server": MockElexonServer(config).start(), "base_url": get_base_url()}
+            configure_base_url(state["server"].url)
+            return state
+
+        def run(state: Dict[str, Any], spec: DatasetSpec = spec, keys: List[Optional[str]] = keys) -> None:
+            run_dataset(database_url, spec, to_iso(start), to_iso(end), keys, max_workers=max_workers, resume=False)
+
+        def teardown(state: Dict[str, Any]) -> None:
+            configure_base_url(state["base_url"])
+            state["server"].stop()
+
+        cases.append(
+            BenchmarkCase(
+                f"pipeline/{spec.name}/{days}d",
+                "pipeline",
+                run,
+                items,
+                setup=setup,
+                teardown=teardown,
+                repeat=repeat,
+                warmup=0,
+            )
+        )
+    return cases
+
+
+__all__ = [
+    "BENCH_KEY",
+    "BENCH_START",
+    "DEFAULT_PIPELINE_DAYS",
+    "DEFAULT_PIPELINE_LATENCY",
+    "DEFAULT_PIPELINE_UNITS",
+    "DEFAULT_SIZES",
+    "DERIVED_PRICE_TABLES",
+    "WRITE_SCENARIOS",
+    "clear_range",
+    "normalization_cases",
+    "pipeline_cases",
+    "synthetic_records",
+    "write_cases",
+]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+# A case times ``run`` ``repeat`` times after ``warmup`` untimed runs. ``setup``
+# runs before every call (untimed) and its return value is passed to ``run``;
+# ``teardown`` runs after every call. Results are compared on the median, which
+# is less sensitive to one slow run than the mean.
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+DEFAULT_THRESHOLD = 0.10
+
+REGRESSED = "regressed"
+IMPROVED = "improved"
+UNCHANGED = "unchanged"
+NEW = "new"
+MISSING = "missing"
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    group: str
+    run: Callable[[Any], Any]
+    # Work done per run, e.g. records normalized or rows written, for throughput.
+    items: int
+    unit: str = "records"
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[Any], None]] = None
+    # Overrides the suite's repeat/warmup for slow cases.
+    repeat: Optional[int] = None
+    warmup: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    group: str
+    items: int
+    unit: str
+    seconds: List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.seconds)
+
+    @property
+    def throughput(self) -> float:
+        """Items per second at the median time."""
+
+        return self.items / self.median if self.median > 0 else float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(
+            min=min(self.seconds),
+            median=self.median,
+            mean=statistics.fmean(self.seconds),
+            stdev=statistics.stdev(self.seconds) if len(self.seconds) > 1 else 0.0,
+            throughput=self.throughput,
+        )
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> BenchmarkResult:
+        return cls(data["name"], data["group"], data["items"], data["unit"], list(data["seconds"]))
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    status: str
+    baseline: Optional[float]
+    current: Optional[float]
+
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change in median time; positive is slower."""
+
+        if self.baseline is None or self.current is None or self.baseline == 0:
+            return None
+        return self.current / self.baseline - 1
+
+
+def time_case(case: BenchmarkCase, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP) -> BenchmarkResult:
+    repeat = case.repeat if case.repeat is not None else repeat
+    warmup = case.warmup if case.warmup is not None else warmup
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+
+    seconds = []
+    for i in range(warmup + repeat):
+        state = case.setup() if case.setup is not None else None
+        try:
+            started = time.perf_counter()
+            case.run(state)
+            elapsed = time.perf_counter() - started
+        finally:
+            if case.teardown is not None:
+                case.teardown(state)
+        if i >= warmup:
+            seconds.append(elapsed)
+    return BenchmarkResult(case.name, case.group, case.items, case.unit, seconds)
+
+
+def run_suite(
+    cases: Iterable[BenchmarkCase],
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+    progress: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> List[BenchmarkResult]:
+    results = []
+    for case in cases:
+        result = time_case(case, repeat, warmup)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    """Describe where the suite ran, so results from different machines are not compared blindly."""
+
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+
+def save_results(
+    path: Union[str, Path],
+    results: Sequence[BenchmarkResult],
+    config: Optional[Dict[str, Any]] = None,
+) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": config or {},
+        "results": [result.to_dict() for result in results],
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_results(path: Union[str, Path]) -> List[BenchmarkResult]:
+    document = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [BenchmarkResult.from_dict(data) for data in document["results"]]
+
+
+def compare(
+    current: Sequence[BenchmarkResult],
+    baseline: Sequence[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Comparison]:
+    """Compare median times case by case; a change beyond ``threshold`` either way is flagged."""
+
+    baseline_by_name = {result.name: result for result in baseline}
+    comparisons = []
+    for result in current:
+        previous = baseline_by_name.pop(result.name, None)
+        if previous is None:
+            comparisons.append(Comparison(result.name, NEW, None, result.median))
+            continue
+        ratio = result.median / previous.median if previous.median > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = REGRESSED
+        elif ratio < 1 - threshold:
+            status = IMPROVED
+        else:
+            status = UNCHANGED
+        comparisons.append(Comparison(result.name, status, previous.median, result.median))
+    comparisons.extend(Comparison(name, MISSING, previous.median, None) for name, previous in baseline_by_name.items())
+    return comparisons
+
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkResult",
+    "Comparison",
+    "DEFAULT_REPEAT",
+    "DEFAULT_THRESHOLD",
+    "DEFAULT_WARMUP",
+    "IMPROVED",
+    "MISSING",
+    "NEW",
+    "REGRESSED",
+    "UNCHANGED",
+    "compare",
+    "environment",
+    "load_results",
+    "run_suite",
+    "save_results",
+    "time_case",
+]
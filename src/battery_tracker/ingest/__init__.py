@@ -1,10 +1,27 @@
 """Ingestion helpers for battery tracker."""
 
-from battery_tracker.ingest.fpn import backfill_fpn_for_bmu, filter_and_normalize, upsert_fpn
+from battery_tracker.ingest.daemon import run_daemon
+from battery_tracker.ingest.engine import run_dataset
+from battery_tracker.ingest.fpn import (
+    backfill_fpn_for_bmu,
+    backfill_fpn_for_fleet,
+    filter_and_normalize,
+    load_bm_units,
+    upsert_fpn,
+)
+from battery_tracker.ingest.gaps import find_missing_periods, repair_gaps
+from battery_tracker.ingest.incremental import (
+    get_high_water_mark,
+    sync_fpn,
+    sync_mid,
+    sync_system_sell_price,
+)
+from battery_tracker.ingest.registry import DatasetSpec, get_dataset, register_dataset
+from battery_tracker.ingest.settlement import build_settlement_calendar, settlement_period_to_utc
 from battery_tracker.ingest.system_sell_price import (
     backfill_system_sell_price_2025,
+    backfill_system_sell_price_range,
     normalize_records,
-    settlement_period_to_utc,
     upsert_system_sell_prices,
 )
 from battery_tracker.ingest.wholesale_prices import (
@@ -14,13 +31,28 @@ from battery_tracker.ingest.wholesale_prices import (
 )
 
 __all__ = [
+    "DatasetSpec",
     "backfill_fpn_for_bmu",
+    "backfill_fpn_for_fleet",
     "backfill_mid_to_table",
     "backfill_system_sell_price_2025",
+    "backfill_system_sell_price_range",
+    "build_settlement_calendar",
     "filter_and_normalize",
+    "find_missing_periods",
+    "get_dataset",
+    "get_high_water_mark",
+    "load_bm_units",
     "normalize_mid_records",
     "normalize_records",
+    "register_dataset",
+    "repair_gaps",
+    "run_daemon",
+    "run_dataset",
     "settlement_period_to_utc",
+    "sync_fpn",
+    "sync_mid",
+    "sync_system_sell_price",
     "upsert_fpn",
     "upsert_mid_prices",
     "upsert_system_sell_prices",
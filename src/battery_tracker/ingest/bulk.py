@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+from battery_tracker.observability.metrics import ROWS_WRITTEN_TOTAL, UPSERT_SECONDS
+
+COPY_METHOD = "copy"
+VALUES_METHOD = "values"
+DEFAULT_PAGE_SIZE = 5000
+REVISION_TABLE = "row_revision"
+
+
+@dataclass(frozen=True)
+class UpsertCounts:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def __add__(self, other: UpsertCounts) -> UpsertCounts:
+        return UpsertCounts(
+            self.inserted + other.inserted, self.updated + other.updated, self.unchanged + other.unchanged
+        )
+
+
+def _dedupe_rows(
+    rows: Sequence[Sequence[Any]],
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+) -> List[Sequence[Any]]:
+    # A single INSERT ... ON CONFLICT cannot touch the same key twice, so keep
+    # the last row per key (matching the old row-at-a-time upsert semantics).
+    key_positions = [columns.index(column) for column in conflict_columns]
+    by_key: Dict[Tuple[Any, ...], Sequence[Any]] = {}
+    for row in rows:
+        by_key[tuple(row[i] for i in key_positions)] = row
+    return list(by_key.values())
+
+
+def _format_copy_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _rows_to_csv(rows: Sequence[Sequence[Any]]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([_format_copy_value(value) for value in row])
+    buffer.seek(0)
+    return buffer
+
+
+def _distinct_condition(left: str, right: str, value_columns: Sequence[str]) -> sql.Composable:
+    def row(alias: str) -> sql.Composable:
+        return sql.SQL("ROW({})").format(
+            sql.SQL(", ").join(sql.SQL("{}.{}").format(sql.Identifier(alias), sql.Identifier(c)) for c in value_columns)
+        )
+
+    return sql.SQL("{} IS DISTINCT FROM {}").format(row(left), row(right))
+
+
+def _conflict_clause(table_name: str, columns: Sequence[str], conflict_columns: Sequence[str]) -> sql.Composable:
+    update_columns = [column for column in columns if column not in conflict_columns]
+    keys = sql.SQL(", ").join(map(sql.Identifier, conflict_columns))
+    if not update_columns:
+        return sql.SQL("ON CONFLICT ({keys}) DO NOTHING").format(keys=keys)
+    assignments = [
+        sql.SQL("{col} = EXCLUDED.{col}").format(col=sql.Identifier(column)) for column in update_columns
+    ]
+    assignments.append(sql.SQL("ingested_at = NOW()"))
+    # Rows whose values are unchanged are left alone: no new tuple, no WAL.
+    return sql.SQL("ON CONFLICT ({keys}) DO UPDATE SET {assignments} WHERE {changed}").format(
+        keys=keys,
+        assignments=sql.SQL(", ").join(assignments),
+        changed=_distinct_condition(table_name, "excluded", update_columns),
+    )
+
+
+def _json_object(alias: str, columns: Sequence[str]) -> sql.Composable:
+    return sql.SQL("jsonb_build_object({})").format(
+        sql.SQL(", ").join(
+            sql.SQL("{}, {}.{}").format(sql.Literal(column), sql.Identifier(alias), sql.Identifier(column))
+            for column in columns
+        )
+    )
+
+
+def _record_revisions(
+    cur,
+    table_name: str,
+    staging: sql.Identifier,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+) -> int:
+    """Copy the current values of rows about to change into row_revision. Returns the number of changed rows."""
+
+    value_columns = [column for column in columns if column not in conflict_columns]
+    if not value_columns:
+        return 0
+    join = sql.SQL(" AND ").join(
+        sql.SQL("t.{col} = s.{col}").format(col=sql.Identifier(column)) for column in conflict_columns
+    )
+    cur.execute(
+        sql.SQL(
+            """
+            INSERT INTO {revisions} (table_name, key, old_values, new_values, old_ingested_at)
+            SELECT {table_literal}, {key}, {old_values}, {new_values}, t.ingested_at
+            FROM {staging} AS s
+            JOIN {table} AS t ON {join}
+            WHERE {changed}
+            """
+        ).format(
+            revisions=sql.Identifier(REVISION_TABLE),
+            table_literal=sql.Literal(table_name),
+            key=_json_object("s", conflict_columns),
+            old_values=_json_object("t", value_columns),
+            new_values=_json_object("s", value_columns),
+            staging=staging,
+            table=sql.Identifier(table_name),
+            join=join,
+            changed=_distinct_condition("t", "s", value_columns),
+        )
+    )
+    return cur.rowcount
+
+
+def _staged_upsert(
+    cur,
+    table_name: str,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    method: str,
+    page_size: int,
+) -> UpsertCounts:
+    staging = sql.Identifier(f"_staging_{table_name}")
+    column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+    cur.execute(sql.SQL("DROP TABLE IF EXISTS {staging}").format(staging=staging))
+    cur.execute(
+        sql.SQL(
+            "CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA"
+        ).format(staging=staging, columns=column_list, table=sql.Identifier(table_name))
+    )
+    if method == COPY_METHOD:
+        copy_query = sql.SQL("COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)").format(
+            staging=staging, columns=column_list
+        )
+        cur.copy_expert(copy_query.as_string(cur), _rows_to_csv(rows))
+    else:
+        query = sql.SQL("INSERT INTO {staging} ({columns}) VALUES %s").format(staging=staging, columns=column_list)
+        execute_values(cur, query.as_string(cur), rows, page_size=page_size)
+
+    updated = _record_revisions(cur, table_name, staging, columns, conflict_columns)
+    cur.execute(
+        sql.SQL("INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} {conflict}").format(
+            table=sql.Identifier(table_name),
+            columns=column_list,
+            staging=staging,
+            conflict=_conflict_clause(table_name, columns, conflict_columns),
+        )
+    )
+    # Rows skipped by the DO UPDATE ... WHERE are not counted, so rowcount is inserted + updated.
+    written = cur.rowcount
+    return UpsertCounts(inserted=written - updated, updated=updated, unchanged=len(rows) - written)
+
+
+def bulk_upsert(
+    conn,
+    table_name: str,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    method: str = COPY_METHOD,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> UpsertCounts:
+    """Upsert ``rows`` into ``table_name`` without a server round-trip per row.
+
+    Rows are loaded into a temporary staging table (``copy`` streams them with
+    COPY, ``values`` batches them with ``execute_values``) and merged with a single
+    ``INSERT ... SELECT ... ON CONFLICT``. Existing rows are only rewritten when a
+    value changed, and their previous values are kept in row_revision. The caller
+    owns the transaction.
+    """
+
+    if not rows:
+        return UpsertCounts()
+    if method not in (COPY_METHOD, VALUES_METHOD):
+        raise ValueError(f"Unknown bulk upsert method: {method}")
+    rows = _dedupe_rows(rows, columns, conflict_columns)
+
+    with conn.cursor() as cur, UPSERT_SECONDS.time(table=table_name, method=method):
+        counts = _staged_upsert(cur, table_name, columns, conflict_columns, rows, method, page_size)
+    for outcome in ("inserted", "updated", "unchanged"):
+        ROWS_WRITTEN_TOTAL.inc(getattr(counts, outcome), table=table_name, outcome=outcome)
+    return counts
+
+
+def bulk_upsert_columns(
+    conn,
+    table_name: str,
+    columns: Mapping[str, Sequence[Any]],
+    conflict_columns: Sequence[str],
+    method: str = COPY_METHOD,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> UpsertCounts:
+    """Column-oriented variant of ``bulk_upsert``; ``columns`` maps column name to equal-length values."""
+
+    names = list(columns)
+    rows = list(zip(*(columns[name] for name in names)))
+    return bulk_upsert(conn, table_name, names, conflict_columns, rows, method=method, page_size=page_size)
+
+
+__all__ = [
+    "COPY_METHOD",
+    "DEFAULT_PAGE_SIZE",
+    "REVISION_TABLE",
+    "UpsertCounts",
+    "VALUES_METHOD",
+    "bulk_upsert",
+    "bulk_upsert_columns",
+]
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Dict, List, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from battery_tracker.ingest.bulk import COPY_METHOD, UpsertCounts, bulk_upsert_columns
+from battery_tracker.ingest.fpn import (
+    DATASET_FILTER,
+    FPN_COLUMNS,
+    FPN_CONFLICT_COLUMNS,
+    FPN_TABLE,
+    ensure_fpn_partitions,
+)
+from battery_tracker.ingest.market_price import (
+    MARKET_PRICE_CONFLICT_COLUMNS,
+    MARKET_PRICE_TABLE,
+    PRICE_SOURCE_IDS,
+    compact_prices_enabled,
+    refresh_for_timestamps,
+)
+from battery_tracker.ingest.settlement import periods_in_day, settlement_day_start
+from battery_tracker.ingest.wholesale_prices import PRICE_KEYS, TIMESTAMP_KEYS
+
+# Batch counterparts of the per-record normalizers: timestamps are parsed as one
+# datetime64 array and values as one float64 array instead of a fromisoformat()
+# and Decimal() per record.
+
+HALF_HOUR = None if np is None else np.timedelta64(30, "m")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Columnar normalization requires numpy. Install it with `pip install numpy`.")
+
+
+def parse_utc_array(values: Sequence[object]) -> "np.ndarray":
+    """Parse ISO-8601 UTC strings (``Z`` or ``+00:00`` suffix) into a ``datetime64[us]`` array."""
+
+    _require_numpy()
+    text = np.asarray(values, dtype=str)
+    text = np.char.replace(np.char.replace(text, "Z", ""), "+00:00", "")
+    if np.any(np.char.find(text, "+") >= 0) or np.any(np.char.count(text, "-") > 2):
+        raise ValueError("Columnar timestamp parsing only supports UTC timestamps.")
+    return text.astype("datetime64[us]")
+
+
+def settlement_periods_to_utc_array(
+    settlement_dates: Sequence[object], settlement_periods: Sequence[object], record_kind: str = "MID"
+) -> "np.ndarray":
+    _require_numpy()
+    unique_days, day_index = np.unique(np.asarray(settlement_dates, dtype=str), return_inverse=True)
+    day_dates = [date.fromisoformat(day[:10]) for day in unique_days.tolist()]
+    # Local midnight in UTC and the period count for each distinct settlement date.
+    day_starts = np.array(
+        [settlement_day_start(day).replace(tzinfo=None) for day in day_dates], dtype="datetime64[us]"
+    )
+    day_periods = np.array([periods_in_day(day) for day in day_dates], dtype=np.int64)
+    periods = np.asarray(settlement_periods, dtype=np.int64)
+    if np.any(periods < 1) or np.any(periods > day_periods[day_index]):
+        raise ValueError(f"settlementPeriod out of range for its settlement date in {record_kind} record.")
+    return day_starts[day_index] + (periods - 1) * HALF_HOUR
+
+
+def _first_present_key(record: Mapping[str, object], keys: Sequence[str], kind: str, record_kind: str) -> str:
+    for key in keys:
+        if key in record:
+            return key
+    available_keys = ", ".join(sorted(record.keys()))
+    raise ValueError(f"No {kind} field found in {record_kind} record. Available keys: {available_keys}")
+
+
+def normalize_mid_columns(records: Sequence[Dict[str, object]], record_kind: str = "MID") -> Dict[str, "np.ndarray"]:
+    """Columnar counterpart of ``normalize_mid_records``; ``record_kind`` names the records in errors.
+
+    The timestamp and price keys are picked from the first record and assumed to be
+    shared by the whole batch, as they are within one API response.
+    """
+
+    _require_numpy()
+    if not records:
+        return {"ts": np.array([], dtype="datetime64[us]"), "price_gbp_per_mwh": np.array([], dtype=np.float64)}
+    first = records[0]
+    try:
+        if "startTime" in first:
+            ts = parse_utc_array([record["startTime"] for record in records])
+        elif "settlementDate" in first and "settlementPeriod" in first:
+            ts = settlement_periods_to_utc_array(
+                [record["settlementDate"] for record in records],
+                [record["settlementPeriod"] for record in records],
+                record_kind,
+            )
+        else:
+            key = _first_present_key(first, TIMESTAMP_KEYS, "timestamp", record_kind)
+            ts = parse_utc_array([record[key] for record in records])
+        price_key = _first_present_key(first, PRICE_KEYS, "price", record_kind)
+        price = np.asarray([record[price_key] for record in records], dtype=np.float64)
+    except KeyError as exc:
+        raise ValueError(f"{record_kind} batch is not homogeneous: record missing {exc}") from exc
+    return {"ts": ts, "price_gbp_per_mwh": price}
+
+
+def normalize_pn_columns(records: Sequence[Dict[str, object]], bm_unit: str) -> Dict[str, "np.ndarray"]:
+    """Columnar counterpart of ``filter_and_normalize``."""
+
+    _require_numpy()
+    pn_records = [record for record in records if str(record.get("dataset", "")).upper() == DATASET_FILTER]
+    try:
+        ts = parse_utc_array([record["timeFrom"] for record in pn_records])
+        fpn_mw = np.asarray([record["levelFrom"] for record in pn_records], dtype=np.float64)
+    except KeyError as exc:
+        raise ValueError(f"PN record missing {exc}") from exc
+    time_to = parse_utc_array([record.get("timeTo") or "NaT" for record in pn_records])
+    level_to = np.asarray([record.get("levelTo") for record in pn_records], dtype=np.float64)
+    level_to = np.where(np.isnan(level_to), fpn_mw, level_to)
+    return {
+        "ts": ts,
+        "bmu_id": np.full(len(pn_records), bm_unit),
+        "fpn_mw": fpn_mw,
+        "time_to": time_to,
+        "level_to": level_to,
+    }
+
+
+def to_copy_columns(columns: Mapping[str, "np.ndarray"]) -> Dict[str, List[Optional[str]]]:
+    """Format each array as text the bulk loader can stream with COPY."""
+
+    _require_numpy()
+    formatted: Dict[str, List[str]] = {}
+    for name, values in columns.items():
+        if np.issubdtype(values.dtype, np.datetime64):
+            text = np.datetime_as_string(values, unit="us", timezone="UTC").tolist()
+            # NaT becomes an empty CSV field, which COPY reads as NULL.
+            formatted[name] = [None if value == "NaT" else value for value in text]
+        else:
+            formatted[name] = values.astype(str).tolist()
+    return formatted
+
+
+def with_source_id(columns: Mapping[str, "np.ndarray"], source_id: int) -> Dict[str, "np.ndarray"]:
+    """Reshape MID price columns into market_price columns for the compact storage profile."""
+
+    _require_numpy()
+    return {
+        "ts": columns["ts"],
+        "source_id": np.full(len(columns["ts"]), source_id, dtype=np.int16),
+        "price_gbp_per_mwh": columns["price_gbp_per_mwh"],
+    }
+
+
+def upsert_mid_price_columns(
+    conn,
+    table_name: str,
+    columns: Mapping[str, "np.ndarray"],
+    method: str = COPY_METHOD,
+) -> UpsertCounts:
+    if not len(columns["ts"]):
+        return UpsertCounts()
+    if table_name in PRICE_SOURCE_IDS and compact_prices_enabled(conn):
+        copy_columns = to_copy_columns(with_source_id(columns, PRICE_SOURCE_IDS[table_name]))
+        counts = bulk_upsert_columns(
+            conn, MARKET_PRICE_TABLE, copy_columns, MARKET_PRICE_CONFLICT_COLUMNS, method=method
+        )
+    else:
+        counts = bulk_upsert_columns(conn, table_name, to_copy_columns(columns), ("ts",), method=method)
+    refresh_for_timestamps(conn, table_name, ts_bounds(columns["ts"]))
+    conn.commit()
+    return counts
+
+
+def ts_bounds(ts: "np.ndarray") -> List[datetime]:
+    """Return the earliest and latest timestamps in a non-empty ``datetime64`` array as aware datetimes."""
+
+    _require_numpy()
+    bounds = np.array([ts.min(), ts.max()]).astype("datetime64[us]")
+    return [value.replace(tzinfo=timezone.utc) for value in bounds.tolist()]
+
+
+def month_starts(ts: "np.ndarray") -> List[datetime]:
+    """Return the distinct UTC month starts in a ``datetime64`` array as aware datetimes."""
+
+    _require_numpy()
+    months = np.unique(ts.astype("datetime64[M]")).astype("datetime64[us]")
+    return [month.replace(tzinfo=timezone.utc) for month in months.tolist()]
+
+
+def upsert_fpn_columns(conn, columns: Mapping[str, "np.ndarray"], method: str = COPY_METHOD) -> UpsertCounts:
+    if not len(columns["ts"]):
+        return UpsertCounts()
+    ensure_fpn_partitions(conn, month_starts(columns["ts"]))
+    copy_columns = to_copy_columns({name: columns[name] for name in FPN_COLUMNS})
+    counts = bulk_upsert_columns(conn, FPN_TABLE, copy_columns, FPN_CONFLICT_COLUMNS, method=method)
+    conn.commit()
+    return counts
+
+
+__all__ = [
+    "month_starts",
+    "normalize_mid_columns",
+    "normalize_pn_columns",
+    "parse_utc_array",
+    "settlement_periods_to_utc_array",
+    "to_copy_columns",
+    "ts_bounds",
+    "upsert_fpn_columns",
+    "upsert_mid_price_columns",
+    "with_source_id",
+]
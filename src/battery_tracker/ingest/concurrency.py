@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def map_ordered(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[Tuple[T, R]]:
+    """Run ``func`` over ``items`` on a thread pool, yielding ``(item, result)`` in input order.
+
+    At most ``2 * max_workers`` calls are in flight, so a slow consumer (the
+    database writer) applies back-pressure instead of buffering every window.
+    An exception raised by ``func`` is re-raised when its item is reached.
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+
+    if max_workers == 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    in_flight: Deque[Tuple[T, Future]] = deque()
+    max_in_flight = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in items:
+                in_flight.append((item, executor.submit(func, item)))
+                if len(in_flight) >= max_in_flight:
+                    done_item, future = in_flight.popleft()
+                    yield done_item, future.result()
+            while in_flight:
+                done_item, future = in_flight.popleft()
+                yield done_item, future.result()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
+__all__ = [
+    "DEFAULT_MAX_WORKERS",
+    "map_ordered",
+]
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from time import monotonic
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS
+from battery_tracker.ingest.engine import fetch_and_normalize, log_window_written, resolve_write_spec, write_window
+from battery_tracker.ingest.incremental import DEFAULT_LOOKBACK, DEFAULT_START, get_high_water_mark, incremental_start
+from battery_tracker.ingest.ledger import DONE, FAILED, is_settled, record_window, settle_delay
+from battery_tracker.ingest.registry import DatasetSpec, get_dataset, settlement_date_params
+from battery_tracker.ingest.settlement import PERIOD_LENGTH, SETTLEMENT_TZ
+from battery_tracker.ingest.windows import chunk_time_ranges, window_iso
+from battery_tracker.sources.http import DEFAULT_POOL_SIZE, configure_session
+
+# Long-running ingestion: each dataset is polled on its own cadence, ticks aligned
+# to multiples of its interval (so a 30 minute PN poll runs just after each
+# settlement period starts). A poll reads the high-water mark per key, fetches at
+# most ``max_windows`` new windows per key concurrently and writes each one, in order,
+# as soon as it and the windows before it have arrived: one commit per window, with
+# its ledger entry once the window has settled. A key still behind after a capped
+# poll is polled again straight away instead of waiting for the next tick. HTTP goes
+# through the shared pooled session (and its retry policy) on worker threads, and
+# database work through a small connection pool shared by all datasets.
+DEFAULT_INTERVALS: Dict[str, timedelta] = {
+    "n2ex": timedelta(minutes=5),
+    "apx": timedelta(minutes=5),
+    "ssp": timedelta(minutes=30),
+    "system_prices": timedelta(minutes=30),
+    "pn": timedelta(minutes=30),
+}
+# system_prices also writes system_sell_price, so polling ssp as well is redundant.
+DEFAULT_DATASETS: Tuple[str, ...] = ("n2ex", "apx", "system_prices", "pn")
+# Delay after each aligned tick so the period just ended has time to be published.
+DEFAULT_POLL_OFFSET = timedelta(minutes=1)
+DEFAULT_DB_POOL_SIZE = 4
+# Bounds memory and time-to-first-commit on the first run or after downtime.
+DEFAULT_MAX_WINDOWS_PER_POLL = 31
+
+Window = Tuple[datetime, datetime]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PollSchedule:
+    """How often to poll one registered dataset, and for which keys (e.g. BM Units)."""
+
+    dataset: str
+    interval: timedelta
+    keys: Tuple[Optional[str], ...] = (None,)
+    lookback: timedelta = DEFAULT_LOOKBACK
+    offset: timedelta = DEFAULT_POLL_OFFSET
+
+    def __post_init__(self) -> None:
+        if self.interval <= timedelta(0):
+            raise ValueError("interval must be > 0")
+
+
+def default_schedules(
+    datasets: Sequence[str],
+    bm_units: Sequence[str] = (),
+    intervals: Optional[Dict[str, timedelta]] = None,
+    lookback: timedelta = DEFAULT_LOOKBACK,
+) -> List[PollSchedule]:
+    intervals = {**DEFAULT_INTERVALS, **(intervals or {})}
+    schedules = []
+    for dataset in datasets:
+        spec = get_dataset(dataset)
+        if spec.key_param is not None and not bm_units:
+            raise ValueError(f"Dataset {dataset} needs at least one BM Unit")
+        keys = tuple(bm_units) if spec.key_param is not None else (None,)
+        schedules.append(PollSchedule(dataset, intervals[dataset], keys, lookback))
+    return schedules
+
+
+def next_tick(now: datetime, interval: timedelta, offset: timedelta = timedelta(0)) -> datetime:
+    """Return the first ``offset`` + multiple of ``interval`` since the epoch after ``now``."""
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    ticks = (now - offset - epoch) // interval + 1
+    return epoch + ticks * interval + offset
+
+
+def window_start(spec: DatasetSpec, start: datetime) -> datetime:
+    # Windows requested by settlement date (SSP) must start at UTC midnight.
+    if spec.window_params is settlement_date_params:
+        return datetime.combine(start.astimezone(SETTLEMENT_TZ).date(), time(0, 0), tzinfo=timezone.utc)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return epoch + (start - epoch) // PERIOD_LENGTH * PERIOD_LENGTH
+
+
+class IngestDaemon:
+    """Poll every schedule until ``stop()`` is called (or SIGINT/SIGTERM arrives)."""
+
+    def __init__(
+        self,
+        database_url: str,
+        schedules: Sequence[PollSchedule],
+        max_concurrency: int = DEFAULT_MAX_WORKERS,
+        db_pool_size: int = DEFAULT_DB_POOL_SIZE,
+        default_start: datetime = DEFAULT_START,
+        max_windows: int = DEFAULT_MAX_WINDOWS_PER_POLL,
+    ) -> None:
+        if max_concurrency < 1 or db_pool_size < 1 or max_windows < 1:
+            raise ValueError("max_concurrency, db_pool_size and max_windows must be >= 1")
+        self.database_url = database_url
+        self.schedules = list(schedules)
+        self.max_concurrency = max_concurrency
+        self.db_pool_size = db_pool_size
+        self.default_start = default_start
+        self.max_windows = max_windows
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._fetch_slots: Optional[asyncio.Semaphore] = None
+        self._db_slots: Optional[asyncio.Semaphore] = None
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        assert self._pool is not None
+        conn = self._pool.getconn()
+        try:
+            yield conn
+        finally:
+            self._pool.putconn(conn)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        # Fetch slots bound HTTP concurrency across all datasets; DB slots keep
+        # threads from asking the pool for more connections than it holds.
+        self._fetch_slots = asyncio.Semaphore(self.max_concurrency)
+        self._db_slots = asyncio.Semaphore(self.db_pool_size)
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.max_concurrency + self.db_pool_size))
+        if self.max_concurrency > DEFAULT_POOL_SIZE:
+            configure_session(self.max_concurrency)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):  # pragma: no cover - Windows
+                pass
+
+        self._pool = ThreadedConnectionPool(1, self.db_pool_size, self.database_url)
+        try:
+            await asyncio.gather(*(self._poll_forever(schedule) for schedule in self.schedules))
+        finally:
+            self._pool.closeall()
+            self._pool = None
+        logger.info("Ingestion daemon stopped")
+
+    async def _poll_forever(self, schedule: PollSchedule) -> None:
+        assert self._stopping is not None
+        while not self._stopping.is_set():
+            try:
+                _, behind = await self._poll_once(schedule)
+            except Exception as exc:  # noqa: BLE001 - the next tick retries
+                logger.exception("%s: poll failed: %s", schedule.dataset, exc, extra={"dataset": schedule.dataset})
+                behind = False
+            if behind:
+                continue
+            now = datetime.now(timezone.utc)
+            delay = (next_tick(now, schedule.interval, schedule.offset) - now).total_seconds()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll_once(self, schedule: PollSchedule) -> Tuple[int, bool]:
+        """Fetch and write the windows newer than each key's high-water mark, up to ``max_windows`` per key.
+
+        Returns (rows upserted, whether any key has windows left for another poll).
+        """
+
+        spec = get_dataset(schedule.dataset)
+        end = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        async with self._db_slots:
+            write_spec, jobs_by_key, behind = await asyncio.to_thread(self._plan, spec, schedule, end)
+        if not jobs_by_key:
+            logger.info("%s is up to date", spec.name, extra={"dataset": spec.name})
+            return 0, False
+        tasks = [
+            asyncio.ensure_future(self._poll_key(spec, write_spec, key, windows))
+            for key, windows in jobs_by_key.items()
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # If one key raises, stop the others before the next tick polls them again.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        # A key that hit a failed window waits for the next tick rather than retrying at once.
+        return sum(total for total, _ in results), behind and all(completed for _, completed in results)
+
+    async def _poll_key(
+        self, spec: DatasetSpec, write_spec: DatasetSpec, key: Optional[str], windows: List[Window]
+    ) -> Tuple[int, bool]:
+        """Write ``windows`` of one key in order as they arrive. Returns (rows upserted, whether all were written)."""
+
+        # At most max_concurrency fetches per key run ahead of the writer. Cancelling a
+        # fetch already running on a worker thread does not stop its request, so this
+        # also bounds what is left in flight when the key stops early.
+        remaining = iter(windows)
+        in_flight: Deque[Tuple[Window, asyncio.Future]] = deque()
+
+        def fill() -> None:
+            while len(in_flight) < self.max_concurrency:
+                window = next(remaining, None)
+                if window is None:
+                    return
+                in_flight.append((window, asyncio.ensure_future(self._fetch(write_spec, key, window))))
+
+        total = 0
+        try:
+            fill()
+            while in_flight:
+                window, task = in_flight.popleft()
+                try:
+                    elapsed, outcome = await task
+                except Exception as exc:  # noqa: BLE001 - recorded and retried on the next poll
+                    # Writing past a failed window would move the high-water mark over the
+                    # gap, so the rest of this key waits for the next poll.
+                    async with self._db_slots:
+                        await asyncio.to_thread(self._record_failure, spec, key, window, exc)
+                    return total, False
+                fill()
+                async with self._db_slots:
+                    total += await asyncio.to_thread(self._write, spec, write_spec, key, window, outcome, elapsed)
+            return total, True
+        finally:
+            tasks = [task for _, task in in_flight]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch(self, write_spec: DatasetSpec, key: Optional[str], window: Window) -> Tuple[float, Any]:
+        async with self._fetch_slots:
+            started = monotonic()
+            outcome = await asyncio.to_thread(fetch_and_normalize, write_spec, window, key)
+            return monotonic() - started, outcome
+
+    def _plan(
+        self, spec: DatasetSpec, schedule: PollSchedule, end: datetime
+    ) -> Tuple[DatasetSpec, Dict[Optional[str], List[Window]], bool]:
+        with self._connection() as conn:
+            write_spec = resolve_write_spec(conn, spec, spec.table)
+            starts = {
+                key: incremental_start(
+                    get_high_water_mark(conn, spec.table, key), schedule.lookback, self.default_start
+                )
+                for key in schedule.keys
+            }
+            conn.rollback()
+        jobs_by_key: Dict[Optional[str], List[Window]] = {}
+        behind = False
+        for key, start in starts.items():
+            windows = chunk_time_ranges(window_start(spec, start), end, spec.window)
+            if len(windows) > self.max_windows:
+                windows = windows[: self.max_windows]
+                behind = True
+            if windows:
+                jobs_by_key[key] = windows
+        return write_spec, jobs_by_key, behind
+
+    def _write(
+        self,
+        spec: DatasetSpec,
+        write_spec: DatasetSpec,
+        key: Optional[str],
+        window: Window,
+        outcome: Tuple[int, Any],
+        elapsed: float,
+    ) -> int:
+        fetched, normalized = outcome
+        label = f"{spec.name} {key}" if key is not None else spec.name
+        with self._connection() as conn:
+            started = monotonic()
+            counts = write_window(conn, write_spec, normalized, spec.table)
+            elapsed += monotonic() - started
+            if is_settled(window, settle_delay(spec.cache_dataset)):
+                record_window(conn, spec.name, spec.table, key, window, DONE, counts.total, elapsed)
+            conn.commit()
+        log_window_written(logger, label, window, fetched, counts, spec.name, key, elapsed)
+        return counts.total
+
+    def _record_failure(self, spec: DatasetSpec, key: Optional[str], window: Window, error: Exception) -> None:
+        from_iso, to_iso = window_iso(window)
+        label = f"{spec.name} {key}" if key is not None else spec.name
+        with self._connection() as conn:
+            if is_settled(window, settle_delay(spec.cache_dataset)):
+                record_window(conn, spec.name, spec.table, key, window, FAILED, 0, None, str(error))
+            conn.commit()
+        logger.error(
+            "%s window %s -> %s failed: %s",
+            label,
+            from_iso,
+            to_iso,
+            error,
+            extra={"dataset": spec.name, "key": key, "window_from": from_iso, "window_to": to_iso},
+        )
+
+
+def run_daemon(
+    database_url: str,
+    schedules: Sequence[PollSchedule],
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+    db_pool_size: int = DEFAULT_DB_POOL_SIZE,
+    default_start: datetime = DEFAULT_START,
+    max_windows: int = DEFAULT_MAX_WINDOWS_PER_POLL,
+) -> None:
+    daemon = IngestDaemon(database_url, schedules, max_concurrency, db_pool_size, default_start, max_windows)
+    for schedule in schedules:
+        keys = "" if schedule.keys == (None,) else f" for {len(schedule.keys)} BM Units"
+        logger.info(
+            "Polling %s every %s%s", schedule.dataset, schedule.interval, keys, extra={"dataset": schedule.dataset}
+        )
+    asyncio.run(daemon.run())
+
+
+__all__ = [
+    "DEFAULT_DB_POOL_SIZE",
+    "DEFAULT_DATASETS",
+    "DEFAULT_INTERVALS",
+    "DEFAULT_MAX_WINDOWS_PER_POLL",
+    "DEFAULT_POLL_OFFSET",
+    "IngestDaemon",
+    "PollSchedule",
+    "default_schedules",
+    "next_tick",
+    "run_daemon",
+    "window_start",
+]
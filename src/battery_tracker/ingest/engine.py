@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import psycopg2
+
+from battery_tracker.ingest.bulk import COPY_METHOD, UpsertCounts, bulk_upsert, bulk_upsert_columns
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS, map_ordered
+from battery_tracker.ingest.ledger import DONE, FAILED, completed_windows, is_settled, record_window, settle_delay
+from battery_tracker.ingest.market_price import (
+    PRICE_SOURCE_IDS,
+    compact_prices_enabled,
+    compact_spec,
+    refresh_for_timestamps,
+)
+from battery_tracker.ingest.registry import DatasetSpec, get_dataset
+from battery_tracker.ingest.windows import chunk_time_ranges, parse_iso_utc, window_iso
+from battery_tracker.observability.metrics import NORMALIZE_SECONDS, RECORDS_NORMALIZED_TOTAL
+from battery_tracker.sources.http import (
+    DEFAULT_POOL_SIZE,
+    configure_session,
+    fetch_records,
+    iter_records,
+    parse_data_payload,
+)
+from battery_tracker.sources.retry import configure_rate_limit
+
+Window = Tuple[datetime, datetime]
+
+logger = logging.getLogger(__name__)
+
+
+def _describe(spec: DatasetSpec, key: Optional[str], window: Window) -> str:
+    from_iso, to_iso = window_iso(window)
+    subject = f"{spec.name} data for {key}" if key is not None else f"{spec.name} data"
+    return f"{subject} from {from_iso} to {to_iso}"
+
+
+def fetch_and_normalize(
+    spec: DatasetSpec,
+    window: Window,
+    key: Optional[str] = None,
+    stream: bool = False,
+    columnar: bool = False,
+) -> Tuple[int, Any]:
+    """Fetch one window of ``spec`` and normalize it.
+
+    Returns (records fetched, rows) or, with ``columnar``, (records fetched, column arrays).
+    """
+
+    path, params = spec.build_request(window, key)
+    description = _describe(spec, key, window)
+
+    if columnar:
+        if spec.normalize_columns is None:
+            raise ValueError(f"Dataset {spec.name} has no columnar normalizer")
+        # Columnar normalization needs the whole batch, so it does not stream.
+        records = fetch_records(path, params, description, spec.cache_dataset, window[1], spec.parse)
+        with NORMALIZE_SECONDS.time(dataset=spec.name):
+            columns = spec.normalize_columns(records, key)
+        RECORDS_NORMALIZED_TOTAL.inc(len(records), dataset=spec.name)
+        return len(records), columns
+
+    if not stream or spec.parse is not parse_data_payload:
+        records = fetch_records(path, params, description, spec.cache_dataset, window[1], spec.parse)
+        with NORMALIZE_SECONDS.time(dataset=spec.name):
+            rows = spec.normalize(records, key)
+        RECORDS_NORMALIZED_TOTAL.inc(len(records), dataset=spec.name)
+        return len(records), rows
+
+    fetched = 0
+
+    def counted(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal fetched
+        for record in records:
+            fetched += 1
+            yield record
+
+    # Streaming interleaves download and normalization, so both are timed together.
+    with NORMALIZE_SECONDS.time(dataset=spec.name):
+        rows = spec.normalize(counted(iter_records(path, params, description, spec.cache_dataset, window[1])), key)
+    RECORDS_NORMALIZED_TOTAL.inc(fetched, dataset=spec.name)
+    return fetched, rows
+
+
+def _upsert_normalized(
+    conn,
+    spec: DatasetSpec,
+    normalized: Any,
+    columnar: bool,
+    method: str,
+    table_name: str,
+) -> UpsertCounts:
+    if columnar:
+        from battery_tracker.ingest.columnar import month_starts, to_copy_columns
+
+        if not len(normalized[spec.columns[0]]):
+            return UpsertCounts()
+        if spec.ensure_partitions is not None:
+            spec.ensure_partitions(conn, month_starts(normalized["ts"]))
+        columns = to_copy_columns({column: normalized[column] for column in spec.columns})
+        return bulk_upsert_columns(conn, table_name, columns, spec.conflict_columns, method=method)
+
+    if normalized and spec.ensure_partitions is not None:
+        ts_index = spec.columns.index("ts")
+        spec.ensure_partitions(conn, (row[ts_index] for row in normalized))
+    return bulk_upsert(conn, table_name, spec.columns, spec.conflict_columns, normalized, method=method)
+
+
+def _refresh_market_view(conn, spec: DatasetSpec, normalized: Any, columnar: bool, table_name: str) -> None:
+    """Refresh market_half_hourly over the window just written to a price table."""
+
+    if table_name not in PRICE_SOURCE_IDS:
+        return
+    if columnar:
+        from battery_tracker.ingest.columnar import ts_bounds
+
+        if len(normalized["ts"]):
+            refresh_for_timestamps(conn, table_name, ts_bounds(normalized["ts"]))
+    else:
+        ts_index = spec.columns.index("ts")
+        refresh_for_timestamps(conn, table_name, (row[ts_index] for row in normalized))
+
+
+def log_window_written(
+    log: logging.Logger,
+    label: str,
+    window: Window,
+    fetched: int,
+    counts: UpsertCounts,
+    dataset: str,
+    key: Optional[str],
+    elapsed: Optional[float] = None,
+) -> None:
+    from_iso, to_iso = window_iso(window)
+    fields = {
+        "dataset": dataset,
+        "key": key,
+        "window_from": from_iso,
+        "window_to": to_iso,
+        "records": fetched,
+        "inserted": counts.inserted,
+        "updated": counts.updated,
+        "unchanged": counts.unchanged,
+    }
+    if elapsed is not None:
+        fields["duration_seconds"] = round(elapsed, 3)
+    log.info(
+        "%s window %s -> %s: fetched %d records; %d inserted, %d updated, %d unchanged",
+        label,
+        from_iso,
+        to_iso,
+        fetched,
+        counts.inserted,
+        counts.updated,
+        counts.unchanged,
+        extra=fields,
+    )
+
+
+def resolve_write_spec(conn, spec: DatasetSpec, table_name: str) -> DatasetSpec:
+    """Return the spec to fetch and write ``table_name`` with on this database.
+
+    Price tables are views under the compact storage profile; they are written
+    through market_price instead.
+    """
+
+    if table_name in PRICE_SOURCE_IDS and compact_prices_enabled(conn):
+        return compact_spec(spec, table_name)
+    return spec
+
+
+def write_window(
+    conn,
+    write_spec: DatasetSpec,
+    normalized: Any,
+    table_name: str,
+    columnar: bool = False,
+    method: str = COPY_METHOD,
+) -> UpsertCounts:
+    """Upsert one window fetched with ``write_spec`` and refresh what depends on ``table_name``.
+
+    The caller commits.
+    """
+
+    counts = _upsert_normalized(conn, write_spec, normalized, columnar, method, write_spec.table)
+    _refresh_market_view(conn, write_spec, normalized, columnar, table_name)
+    if write_spec.after_write is not None:
+        write_spec.after_write(conn, normalized)
+    return counts
+
+
+def write_normalized(
+    conn,
+    spec: DatasetSpec,
+    normalized: Any,
+    columnar: bool = False,
+    method: str = COPY_METHOD,
+    table_name: Optional[str] = None,
+) -> UpsertCounts:
+    """Upsert one window of normalized output into the dataset's table and commit."""
+
+    table_name = table_name or spec.table
+    counts = _upsert_normalized(conn, spec, normalized, columnar, method, table_name)
+    _refresh_market_view(conn, spec, normalized, columnar, table_name)
+    if spec.after_write is not None:
+        spec.after_write(conn, normalized)
+    conn.commit()
+    return counts
+
+
+def _row_count(normalized: Any, columnar: bool) -> int:
+    return len(normalized["ts"]) if columnar else len(normalized)
+
+
+def _concat_normalized(parts: Sequence[Any], columnar: bool) -> Any:
+    if len(parts) == 1:
+        return parts[0]
+    if columnar:
+        import numpy as np
+
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    return [row for part in parts for row in part]
+
+
+def run_dataset(
+    database_url: str,
+    dataset: Union[str, DatasetSpec],
+    start_ts: str,
+    end_ts: str,
+    keys: Sequence[Optional[str]] = (None,),
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: Optional[float] = None,
+    stream: bool = False,
+    columnar: bool = False,
+    method: str = COPY_METHOD,
+    table_name: Optional[str] = None,
+    resume: bool = True,
+    flush_rows: Optional[int] = None,
+) -> Dict[Optional[str], int]:
+    """Run a registered dataset through fetch -> normalize -> write for each key.
+
+    Every (key, window) job is fetched on one bounded worker pool and written in
+    order over a single connection. Each settled window's outcome is committed to
+    the job ledger together with its rows; with ``resume``, windows the ledger
+    already has as done are skipped. With ``flush_rows`` (default: the dataset's),
+    consecutive windows of a key are buffered and written in one transaction once
+    they hold that many rows. A failed window does not stop the run: the remaining
+    windows are still written and a RuntimeError is raised at the end.
+    ``requests_per_second`` sets the process-wide request rate shared with every
+    other fetch. Returns rows upserted per key.
+    """
+
+    spec = get_dataset(dataset) if isinstance(dataset, str) else dataset
+    table_name = table_name or spec.table
+    flush_rows = flush_rows if flush_rows is not None else spec.flush_rows
+    start = parse_iso_utc(start_ts)
+    end = parse_iso_utc(end_ts)
+
+    windows = chunk_time_ranges(start, end, spec.window)
+    settle = settle_delay(spec.cache_dataset)
+    if requests_per_second:
+        configure_rate_limit(requests_per_second)
+    if max_workers > DEFAULT_POOL_SIZE:
+        configure_session(max_workers)
+
+    rows_by_key: Dict[Optional[str], int] = {key: 0 for key in keys}
+    failed: List[Tuple[Optional[str], Window]] = []
+    # Fetched windows of one key waiting to be written: (window, records, rows, fetch seconds).
+    pending: List[Tuple[Window, int, Any, float]] = []
+    pending_key: Optional[str] = None
+
+    def fetch_job(job: Tuple[Optional[str], Window]) -> Tuple[float, Any]:
+        key, window = job
+        started = time.monotonic()
+        try:
+            result = fetch_and_normalize(write_spec, window, key, stream, columnar)
+        except Exception as exc:  # noqa: BLE001 - recorded in the ledger
+            return time.monotonic() - started, exc
+        return time.monotonic() - started, result
+
+    def flush() -> None:
+        if not pending:
+            return
+        key = pending_key
+        started = time.monotonic()
+        merged = _concat_normalized([normalized for _, _, normalized, _ in pending], columnar)
+        counts = write_window(conn, write_spec, merged, table_name, columnar, method)
+        write_elapsed = (time.monotonic() - started) / len(pending)
+        for window, _, normalized, elapsed in pending:
+            rows = counts.total if len(pending) == 1 else _row_count(normalized, columnar)
+            if is_settled(window, settle):
+                record_window(conn, spec.name, table_name, key, window, DONE, rows, elapsed + write_elapsed)
+        conn.commit()
+        rows_by_key[key] += counts.total
+        label = f"{spec.name} {key}" if key is not None else spec.name
+        span = (pending[0][0][0], pending[-1][0][1])
+        fetched = sum(records for _, records, _, _ in pending)
+        total_elapsed = sum(elapsed for _, _, _, elapsed in pending) + write_elapsed * len(pending)
+        log_window_written(logger, label, span, fetched, counts, spec.name, key, total_elapsed)
+        pending.clear()
+
+    with psycopg2.connect(database_url) as conn:
+        write_spec = resolve_write_spec(conn, spec, table_name)
+        done = completed_windows(conn, spec.name, table_name, keys, start, end, settle) if resume else set()
+        jobs = [(key, window) for key in keys for window in windows if (key, *window) not in done]
+        if done:
+            logger.info(
+                "%s: skipping %d windows already done",
+                spec.name,
+                len(windows) * len(keys) - len(jobs),
+                extra={"dataset": spec.name, "skipped_windows": len(windows) * len(keys) - len(jobs)},
+            )
+        windows_left: Dict[Optional[str], int] = {key: 0 for key in keys}
+        for key, _ in jobs:
+            windows_left[key] += 1
+        keys_done = sum(1 for left in windows_left.values() if left == 0)
+
+        for (key, window), (elapsed, outcome) in map_ordered(fetch_job, jobs, max_workers):
+            if key != pending_key:
+                flush()
+                pending_key = key
+            if isinstance(outcome, Exception):
+                from_iso, to_iso = window_iso(window)
+                label = f"{spec.name} {key}" if key is not None else spec.name
+                if is_settled(window, settle):
+                    record_window(conn, spec.name, table_name, key, window, FAILED, 0, elapsed, str(outcome))
+                conn.commit()
+                failed.append((key, window))
+                logger.error(
+                    "%s window %s -> %s failed: %s",
+                    label,
+                    from_iso,
+                    to_iso,
+                    outcome,
+                    extra={"dataset": spec.name, "key": key, "window_from": from_iso, "window_to": to_iso},
+                )
+            else:
+                fetched, normalized = outcome
+                pending.append((window, fetched, normalized, elapsed))
+                if not flush_rows or sum(_row_count(rows, columnar) for _, _, rows, _ in pending) >= flush_rows:
+                    flush()
+            windows_left[key] -= 1
+            if windows_left[key] == 0:
+                flush()
+                if len(keys) > 1:
+                    keys_done += 1
+                    logger.info(
+                        "[%d/%d] %s %s: %d windows, upserted %d rows",
+                        keys_done,
+                        len(keys),
+                        spec.name,
+                        key,
+                        len(windows),
+                        rows_by_key[key],
+                        extra={"dataset": spec.name, "key": key, "rows": rows_by_key[key]},
+                    )
+
+    logger.info(
+        "Completed %s backfill into %s. Total rows upserted: %d",
+        spec.name,
+        table_name,
+        sum(rows_by_key.values()),
+        extra={"dataset": spec.name, "table": table_name, "rows": sum(rows_by_key.values()), "failed": len(failed)},
+    )
+    if failed:
+        raise RuntimeError(f"{len(failed)} {spec.name} windows failed; re-run to retry only those windows")
+    return rows_by_key
+
+
+__all__ = [
+    "fetch_and_normalize",
+    "log_window_written",
+    "resolve_write_spec",
+    "run_dataset",
+    "write_normalized",
+    "write_window",
+]
@@ -1,26 +1,23 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import psycopg2
-from psycopg2 import sql
-
-from battery_tracker.sources.elexon_physical import fetch_physical
+from battery_tracker.ingest.bulk import COPY_METHOD, UpsertCounts, bulk_upsert
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS
+from battery_tracker.ingest.windows import parse_iso_utc
 
 DATASET_FILTER = "PN"
+# Each row is a linear segment from (ts, fpn_mw) to (time_to, level_to).
+FPN_COLUMNS: tuple[str, ...] = ("ts", "bmu_id", "fpn_mw", "time_to", "level_to")
+FPN_CONFLICT_COLUMNS: tuple[str, ...] = ("ts", "bmu_id")
+FPN_TABLE = "final_physical_notifications"
 
-
-def _parse_timestamp(value: str) -> datetime:
-    ts = str(value).replace("Z", "+00:00")
-    dt = datetime.fromisoformat(ts)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+FpnRow = Tuple[datetime, str, Decimal, Optional[datetime], Decimal]
 
 
-def _normalize_record(record: Dict[str, object], bm_unit: str) -> Tuple[datetime, str, Decimal]:
+def _normalize_record(record: Dict[str, object], bm_unit: str) -> FpnRow:
     dataset_value = str(record.get("dataset", "")).upper()
     if dataset_value != DATASET_FILTER:
         raise ValueError("Record dataset is not PN")
@@ -32,90 +29,128 @@ def _normalize_record(record: Dict[str, object], bm_unit: str) -> Tuple[datetime
         available_keys = ", ".join(sorted(record.keys()))
         raise ValueError(f"Record missing levelFrom. Available keys: {available_keys}")
 
-    if "levelTo" in record and record["levelTo"] != record["levelFrom"]:
-        print(
-            f"Warning: levelFrom ({record['levelFrom']}) != levelTo ({record['levelTo']}) for {record.get('timeFrom')} {bm_unit}",
-            flush=True,
-        )
-
-    ts = _parse_timestamp(record["timeFrom"])
+    ts = parse_iso_utc(record["timeFrom"])
     fpn_mw = Decimal(str(record["levelFrom"]))
-    return ts, bm_unit, fpn_mw
+    time_to = parse_iso_utc(record["timeTo"]) if record.get("timeTo") else None
+    level_to = Decimal(str(record["levelTo"])) if record.get("levelTo") is not None else fpn_mw
+    return ts, bm_unit, fpn_mw, time_to, level_to
 
 
-def filter_and_normalize(records: Iterable[Dict[str, object]], bm_unit: str) -> List[Tuple[datetime, str, Decimal]]:
-    normalized: List[Tuple[datetime, str, Decimal]] = []
+def iter_filter_and_normalize(records: Iterable[Dict[str, object]], bm_unit: str) -> Iterator[FpnRow]:
     for record in records:
         if not isinstance(record, dict):
             raise ValueError("Record is not a mapping")
         dataset_value = str(record.get("dataset", "")).upper()
         if dataset_value != DATASET_FILTER:
             continue
-        normalized.append(_normalize_record(record, bm_unit))
-    return normalized
+        yield _normalize_record(record, bm_unit)
 
 
-def _chunk_time_ranges(start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
-    chunks: List[Tuple[datetime, datetime]] = []
-    current = start
-    window = timedelta(days=7)
-    while current < end:
-        window_end = min(current + window, end)
-        chunks.append((current, window_end))
-        current = window_end
-    return chunks
+def filter_and_normalize(records: Iterable[Dict[str, object]], bm_unit: str) -> List[FpnRow]:
+    return list(iter_filter_and_normalize(records, bm_unit))
 
 
-def upsert_fpn(conn, rows: Sequence[Tuple[datetime, str, Decimal]]) -> None:
-    if not rows:
-        return
+def ensure_fpn_partitions(conn, timestamps: Iterable[datetime]) -> None:
+    """Create the monthly partitions of final_physical_notifications covering ``timestamps``."""
 
-    query = sql.SQL(
-        """
-        INSERT INTO final_physical_notifications (ts, bmu_id, fpn_mw)
-        VALUES (%s, %s, %s)
-        ON CONFLICT (ts, bmu_id) DO UPDATE
-        SET fpn_mw = EXCLUDED.fpn_mw,
-            ingested_at = NOW()
-        """
+    months = sorted(
+        {ts.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0) for ts in timestamps}
     )
-
+    if not months:
+        return
     with conn.cursor() as cur:
-        cur.executemany(query, rows)
+        for month in months:
+            cur.execute("SELECT ensure_final_physical_notifications_partition(%s)", (month,))
+
+
+def upsert_fpn(conn, rows: Sequence[FpnRow], method: str = COPY_METHOD) -> UpsertCounts:
+    if not rows:
+        return UpsertCounts()
+
+    ensure_fpn_partitions(conn, (row[0] for row in rows))
+    counts = bulk_upsert(conn, FPN_TABLE, FPN_COLUMNS, FPN_CONFLICT_COLUMNS, rows, method=method)
     conn.commit()
+    return counts
+
+
+def backfill_fpn_for_bmu(
+    database_url: str,
+    bm_unit: str,
+    start_ts: str,
+    end_ts: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: Optional[float] = None,
+    stream: bool = False,
+    columnar: bool = False,
+    resume: bool = True,
+) -> None:
+    from battery_tracker.ingest.engine import run_dataset
+
+    run_dataset(
+        database_url,
+        "pn",
+        start_ts,
+        end_ts,
+        keys=[bm_unit],
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        stream=stream,
+        columnar=columnar,
+        resume=resume,
+    )
 
 
-def backfill_fpn_for_bmu(database_url: str, bm_unit: str, start_ts: str, end_ts: str) -> None:
-    start = _parse_timestamp(start_ts)
-    end = _parse_timestamp(end_ts)
-
-    ranges = _chunk_time_ranges(start, end)
-    total_rows = 0
-
-    with psycopg2.connect(database_url) as conn:
-        for range_start, range_end in ranges:
-            from_iso = range_start.isoformat().replace("+00:00", "Z")
-            to_iso = range_end.isoformat().replace("+00:00", "Z")
-            print(
-                f"Fetching FPN for {bm_unit} window {from_iso} -> {to_iso}",
-                flush=True,
-            )
-            records = fetch_physical(from_iso, to_iso, bm_unit)
-            normalized = filter_and_normalize(records, bm_unit)
-            upsert_fpn(conn, normalized)
-            total_rows += len(normalized)
-            print(
-                f"Window {from_iso} -> {to_iso}: fetched {len(records)} records, upserted {len(normalized)} rows",
-                flush=True,
-            )
-
-    print(
-        f"Completed FPN backfill for {bm_unit} into final_physical_notifications. Total rows upserted: {total_rows}"
+def load_bm_units(path: str) -> List[str]:
+    """Read BM Unit IDs from a file, one per line; blank lines and ``#`` comments are ignored."""
+
+    units: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            unit = line.split("#", 1)[0].strip()
+            if unit and unit not in units:
+                units.append(unit)
+    return units
+
+
+def backfill_fpn_for_fleet(
+    database_url: str,
+    bm_units: Sequence[str],
+    start_ts: str,
+    end_ts: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: Optional[float] = None,
+    stream: bool = False,
+    columnar: bool = False,
+    resume: bool = True,
+) -> Dict[str, int]:
+    """Backfill PN for many BM Units, scheduling every (unit, window) job on one worker pool.
+
+    Returns the number of rows upserted per BM Unit.
+    """
+
+    from battery_tracker.ingest.engine import run_dataset
+
+    return run_dataset(
+        database_url,
+        "pn",
+        start_ts,
+        end_ts,
+        keys=list(bm_units),
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        stream=stream,
+        columnar=columnar,
+        resume=resume,
     )
 
 
 __all__ = [
+    "FPN_TABLE",
     "backfill_fpn_for_bmu",
+    "backfill_fpn_for_fleet",
+    "ensure_fpn_partitions",
     "filter_and_normalize",
+    "iter_filter_and_normalize",
+    "load_bm_units",
     "upsert_fpn",
 ]
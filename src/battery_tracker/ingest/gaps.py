@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import psycopg2
+from psycopg2 import sql
+
+from battery_tracker.ingest.settlement import settlement_day_start
+from battery_tracker.ingest.system_sell_price import backfill_system_sell_price_range
+from battery_tracker.ingest.wholesale_prices import backfill_mid_to_table
+from battery_tracker.ingest.windows import to_iso
+
+SYSTEM_SELL_PRICE_TABLE = "system_sell_price"
+# Half-hourly price tables fed from MID, keyed by table name -> MID data provider.
+MID_TABLE_PROVIDERS: Dict[str, str] = {
+    "wholesale_day_ahead_price_n2ex": "N2EXMIDP",
+    "wholesale_intraday_price_apx": "APXMIDP",
+}
+PRICE_TABLES: Tuple[str, ...] = (SYSTEM_SELL_PRICE_TABLE, *MID_TABLE_PROVIDERS)
+
+logger = logging.getLogger(__name__)
+
+# Every half hour between local midnight of start_date and local midnight after
+# end_date, so clock-change days naturally expect 46 or 50 periods.
+MISSING_PERIODS_QUERY = """
+    SELECT (expected.ts AT TIME ZONE 'Europe/London')::date AS settlement_date,
+           COUNT(*) AS missing_periods
+    FROM generate_series(
+        (%(start_date)s::date)::timestamp AT TIME ZONE 'Europe/London',
+        ((%(end_date)s::date + 1)::timestamp AT TIME ZONE 'Europe/London') - INTERVAL '30 minutes',
+        INTERVAL '30 minutes'
+    ) AS expected(ts)
+    WHERE NOT EXISTS (SELECT 1 FROM {table} AS t WHERE t.ts = expected.ts)
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+
+def find_missing_periods(conn, table_name: str, start_date: date, end_date: date) -> Dict[date, int]:
+    """Return the number of missing settlement periods per settlement date in ``table_name``."""
+
+    if table_name not in PRICE_TABLES:
+        raise ValueError(f"Unknown price table: {table_name}")
+    query = sql.SQL(MISSING_PERIODS_QUERY).format(table=sql.Identifier(table_name))
+    with conn.cursor() as cur:
+        cur.execute(query, {"start_date": start_date, "end_date": end_date})
+        return {settlement_date: missing for settlement_date, missing in cur.fetchall()}
+
+
+def _contiguous_runs(days: List[date]) -> List[Tuple[date, date]]:
+    runs: List[Tuple[date, date]] = []
+    for day in sorted(days):
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def _local_midnight_iso(day: date) -> str:
+    return to_iso(settlement_day_start(day))
+
+
+def repair_gaps(database_url: str, table_name: str, start_date: date, end_date: date) -> Dict[date, int]:
+    """Re-fetch only the settlement days of ``table_name`` that have missing periods.
+
+    The job ledger is bypassed for the repaired days, since it already records them
+    as done. Returns the gaps found before the repair.
+    """
+
+    with psycopg2.connect(database_url) as conn:
+        gaps = find_missing_periods(conn, table_name, start_date, end_date)
+    if not gaps:
+        logger.info(
+            "%s: no missing periods between %s and %s",
+            table_name,
+            start_date,
+            end_date,
+            extra={"table": table_name, "missing_periods": 0},
+        )
+        return gaps
+
+    logger.info(
+        "%s: %d missing periods across %d days, repairing",
+        table_name,
+        sum(gaps.values()),
+        len(gaps),
+        extra={"table": table_name, "missing_periods": sum(gaps.values()), "days": len(gaps)},
+    )
+    for run_start, run_end in _contiguous_runs(list(gaps)):
+        if table_name == SYSTEM_SELL_PRICE_TABLE:
+            backfill_system_sell_price_range(database_url, run_start, run_end, resume=False)
+        else:
+            backfill_mid_to_table(
+                database_url,
+                MID_TABLE_PROVIDERS[table_name],
+                table_name,
+                _local_midnight_iso(run_start),
+                _local_midnight_iso(run_end + timedelta(days=1)),
+                resume=False,
+            )
+    return gaps
+
+
+__all__ = [
+    "PRICE_TABLES",
+    "find_missing_periods",
+    "repair_gaps",
+]
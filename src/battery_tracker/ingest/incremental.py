@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence
+
+import psycopg2
+from psycopg2 import sql
+
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS
+from battery_tracker.ingest.fpn import FPN_TABLE, backfill_fpn_for_fleet
+from battery_tracker.ingest.settlement import SETTLEMENT_TZ
+from battery_tracker.ingest.system_sell_price import backfill_system_sell_price_range
+from battery_tracker.ingest.wholesale_prices import backfill_mid_to_table
+from battery_tracker.ingest.windows import to_iso
+
+# Re-fetch this far behind the high-water mark so late revisions are picked up.
+DEFAULT_LOOKBACK = timedelta(hours=2)
+# Where a dataset starts when its table is still empty.
+DEFAULT_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+SYSTEM_SELL_PRICE_TABLE = "system_sell_price"
+
+logger = logging.getLogger(__name__)
+
+
+def get_high_water_mark(conn, table_name: str, bmu_id: Optional[str] = None) -> Optional[datetime]:
+    """Return the latest ``ts`` stored in ``table_name`` (for one BM Unit if ``bmu_id`` is given)."""
+
+    query = sql.SQL("SELECT MAX(ts) FROM {table}").format(table=sql.Identifier(table_name))
+    params: tuple = ()
+    if bmu_id is not None:
+        query = query + sql.SQL(" WHERE bmu_id = %s")
+        params = (bmu_id,)
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        (value,) = cur.fetchone()
+    return value
+
+
+def incremental_start(
+    high_water_mark: Optional[datetime],
+    lookback: timedelta = DEFAULT_LOOKBACK,
+    default_start: datetime = DEFAULT_START,
+) -> datetime:
+    if high_water_mark is None:
+        return default_start
+    return high_water_mark - lookback
+
+
+def sync_mid(
+    database_url: str,
+    provider: str,
+    table_name: str,
+    lookback: timedelta = DEFAULT_LOOKBACK,
+    default_start: datetime = DEFAULT_START,
+    end: Optional[datetime] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    with psycopg2.connect(database_url) as conn:
+        start = incremental_start(get_high_water_mark(conn, table_name), lookback, default_start)
+    end = end or datetime.now(timezone.utc)
+    if start >= end:
+        logger.info("%s is up to date (high-water mark %s)", table_name, to_iso(start), extra={"table": table_name})
+        return
+    backfill_mid_to_table(database_url, provider, table_name, to_iso(start), to_iso(end), max_workers)
+
+
+def sync_fpn(
+    database_url: str,
+    bm_units: Sequence[str],
+    lookback: timedelta = DEFAULT_LOOKBACK,
+    default_start: datetime = DEFAULT_START,
+    end: Optional[datetime] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    """Sync PN for the fleet in one run, starting from the earliest BM Unit high-water mark.
+
+    Units that are further ahead re-fetch a little already-stored data, which the upsert absorbs.
+    """
+
+    with psycopg2.connect(database_url) as conn:
+        starts: Dict[str, datetime] = {
+            bm_unit: incremental_start(get_high_water_mark(conn, FPN_TABLE, bm_unit), lookback, default_start)
+            for bm_unit in bm_units
+        }
+    end = end or datetime.now(timezone.utc)
+    pending = []
+    for bm_unit, start in starts.items():
+        if start >= end:
+            logger.info("%s is up to date (high-water mark %s)", bm_unit, to_iso(start), extra={"key": bm_unit})
+        else:
+            pending.append(bm_unit)
+    if not pending:
+        return
+    start = min(starts[bm_unit] for bm_unit in pending)
+    backfill_fpn_for_fleet(database_url, pending, to_iso(start), to_iso(end), max_workers)
+
+
+def sync_system_sell_price(
+    database_url: str,
+    lookback: timedelta = DEFAULT_LOOKBACK,
+    default_start: datetime = DEFAULT_START,
+    end_date: Optional[date] = None,
+) -> None:
+    with psycopg2.connect(database_url) as conn:
+        start = incremental_start(get_high_water_mark(conn, SYSTEM_SELL_PRICE_TABLE), lookback, default_start)
+    start_date = start.astimezone(SETTLEMENT_TZ).date()
+    end_date = end_date or datetime.now(SETTLEMENT_TZ).date()
+    if start_date > end_date:
+        logger.info(
+            "%s is up to date (high-water mark %s)",
+            SYSTEM_SELL_PRICE_TABLE,
+            to_iso(start),
+            extra={"table": SYSTEM_SELL_PRICE_TABLE},
+        )
+        return
+    backfill_system_sell_price_range(database_url, start_date, end_date)
+
+
+__all__ = [
+    "DEFAULT_LOOKBACK",
+    "DEFAULT_START",
+    "get_high_water_mark",
+    "incremental_start",
+    "sync_fpn",
+    "sync_mid",
+    "sync_system_sell_price",
+]
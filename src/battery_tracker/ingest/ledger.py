@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence, Set, Tuple
+
+from battery_tracker.sources.cache import DATASET_TTLS
+
+LEDGER_TABLE = "ingest_job_ledger"
+DONE = "done"
+FAILED = "failed"
+
+Window = Tuple[datetime, datetime]
+JobId = Tuple[Optional[str], datetime, datetime]
+
+# A window only counts as finished if it was written after it settled (its end plus
+# the dataset's settle delay), so windows fetched while their data could still be
+# revised are fetched again on the next run.
+COMPLETED_WINDOWS_QUERY = f"""
+    SELECT NULLIF(job_key, ''), window_start, window_end
+    FROM {LEDGER_TABLE}
+    WHERE dataset = %s
+      AND table_name = %s
+      AND job_key = ANY(%s)
+      AND window_start >= %s
+      AND window_end <= %s
+      AND status = '{DONE}'
+      AND updated_at >= window_end + %s
+"""
+
+RECORD_WINDOW_QUERY = f"""
+    INSERT INTO {LEDGER_TABLE} (
+        dataset, table_name, job_key, window_start, window_end,
+        status, row_count, attempts, duration_seconds, last_error
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, 1, %s, %s)
+    ON CONFLICT (dataset, table_name, job_key, window_start, window_end) DO UPDATE SET
+        status = EXCLUDED.status,
+        row_count = EXCLUDED.row_count,
+        attempts = {LEDGER_TABLE}.attempts + 1,
+        duration_seconds = EXCLUDED.duration_seconds,
+        last_error = EXCLUDED.last_error,
+        updated_at = NOW()
+"""
+
+
+def completed_windows(
+    conn,
+    dataset: str,
+    table_name: str,
+    keys: Sequence[Optional[str]],
+    start: datetime,
+    end: datetime,
+    settle: timedelta = timedelta(0),
+) -> Set[JobId]:
+    """Return the (key, window_start, window_end) jobs written at least ``settle`` after they closed."""
+
+    with conn.cursor() as cur:
+        cur.execute(COMPLETED_WINDOWS_QUERY, (dataset, table_name, [key or "" for key in keys], start, end, settle))
+        return {(key, window_start, window_end) for key, window_start, window_end in cur.fetchall()}
+
+
+def settle_delay(cache_dataset: Optional[str]) -> timedelta:
+    """Return how long after a window closes its data may still be revised, as used by the response cache."""
+
+    if cache_dataset is None:
+        return timedelta(0)
+    return DATASET_TTLS[cache_dataset][0]
+
+
+def is_settled(window: Window, settle: timedelta, now: Optional[datetime] = None) -> bool:
+    """Whether ``window`` closed at least ``settle`` ago.
+
+    Only settled windows are recorded: unsettled ones are fetched again on every run
+    anyway, and windows ending at "now" would otherwise add a new ledger row each time.
+    """
+
+    return window[1] + settle <= (now or datetime.now(timezone.utc))
+
+
+def record_window(
+    conn,
+    dataset: str,
+    table_name: str,
+    key: Optional[str],
+    window: Window,
+    status: str,
+    row_count: int = 0,
+    duration_seconds: Optional[float] = None,
+    error: Optional[str] = None,
+) -> None:
+    """Upsert the outcome of one window. The caller commits, together with the window's rows."""
+
+    with conn.cursor() as cur:
+        cur.execute(
+            RECORD_WINDOW_QUERY,
+            (dataset, table_name, key or "", window[0], window[1], status, row_count, duration_seconds, error),
+        )
+
+
+__all__ = [
+    "DONE",
+    "FAILED",
+    "LEDGER_TABLE",
+    "completed_windows",
+    "is_settled",
+    "record_window",
+    "settle_delay",
+]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from battery_tracker.ingest.bulk import COPY_METHOD, UpsertCounts, bulk_upsert
+
+# Compact storage profile (sql/profiles/compact): the price tables become views over
+# one long-format float8 table, so writes go to market_price with a source id.
+MARKET_PRICE_TABLE = "market_price"
+MARKET_PRICE_COLUMNS: Tuple[str, ...] = ("ts", "source_id", "price_gbp_per_mwh")
+MARKET_PRICE_CONFLICT_COLUMNS: Tuple[str, ...] = ("ts", "source_id")
+PRICE_SOURCE_IDS: Dict[str, int] = {
+    "system_sell_price": 1,
+    "wholesale_day_ahead_price_n2ex": 2,
+    "wholesale_intraday_price_apx": 3,
+}
+# Derived one-row-per-period table joining the price series (sql/migrations/010).
+MARKET_HALF_HOURLY_TABLE = "market_half_hourly"
+PERIOD_LENGTH = timedelta(minutes=30)
+
+
+def compact_prices_enabled(conn) -> bool:
+    """Return True when the compact storage profile has been applied to this database."""
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (MARKET_PRICE_TABLE,))
+        (enabled,) = cur.fetchone()
+    return bool(enabled)
+
+
+def to_market_price_rows(table_name: str, rows: Sequence[Tuple[datetime, Any]]) -> List[Tuple[datetime, int, float]]:
+    source_id = PRICE_SOURCE_IDS[table_name]
+    return [(ts, source_id, float(price)) for ts, price in rows]
+
+
+def upsert_price_rows(
+    conn,
+    table_name: str,
+    value_column: str,
+    rows: Sequence[Tuple[datetime, Any]],
+    method: str = COPY_METHOD,
+) -> UpsertCounts:
+    """Upsert (ts, price) rows into ``table_name``, or into market_price under the compact profile.
+
+    Also refreshes market_half_hourly for the written range. The caller commits.
+    """
+
+    if table_name in PRICE_SOURCE_IDS and compact_prices_enabled(conn):
+        counts = bulk_upsert(
+            conn,
+            MARKET_PRICE_TABLE,
+            MARKET_PRICE_COLUMNS,
+            MARKET_PRICE_CONFLICT_COLUMNS,
+            to_market_price_rows(table_name, rows),
+            method=method,
+        )
+    else:
+        counts = bulk_upsert(conn, table_name, ("ts", value_column), ("ts",), rows, method=method)
+    refresh_for_timestamps(conn, table_name, (row[0] for row in rows))
+    return counts
+
+
+def refresh_market_half_hourly(conn, start: datetime, end: datetime) -> None:
+    """Recompute market_half_hourly for settlement periods starting in [start, end). The caller commits."""
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT refresh_market_half_hourly(%s, %s)", (start, end))
+
+
+def refresh_for_timestamps(conn, table_name: str, timestamps: Iterable[datetime]) -> None:
+    """Refresh market_half_hourly over the span of ``timestamps`` just written to a price table."""
+
+    if table_name not in PRICE_SOURCE_IDS:
+        return
+    timestamps = list(timestamps)
+    if timestamps:
+        refresh_market_half_hourly(conn, min(timestamps), max(timestamps) + PERIOD_LENGTH)
+
+
+def compact_spec(spec, table_name: str):
+    """Return a copy of a price ``DatasetSpec`` that writes float rows into market_price."""
+
+    source_id = PRICE_SOURCE_IDS[table_name]
+    normalize = spec.compact_normalize or spec.normalize
+
+    def normalize_compact(records, key):
+        return [(ts, source_id, float(price)) for ts, price in normalize(records, key)]
+
+    def normalize_compact_columns(records, key):
+        from battery_tracker.ingest.columnar import with_source_id
+
+        columns = spec.normalize_columns(records, key)
+        return with_source_id(columns, source_id)
+
+    return replace(
+        spec,
+        table=MARKET_PRICE_TABLE,
+        columns=MARKET_PRICE_COLUMNS,
+        conflict_columns=MARKET_PRICE_CONFLICT_COLUMNS,
+        normalize=normalize_compact,
+        normalize_columns=normalize_compact_columns if spec.normalize_columns is not None else None,
+        compact_normalize=None,
+    )
+
+
+__all__ = [
+    "MARKET_PRICE_COLUMNS",
+    "MARKET_PRICE_CONFLICT_COLUMNS",
+    "MARKET_HALF_HOURLY_TABLE",
+    "MARKET_PRICE_TABLE",
+    "PRICE_SOURCE_IDS",
+    "compact_prices_enabled",
+    "compact_spec",
+    "refresh_for_timestamps",
+    "refresh_market_half_hourly",
+    "upsert_price_rows",
+]
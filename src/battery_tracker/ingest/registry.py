@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import string
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from battery_tracker.ingest.columnar import normalize_mid_columns, normalize_pn_columns
+from battery_tracker.ingest.fpn import (
+    FPN_COLUMNS,
+    FPN_CONFLICT_COLUMNS,
+    FPN_TABLE,
+    ensure_fpn_partitions,
+    filter_and_normalize,
+)
+from battery_tracker.ingest.settlement import SETTLEMENT_TZ
+from battery_tracker.ingest.system_sell_price import (
+    SYSTEM_PRICE_COLUMNS,
+    SYSTEM_PRICE_CONFLICT_COLUMNS,
+    SYSTEM_PRICE_FLUSH_ROWS,
+    SYSTEM_PRICE_TABLE,
+    normalize_records,
+    normalize_system_price_records,
+    upsert_sell_prices_from_system_prices,
+)
+from battery_tracker.ingest.wholesale_prices import normalize_mid_records
+from battery_tracker.ingest.windows import MAX_WINDOW, to_iso
+from battery_tracker.sources.elexon import SYSTEM_PRICES_PATH, parse_system_prices_payload
+from battery_tracker.sources.elexon_mid import DATASETS_PATH
+from battery_tracker.sources.elexon_physical import PHYSICAL_PATH
+from battery_tracker.sources.http import parse_data_payload
+
+
+Records = Iterable[Dict[str, Any]]
+
+
+def from_to_params(start: datetime, end: datetime) -> Dict[str, str]:
+    return {"from": to_iso(start), "to": to_iso(end)}
+
+
+def settlement_date_params(start: datetime, end: datetime) -> Dict[str, str]:
+    # Daily windows start at UTC midnight, which is 00:00 or 01:00 local time on the
+    # same settlement date all year round.
+    return {"settlement_date": start.astimezone(SETTLEMENT_TZ).date().isoformat()}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Declarative description of an Elexon dataset and the table it is written to.
+
+    ``normalize(records, key)`` turns one window's records into rows matching
+    ``columns``; ``key`` is the value sent as ``key_param`` (e.g. the BM Unit).
+    Placeholders in ``path`` are filled from the request parameters.
+    """
+
+    name: str
+    path: str
+    table: str
+    columns: Tuple[str, ...]
+    conflict_columns: Tuple[str, ...]
+    normalize: Callable[[Records, Optional[str]], List[Tuple[Any, ...]]]
+    window: timedelta = MAX_WINDOW
+    params: Mapping[str, str] = field(default_factory=dict)
+    key_param: Optional[str] = None
+    window_params: Callable[[datetime, datetime], Dict[str, str]] = from_to_params
+    normalize_columns: Optional[Callable[[Sequence[Dict[str, Any]], Optional[str]], Dict[str, Any]]] = None
+    parse: Callable[[Any], List[Dict[str, Any]]] = parse_data_payload
+    cache_dataset: Optional[str] = None
+    # Float-valued normalizer used instead of ``normalize`` under the compact storage profile.
+    compact_normalize: Optional[Callable[[Records, Optional[str]], List[Tuple[Any, ...]]]] = None
+    # Called with (conn, timestamps) before each write to create missing partitions.
+    ensure_partitions: Optional[Callable[[Any, Iterable[datetime]], None]] = None
+    # Called with (conn, normalized rows) after each write, in the same transaction,
+    # to keep tables derived from this one in step.
+    after_write: Optional[Callable[[Any, Any], Any]] = None
+    # Buffer windows until about this many rows and write them in one transaction.
+    flush_rows: Optional[int] = None
+
+    def build_request(
+        self, window: Tuple[datetime, datetime], key: Optional[str] = None
+    ) -> Tuple[str, Dict[str, str]]:
+        params = dict(self.params)
+        params.update(self.window_params(*window))
+        if self.key_param is not None:
+            if key is None:
+                raise ValueError(f"Dataset {self.name} requires a {self.key_param} key")
+            params[self.key_param] = key
+        path_fields = [name for _, name, _, _ in string.Formatter().parse(self.path) if name]
+        path = self.path.format(**{name: params.pop(name) for name in path_fields})
+        return path, params
+
+
+REGISTRY: Dict[str, DatasetSpec] = {}
+
+
+def register_dataset(spec: DatasetSpec) -> DatasetSpec:
+    if spec.name in REGISTRY:
+        raise ValueError(f"Dataset {spec.name} is already registered")
+    REGISTRY[spec.name] = spec
+    return spec
+
+
+def get_dataset(name: str) -> DatasetSpec:
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        known = ", ".join(sorted(REGISTRY))
+        raise ValueError(f"Unknown dataset {name}. Registered datasets: {known}") from None
+
+
+def _provider_records(records: Records, provider: str) -> List[Dict[str, Any]]:
+    return [record for record in records if record.get("dataProvider") == provider]
+
+
+def mid_dataset_spec(name: str, provider: str, table: str) -> DatasetSpec:
+    return DatasetSpec(
+        name=name,
+        path=DATASETS_PATH,
+        table=table,
+        columns=("ts", "price_gbp_per_mwh"),
+        conflict_columns=("ts",),
+        normalize=lambda records, key: normalize_mid_records(_provider_records(records, provider)),
+        normalize_columns=lambda records, key: normalize_mid_columns(
+            _provider_records(records, provider), f"{provider} MID"
+        ),
+        compact_normalize=lambda records, key: normalize_mid_records(
+            _provider_records(records, provider), as_float=True
+        ),
+        params={"dataProvider": provider},
+        cache_dataset="MID",
+    )
+
+
+N2EX = register_dataset(mid_dataset_spec("n2ex", "N2EXMIDP", "wholesale_day_ahead_price_n2ex"))
+APX = register_dataset(mid_dataset_spec("apx", "APXMIDP", "wholesale_intraday_price_apx"))
+PN = register_dataset(
+    DatasetSpec(
+        name="pn",
+        path=PHYSICAL_PATH,
+        table=FPN_TABLE,
+        columns=FPN_COLUMNS,
+        conflict_columns=FPN_CONFLICT_COLUMNS,
+        normalize=lambda records, key: filter_and_normalize(records, key),
+        normalize_columns=lambda records, key: normalize_pn_columns(records, key),
+        key_param="bmUnit",
+        cache_dataset="PN",
+        ensure_partitions=ensure_fpn_partitions,
+    )
+)
+SSP = register_dataset(
+    DatasetSpec(
+        name="ssp",
+        path=SYSTEM_PRICES_PATH,
+        table="system_sell_price",
+        columns=("ts", "ssp_gbp_per_mwh"),
+        conflict_columns=("ts",),
+        normalize=lambda records, key: normalize_records(records),
+        compact_normalize=lambda records, key: normalize_records(records, as_float=True),
+        window=timedelta(days=1),
+        window_params=settlement_date_params,
+        parse=parse_system_prices_payload,
+        cache_dataset="SYSTEM_PRICES",
+    )
+)
+
+SYSTEM_PRICES = register_dataset(
+    DatasetSpec(
+        name="system_prices",
+        path=SYSTEM_PRICES_PATH,
+        table=SYSTEM_PRICE_TABLE,
+        columns=SYSTEM_PRICE_COLUMNS,
+        conflict_columns=SYSTEM_PRICE_CONFLICT_COLUMNS,
+        normalize=lambda records, key: normalize_system_price_records(records),
+        window=timedelta(days=1),
+        window_params=settlement_date_params,
+        parse=parse_system_prices_payload,
+        cache_dataset="SYSTEM_PRICES",
+        after_write=upsert_sell_prices_from_system_prices,
+        flush_rows=SYSTEM_PRICE_FLUSH_ROWS,
+    )
+)
+
+
+__all__ = [
+    "APX",
+    "DatasetSpec",
+    "N2EX",
+    "PN",
+    "REGISTRY",
+    "SSP",
+    "SYSTEM_PRICES",
+    "get_dataset",
+    "mid_dataset_spec",
+    "register_dataset",
+    "settlement_date_params",
+]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Tuple
+
+from battery_tracker.timeutil import SETTLEMENT_TZ, london_day_start
+
+# GB settlement days run from local midnight to local midnight, so they have 46
+# periods on the spring clock change, 50 in the autumn and 48 otherwise. Period N
+# starts (N - 1) half hours after local midnight.
+PERIOD_LENGTH = timedelta(minutes=30)
+CALENDAR_TABLE = "settlement_period"
+
+_calendar: Dict[date, Tuple[datetime, ...]] = {}
+
+
+def settlement_day_start(settlement_date: date) -> datetime:
+    """Return local midnight at the start of ``settlement_date`` in UTC."""
+
+    return london_day_start(settlement_date)
+
+
+def _build_day(settlement_date: date) -> Tuple[datetime, ...]:
+    start = settlement_day_start(settlement_date)
+    end = settlement_day_start(settlement_date + timedelta(days=1))
+    count = int((end - start) / PERIOD_LENGTH)
+    return tuple(start + i * PERIOD_LENGTH for i in range(count))
+
+
+def _day_periods(settlement_date: date) -> Tuple[datetime, ...]:
+    periods = _calendar.get(settlement_date)
+    if periods is None:
+        periods = _calendar[settlement_date] = _build_day(settlement_date)
+    return periods
+
+
+def build_settlement_calendar(start_year: int, end_year: int) -> None:
+    """Precompute period start times for every settlement date in ``start_year``..``end_year``.
+
+    Dates outside the range are still computed on first lookup and kept.
+    """
+
+    day = date(start_year, 1, 1)
+    while day.year <= end_year:
+        _day_periods(day)
+        day += timedelta(days=1)
+
+
+def periods_in_day(settlement_date: date) -> int:
+    return len(_day_periods(settlement_date))
+
+
+def settlement_period_to_utc(settlement_date: date, settlement_period: int) -> datetime:
+    periods = _day_periods(settlement_date)
+    if not 1 <= settlement_period <= len(periods):
+        raise ValueError(
+            f"settlement_period must be between 1 and {len(periods)} on {settlement_date.isoformat()}"
+        )
+    return periods[settlement_period - 1]
+
+
+__all__ = [
+    "CALENDAR_TABLE",
+    "SETTLEMENT_TZ",
+    "build_settlement_calendar",
+    "periods_in_day",
+    "settlement_day_start",
+    "settlement_period_to_utc",
+]
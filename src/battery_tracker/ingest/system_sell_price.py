@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+import json
 from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, Iterable, List, Sequence, Tuple
-
-import psycopg2
-
-from battery_tracker.sources.elexon import SELL_PRICE_KEYS
-
-
-def settlement_period_to_utc(settlement_date: date, settlement_period: int) -> datetime:
-    if settlement_period < 1:
-        raise ValueError("settlement_period must be >= 1")
-    start_of_day = datetime.combine(settlement_date, time(0, 0, tzinfo=timezone.utc))
-    return start_of_day + timedelta(minutes=30 * (settlement_period - 1))
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from battery_tracker.ingest.bulk import COPY_METHOD, UpsertCounts
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS
+from battery_tracker.ingest.market_price import upsert_price_rows
+from battery_tracker.ingest.settlement import settlement_period_to_utc
+from battery_tracker.ingest.windows import parse_iso_utc, to_iso
+from battery_tracker.sources.elexon import BUY_PRICE_KEYS, SELL_PRICE_KEYS
+
+# system_price keeps every field of the system-prices response; system_sell_price
+# is derived from it on each write. Rows are buffered across settlement dates and
+# written about a month at a time.
+SYSTEM_PRICE_TABLE = "system_price"
+SYSTEM_PRICE_COLUMNS: Tuple[str, ...] = (
+    "ts",
+    "settlement_date",
+    "settlement_period",
+    "ssp_gbp_per_mwh",
+    "sbp_gbp_per_mwh",
+    "net_imbalance_volume_mwh",
+    "price_derivation_code",
+    "reserve_scarcity_price_gbp_per_mwh",
+    "bsad_defaulted",
+    "published_at",
+    "record",
+)
+SYSTEM_PRICE_CONFLICT_COLUMNS: Tuple[str, ...] = ("ts",)
+SYSTEM_PRICE_FLUSH_ROWS = 31 * 48
+
+SystemPriceRow = Tuple[Any, ...]
 
 
 def _get_settlement_date(record: Dict[str, Any]) -> date:
@@ -36,65 +55,129 @@ def _get_settlement_period(record: Dict[str, Any]) -> int:
     return int(value)
 
 
-def _get_sell_price(record: Dict[str, Any]) -> Decimal:
+def _get_sell_price(record: Dict[str, Any], as_float: bool = False) -> Union[Decimal, float]:
     for key in SELL_PRICE_KEYS:
         if key in record:
-            return Decimal(str(record[key]))
+            return float(record[key]) if as_float else Decimal(str(record[key]))
     raise ValueError("Record missing sell price")
 
 
-def normalize_records(records: Iterable[Dict[str, Any]]) -> List[Tuple[datetime, Decimal]]:
-    normalized: List[Tuple[datetime, Decimal]] = []
+def _optional_decimal(record: Dict[str, Any], *keys: str) -> Optional[Decimal]:
+    for key in keys:
+        if record.get(key) is not None:
+            return Decimal(str(record[key]))
+    return None
+
+
+def normalize_records(
+    records: Iterable[Dict[str, Any]], as_float: bool = False
+) -> List[Tuple[datetime, Union[Decimal, float]]]:
+    normalized: List[Tuple[datetime, Union[Decimal, float]]] = []
     for record in records:
         if not isinstance(record, dict):
             raise ValueError("Record is not a mapping")
         settlement_date = _get_settlement_date(record)
         settlement_period = _get_settlement_period(record)
         ts = settlement_period_to_utc(settlement_date, settlement_period)
-        price = _get_sell_price(record)
+        price = _get_sell_price(record, as_float)
         normalized.append((ts, price))
     return normalized
 
 
-def upsert_system_sell_prices(conn, rows: Sequence[Tuple[datetime, Decimal]]) -> None:
-    if not rows:
-        return
-    with conn.cursor() as cur:
-        cur.executemany(
-            """
-            INSERT INTO system_sell_price (ts, ssp_gbp_per_mwh)
-            VALUES (%s, %s)
-            ON CONFLICT (ts) DO UPDATE
-            SET ssp_gbp_per_mwh = EXCLUDED.ssp_gbp_per_mwh,
-                ingested_at = NOW()
-            """,
-            rows,
+def normalize_system_price_records(records: Iterable[Dict[str, Any]]) -> List[SystemPriceRow]:
+    """Rows matching ``SYSTEM_PRICE_COLUMNS``, with the whole source record kept as JSON."""
+
+    normalized: List[SystemPriceRow] = []
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError("Record is not a mapping")
+        settlement_date = _get_settlement_date(record)
+        settlement_period = _get_settlement_period(record)
+        published_at = record.get("createdDateTime")
+        bsad_defaulted = record.get("bsadDefaulted")
+        normalized.append(
+            (
+                settlement_period_to_utc(settlement_date, settlement_period),
+                settlement_date,
+                settlement_period,
+                _get_sell_price(record),
+                _optional_decimal(record, *BUY_PRICE_KEYS),
+                _optional_decimal(record, "netImbalanceVolume"),
+                record.get("priceDerivationCode"),
+                _optional_decimal(record, "reserveScarcityPrice"),
+                bool(bsad_defaulted) if bsad_defaulted is not None else None,
+                parse_iso_utc(published_at) if published_at else None,
+                json.dumps(record, sort_keys=True, default=str),
+            )
         )
-    conn.commit()
+    return normalized
 
 
-def backfill_system_sell_price_2025(database_url: str) -> None:
-    from battery_tracker.sources.elexon import fetch_system_prices_for_date
+def upsert_sell_prices_from_system_prices(conn, rows: Sequence[SystemPriceRow]) -> UpsertCounts:
+    """Write the SSP of ``rows`` to system_sell_price, so it stays in step with system_price. The caller commits."""
 
-    start_date = date(2025, 1, 1)
-    end_date = date(2025, 12, 31)
+    ts_index = SYSTEM_PRICE_COLUMNS.index("ts")
+    ssp_index = SYSTEM_PRICE_COLUMNS.index("ssp_gbp_per_mwh")
+    return upsert_price_rows(
+        conn, "system_sell_price", "ssp_gbp_per_mwh", [(row[ts_index], row[ssp_index]) for row in rows]
+    )
 
-    current_date = start_date
-    with psycopg2.connect(database_url) as conn:
-        while current_date <= end_date:
-            records = fetch_system_prices_for_date(current_date)
-            rows = normalize_records(records)
-            upsert_system_sell_prices(conn, rows)
-            print(
-                f"{current_date}: fetched {len(records)} records, upserted {len(rows)} rows",
-                flush=True,
-            )
-            current_date += timedelta(days=1)
+
+def upsert_system_sell_prices(
+    conn,
+    rows: Sequence[Tuple[datetime, Union[Decimal, float]]],
+    method: str = COPY_METHOD,
+) -> UpsertCounts:
+    if not rows:
+        return UpsertCounts()
+    counts = upsert_price_rows(conn, "system_sell_price", "ssp_gbp_per_mwh", rows, method=method)
+    conn.commit()
+    return counts
+
+
+def backfill_system_sell_price_range(
+    database_url: str,
+    start_date: date,
+    end_date: date,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    flush_rows: Optional[int] = None,
+    resume: bool = True,
+) -> int:
+    """Backfill system prices for every settlement date from ``start_date`` to ``end_date`` inclusive.
+
+    Days are fetched concurrently and written to system_price and system_sell_price
+    in batches of about ``flush_rows`` rows (a month by default), one transaction each.
+    """
+
+    from battery_tracker.ingest.engine import run_dataset
+
+    start = datetime.combine(start_date, time(0, 0, tzinfo=timezone.utc))
+    end = datetime.combine(end_date + timedelta(days=1), time(0, 0, tzinfo=timezone.utc))
+    rows_by_key = run_dataset(
+        database_url,
+        "system_prices",
+        to_iso(start),
+        to_iso(end),
+        max_workers=max_workers,
+        flush_rows=flush_rows,
+        resume=resume,
+    )
+    return sum(rows_by_key.values())
+
+
+def backfill_system_sell_price_2025(database_url: str, resume: bool = True) -> None:
+    backfill_system_sell_price_range(database_url, date(2025, 1, 1), date(2025, 12, 31), resume=resume)
 
 
 __all__ = [
+    "SYSTEM_PRICE_COLUMNS",
+    "SYSTEM_PRICE_CONFLICT_COLUMNS",
+    "SYSTEM_PRICE_FLUSH_ROWS",
+    "SYSTEM_PRICE_TABLE",
     "backfill_system_sell_price_2025",
+    "backfill_system_sell_price_range",
     "normalize_records",
-    "settlement_period_to_utc",
+    "normalize_system_price_records",
+    "upsert_sell_prices_from_system_prices",
     "upsert_system_sell_prices",
 ]
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-import psycopg2
-from psycopg2 import sql
-
-from battery_tracker.sources.elexon_mid import fetch_mid
+from battery_tracker.ingest.bulk import COPY_METHOD, UpsertCounts
+from battery_tracker.ingest.concurrency import DEFAULT_MAX_WORKERS
+from battery_tracker.ingest.market_price import upsert_price_rows
+from battery_tracker.ingest.settlement import settlement_period_to_utc
+from battery_tracker.ingest.windows import parse_iso_utc
 
 TIMESTAMP_KEYS: tuple[str, ...] = (
     "timestamp",
@@ -24,86 +25,63 @@ PRICE_KEYS: tuple[str, ...] = (
 )
 
 
-def _parse_iso_utc(value: str) -> datetime:
-    ts = str(value).replace("Z", "+00:00")
-    dt = datetime.fromisoformat(ts)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+# Registered dataset for each MID data provider.
+MID_PROVIDER_DATASETS = {"N2EXMIDP": "n2ex", "APXMIDP": "apx"}
 
 
 def _get_timestamp(record: Dict[str, object]) -> datetime:
     if "startTime" in record:
-        return _parse_iso_utc(record["startTime"])
+        return parse_iso_utc(record["startTime"])
     if "settlementDate" in record and "settlementPeriod" in record:
         settlement_date = datetime.fromisoformat(str(record["settlementDate"])).date()
         try:
             settlement_period = int(record["settlementPeriod"])
         except (TypeError, ValueError) as exc:
             raise ValueError("Invalid settlementPeriod in MID record.") from exc
-        if settlement_period < 1:
-            raise ValueError("settlementPeriod must be >= 1 in MID record.")
-        base = datetime(
-            settlement_date.year,
-            settlement_date.month,
-            settlement_date.day,
-            tzinfo=timezone.utc,
-        )
-        return base + timedelta(minutes=(settlement_period - 1) * 30)
+        try:
+            return settlement_period_to_utc(settlement_date, settlement_period)
+        except ValueError as exc:
+            raise ValueError(f"Invalid settlementPeriod in MID record: {exc}") from exc
     for key in TIMESTAMP_KEYS:
         if key in record:
-            return _parse_iso_utc(record[key])
+            return parse_iso_utc(record[key])
     available_keys = ", ".join(sorted(record.keys()))
     raise ValueError(f"No timestamp field found in MID record. Available keys: {available_keys}")
 
 
-def _get_price(record: Dict[str, object]) -> Decimal:
+def _get_price(record: Dict[str, object], as_float: bool = False) -> Union[Decimal, float]:
     for key in PRICE_KEYS:
         if key in record:
-            return Decimal(str(record[key]))
+            return float(record[key]) if as_float else Decimal(str(record[key]))
     available_keys = ", ".join(sorted(record.keys()))
     raise ValueError(f"No price field found in MID record. Available keys: {available_keys}")
 
 
-def normalize_mid_records(records: Iterable[Dict[str, object]]) -> List[Tuple[datetime, Decimal]]:
-    normalized: List[Tuple[datetime, Decimal]] = []
+def normalize_mid_records(
+    records: Iterable[Dict[str, object]], as_float: bool = False
+) -> List[Tuple[datetime, Union[Decimal, float]]]:
+    normalized: List[Tuple[datetime, Union[Decimal, float]]] = []
     for record in records:
         if not isinstance(record, dict):
             raise ValueError("Record is not a mapping")
         ts = _get_timestamp(record)
-        price = _get_price(record)
+        price = _get_price(record, as_float)
         normalized.append((ts, price))
     return normalized
 
 
-def _chunk_time_ranges(start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
-    chunks: List[Tuple[datetime, datetime]] = []
-    current = start
-    window = timedelta(days=7)
-    while current < end:
-        window_end = min(current + window, end)
-        chunks.append((current, window_end))
-        current = window_end
-    return chunks
-
-
-def upsert_mid_prices(conn, table_name: str, rows: Sequence[Tuple[datetime, Decimal]]) -> None:
+def upsert_mid_prices(
+    conn,
+    table_name: str,
+    rows: Sequence[Tuple[datetime, Union[Decimal, float]]],
+    method: str = COPY_METHOD,
+) -> UpsertCounts:
     if not rows:
-        return
-
-    query = sql.SQL(
-        """
-        INSERT INTO {table} (ts, price_gbp_per_mwh)
-        VALUES (%s, %s)
-        ON CONFLICT (ts) DO UPDATE
-        SET price_gbp_per_mwh = EXCLUDED.price_gbp_per_mwh,
-            ingested_at = NOW()
-        """
-    ).format(table=sql.Identifier(table_name))
-
-    with conn.cursor() as cur:
-        cur.executemany(query, rows)
+        return UpsertCounts()
+
+    counts = upsert_price_rows(conn, table_name, "price_gbp_per_mwh", rows, method=method)
     conn.commit()
+    return counts
 
 
 def backfill_mid_to_table(
@@ -112,39 +90,33 @@ def backfill_mid_to_table(
     table_name: str,
     start_ts: str,
     end_ts: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: Optional[float] = None,
+    columnar: bool = False,
+    resume: bool = True,
 ) -> None:
-    start = _parse_iso_utc(start_ts)
-    end = _parse_iso_utc(end_ts)
-
-    ranges = _chunk_time_ranges(start, end)
-    total_rows = 0
-
-    with psycopg2.connect(database_url) as conn:
-        for range_start, range_end in ranges:
-            from_iso = range_start.isoformat().replace("+00:00", "Z")
-            to_iso = range_end.isoformat().replace("+00:00", "Z")
-            print(
-                f"Fetching MID provider={provider} window {from_iso} -> {to_iso}",
-                flush=True,
-            )
-            records = fetch_mid(from_iso, to_iso, provider)
-            filtered = [record for record in records if record.get("dataProvider") == provider]
-            print(
-                f"Window {from_iso} -> {to_iso}: fetched {len(records)} records, after provider filter {len(filtered)}",
-                flush=True,
-            )
-            normalized = normalize_mid_records(filtered)
-            upsert_mid_prices(conn, table_name, normalized)
-            total_rows += len(normalized)
-            print(
-                f"Window {from_iso} -> {to_iso}: upserted {len(normalized)} rows",
-                flush=True,
-            )
-
-    print(f"Completed backfill into {table_name}. Total rows upserted: {total_rows}")
+    from battery_tracker.ingest.engine import run_dataset
+
+    dataset = MID_PROVIDER_DATASETS.get(provider)
+    if dataset is None:
+        known = ", ".join(sorted(MID_PROVIDER_DATASETS))
+        raise ValueError(f"Unknown MID provider {provider}. Known providers: {known}")
+
+    run_dataset(
+        database_url,
+        dataset,
+        start_ts,
+        end_ts,
+        table_name=table_name,
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        columnar=columnar,
+        resume=resume,
+    )
 
 
 __all__ = [
+    "MID_PROVIDER_DATASETS",
     "backfill_mid_to_table",
     "normalize_mid_records",
     "upsert_mid_prices",
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+MAX_WINDOW = timedelta(days=7)
+
+
+def parse_iso_utc(value: str) -> datetime:
+    ts = str(value).replace("Z", "+00:00")
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def to_iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def chunk_time_ranges(
+    start: datetime, end: datetime, window: timedelta = MAX_WINDOW
+) -> List[Tuple[datetime, datetime]]:
+    chunks: List[Tuple[datetime, datetime]] = []
+    current = start
+    while current < end:
+        window_end = min(current + window, end)
+        chunks.append((current, window_end))
+        current = window_end
+    return chunks
+
+
+def window_iso(window: Tuple[datetime, datetime]) -> Tuple[str, str]:
+    range_start, range_end = window
+    return to_iso(range_start), to_iso(range_end)
+
+
+__all__ = [
+    "MAX_WINDOW",
+    "chunk_time_ranges",
+    "parse_iso_utc",
+    "to_iso",
+    "window_iso",
+]
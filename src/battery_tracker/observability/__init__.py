@@ -0,0 +1,24 @@
+"""Metrics and logging for battery tracker."""
+
+from battery_tracker.observability.export import (
+    configure_observability,
+    start_exporters_from_env,
+    start_metrics_server,
+    start_textfile_exporter,
+    write_textfile,
+)
+from battery_tracker.observability.log import configure_logging
+from battery_tracker.observability.metrics import REGISTRY, Counter, Histogram, MetricsRegistry
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "configure_logging",
+    "configure_observability",
+    "start_exporters_from_env",
+    "start_metrics_server",
+    "start_textfile_exporter",
+    "write_textfile",
+]
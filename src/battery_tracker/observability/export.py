@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Union
+
+from battery_tracker.observability.log import configure_logging
+from battery_tracker.observability.metrics import REGISTRY, MetricsRegistry
+
+# Metrics are exposed either on a local HTTP endpoint for Prometheus to scrape
+# (METRICS_PORT) or as a file for node_exporter's textfile collector
+# (METRICS_TEXTFILE), rewritten periodically and once more at exit.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_TEXTFILE_INTERVAL = 15.0
+
+
+def write_textfile(path: Union[str, Path], registry: MetricsRegistry = REGISTRY) -> None:
+    """Atomically replace ``path`` with the current metrics."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(registry.render(), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def start_textfile_exporter(
+    path: Union[str, Path],
+    interval: float = DEFAULT_TEXTFILE_INTERVAL,
+    registry: MetricsRegistry = REGISTRY,
+) -> threading.Event:
+    """Rewrite ``path`` every ``interval`` seconds and at exit. Set the returned event to stop."""
+
+    stopped = threading.Event()
+
+    def loop() -> None:
+        while not stopped.wait(interval):
+            write_textfile(path, registry)
+
+    def final_write() -> None:
+        stopped.set()
+        write_textfile(path, registry)
+
+    threading.Thread(target=loop, name="metrics-textfile", daemon=True).start()
+    atexit.register(final_write)
+    return stopped
+
+
+def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry = REGISTRY,
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a background thread. Call ``shutdown()`` on the result to stop."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - http.server signature
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_exporters_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the exporters configured by METRICS_PORT / METRICS_HOST and METRICS_TEXTFILE."""
+
+    server = None
+    port = os.getenv("METRICS_PORT")
+    if port:
+        server = start_metrics_server(int(port), os.getenv("METRICS_HOST", "127.0.0.1"))
+    textfile = os.getenv("METRICS_TEXTFILE")
+    if textfile:
+        start_textfile_exporter(textfile)
+    return server
+
+
+def configure_observability(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """Set up logging and start any metrics exporters configured in the environment."""
+
+    configure_logging(level, fmt)
+    start_exporters_from_env()
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "configure_observability",
+    "start_exporters_from_env",
+    "start_metrics_server",
+    "start_textfile_exporter",
+    "write_textfile",
+]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# Library modules log through ``logging.getLogger(__name__)`` and pass the values a
+# message is about as ``extra`` fields. Scripts call ``configure_logging``: the text
+# format reads like the old progress prints, the JSON format emits one object per
+# line with the extra fields as keys (LOG_FORMAT=json).
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOGGER_NAME = "battery_tracker"
+
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def log_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Return the ``extra`` fields attached to ``record``."""
+
+    return {key: value for key, value in vars(record).items() if key not in _RESERVED}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(log_fields(record))
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> logging.Logger:
+    """Send battery_tracker logs to stderr. Defaults come from LOG_LEVEL (INFO) and LOG_FORMAT (text)."""
+
+    level = (level or os.getenv("LOG_LEVEL") or "INFO").upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT") or "text").lower()
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unknown log format: {fmt}. Expected 'text' or 'json'.")
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    logger = logging.getLogger(LOGGER_NAME)
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+__all__ = [
+    "JsonFormatter",
+    "LOGGER_NAME",
+    "configure_logging",
+    "log_fields",
+]
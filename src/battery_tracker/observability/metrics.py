@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+# A minimal in-process metrics registry rendered in the Prometheus text format, so
+# a slow run can be attributed to the API (http_*), normalization (normalize_*) or
+# the database (upsert_*, rows_written_*). Label values are kept low-cardinality:
+# endpoints have dates replaced and never include query parameters.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+_DATE_SEGMENT = re.compile(r"/\d{4}-\d{2}-\d{2}(?=/|$)")
+
+
+def _label_values(labelnames: Sequence[str], labels: Dict[str, object]) -> LabelValues:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {sorted(labelnames)}, got {sorted(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str]) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values))
+    return "{" + pairs + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(_label_values(self.labelnames, labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last is +Inf)], sum.
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _label_values(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            values = self._values.get(_label_values(self.labelnames, labels))
+            return sum(values[0]) if values else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        names = (*self.labelnames, "le")
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_number(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, *args: object) -> object:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "battery_tracker_http_request_seconds",
+    "Elexon request latency per attempt, until the body is read.",
+    ("endpoint", "status"),
+)
+HTTP_RETRIES_TOTAL = REGISTRY.counter(
+    "battery_tracker_http_retries_total",
+    "Elexon request attempts that failed and were retried.",
+    ("endpoint", "reason"),
+)
+HTTP_RESPONSE_BYTES_TOTAL = REGISTRY.counter(
+    "battery_tracker_http_response_bytes_total",
+    "Decoded Elexon response body bytes downloaded.",
+    ("endpoint",),
+)
+HTTP_CACHE_HITS_TOTAL = REGISTRY.counter(
+    "battery_tracker_http_cache_hits_total",
+    "Elexon responses served from the on-disk response cache.",
+    ("endpoint",),
+)
+RECORDS_NORMALIZED_TOTAL = REGISTRY.counter(
+    "battery_tracker_records_normalized_total",
+    "Source records passed through a dataset's normalizer.",
+    ("dataset",),
+)
+NORMALIZE_SECONDS = REGISTRY.histogram(
+    "battery_tracker_normalize_seconds",
+    "Time spent normalizing one window (includes the download when streaming).",
+    ("dataset",),
+)
+UPSERT_SECONDS = REGISTRY.histogram(
+    "battery_tracker_upsert_seconds",
+    "Latency of one bulk upsert batch.",
+    ("table", "method"),
+)
+ROWS_WRITTEN_TOTAL = REGISTRY.counter(
+    "battery_tracker_rows_written_total",
+    "Rows sent to the database by bulk upserts, by outcome (inserted, updated, unchanged).",
+    ("table", "outcome"),
+)
+
+
+def endpoint_label(url: str) -> str:
+    """Return the path of ``url`` with date segments replaced, for use as a label."""
+
+    return _DATE_SEGMENT.sub("/{date}", urlsplit(url).path)
+
+
+__all__ = [
+    "Counter",
+    "DEFAULT_BUCKETS",
+    "HTTP_CACHE_HITS_TOTAL",
+    "HTTP_REQUEST_SECONDS",
+    "HTTP_RESPONSE_BYTES_TOTAL",
+    "HTTP_RETRIES_TOTAL",
+    "Histogram",
+    "MetricsRegistry",
+    "NORMALIZE_SECONDS",
+    "RECORDS_NORMALIZED_TOTAL",
+    "REGISTRY",
+    "ROWS_WRITTEN_TOTAL",
+    "UPSERT_SECONDS",
+    "endpoint_label",
+]
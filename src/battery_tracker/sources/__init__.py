@@ -2,10 +2,11 @@
 
 from battery_tracker.sources.elexon import fetch_system_prices_for_date
 from battery_tracker.sources.elexon_mid import fetch_mid
-from battery_tracker.sources.elexon_physical import fetch_physical
+from battery_tracker.sources.elexon_physical import fetch_physical, iter_physical
 
 __all__ = [
     "fetch_mid",
     "fetch_physical",
     "fetch_system_prices_for_date",
+    "iter_physical",
 ]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# dataset -> (age after which a window is treated as settled, TTL in seconds for recent windows).
+# Settled windows never expire; they only leave the cache through LRU eviction.
+DATASET_TTLS: Dict[str, Tuple[timedelta, float]] = {
+    "MID": (timedelta(days=2), 15 * 60),
+    "PN": (timedelta(days=2), 15 * 60),
+    "SYSTEM_PRICES": (timedelta(days=30), 60 * 60),
+}
+
+
+def cache_ttl(dataset: str, window_end: Union[datetime, str], now: Optional[datetime] = None) -> Optional[float]:
+    """Return the TTL in seconds for a response covering data up to ``window_end``, or ``None`` for no expiry."""
+
+    settled_after, recent_ttl = DATASET_TTLS[dataset]
+    now = now or datetime.now(timezone.utc)
+    if isinstance(window_end, str):
+        window_end = datetime.fromisoformat(window_end.replace("Z", "+00:00"))
+    if window_end.tzinfo is None:
+        window_end = window_end.replace(tzinfo=timezone.utc)
+    if window_end <= now - settled_after:
+        return None
+    return recent_ttl
+
+
+class ResponseCache:
+    """Content-addressed store of gzip-compressed raw response bodies with TTL and LRU eviction."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._entries())
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Mapping[str, object]] = None) -> str:
+        canonical = json.dumps([endpoint, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.gz"
+
+    def _entries(self):
+        return self.directory.glob("*/*.gz")
+
+    def get(
+        self,
+        endpoint: str,
+        params: Optional[Mapping[str, object]] = None,
+        include_expired: bool = False,
+    ) -> Optional[bytes]:
+        path = self._path(self.key(endpoint, params))
+        try:
+            with gzip.open(path, "rb") as f:
+                header = f.readline()
+                body = f.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        if include_expired:
+            # Replaying recorded responses: leave expiry and recency untouched.
+            return body
+
+        expires_at = float(header)
+        if expires_at and expires_at < time.time():
+            self._remove(path)
+            return None
+        # Bump mtime so eviction drops the least recently used entries first.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return body
+
+    def put(
+        self,
+        endpoint: str,
+        params: Optional[Mapping[str, object]],
+        body: bytes,
+        ttl: Optional[float],
+    ) -> None:
+        path = self._path(self.key(endpoint, params))
+        path.parent.mkdir(exist_ok=True)
+        expires_at = time.time() + ttl if ttl is not None else 0
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(f"{expires_at}\n".encode("ascii"))
+            f.write(body)
+        size = tmp_path.stat().st_size
+        with self._lock:
+            if path.exists():
+                self._size -= path.stat().st_size
+            os.replace(tmp_path, path)
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: Path) -> None:
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                return
+            self._size -= size
+
+    def _evict(self) -> None:
+        # Trim to 90% of the budget so eviction does not run on every put.
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+
+_cache: Optional[ResponseCache] = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def configure_cache(directory: Optional[str], max_bytes: int = DEFAULT_MAX_BYTES) -> Optional[ResponseCache]:
+    """Enable the shared response cache at ``directory``, or disable it when ``directory`` is ``None``."""
+
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = ResponseCache(directory, max_bytes) if directory else None
+        _cache_configured = True
+    return _cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Return the shared cache, configured from ``ELEXON_CACHE_DIR`` / ``ELEXON_CACHE_MAX_MB`` on first use."""
+
+    if not _cache_configured:
+        directory = os.getenv("ELEXON_CACHE_DIR")
+        max_mb = os.getenv("ELEXON_CACHE_MAX_MB")
+        max_bytes = int(float(max_mb) * 1024**2) if max_mb else DEFAULT_MAX_BYTES
+        configure_cache(directory, max_bytes)
+    return _cache
+
+
+__all__ = [
+    "DATASET_TTLS",
+    "DEFAULT_MAX_BYTES",
+    "ResponseCache",
+    "cache_ttl",
+    "configure_cache",
+    "get_cache",
+]
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import time
-from datetime import date
+from datetime import date, timedelta
 from typing import Any, Dict, Iterable, List
 
-import requests
+from battery_tracker.sources.http import BASE_URL, fetch_records
+from battery_tracker.timeutil import london_day_start
 
-BASE_URL = "https://data.elexon.co.uk/bmrs/api/v1"
 SYSTEM_PRICES_PATH = "/balancing/settlement/system-prices/{settlement_date}"
 
 # Candidate keys that may contain the system sell price in the API response.
@@ -16,6 +15,12 @@ SELL_PRICE_KEYS: tuple[str, ...] = (
     "sell_price",
     "ssp",
 )
+BUY_PRICE_KEYS: tuple[str, ...] = (
+    "buyPrice",
+    "systemBuyPrice",
+    "buy_price",
+    "sbp",
+)
 
 
 def _extract_sell_price(record: Dict[str, Any]) -> Any:
@@ -25,7 +30,7 @@ def _extract_sell_price(record: Dict[str, Any]) -> Any:
     raise ValueError("No sell-price field found in record.")
 
 
-def _parse_response_payload(payload: Any) -> List[Dict[str, Any]]:
+def parse_system_prices_payload(payload: Any) -> List[Dict[str, Any]]:
     if isinstance(payload, dict):
         if "data" in payload:
             payload = payload["data"]
@@ -45,24 +50,22 @@ def _parse_response_payload(payload: Any) -> List[Dict[str, Any]]:
 
 
 def fetch_system_prices_for_date(settlement_date: date) -> List[Dict[str, Any]]:
-    url = BASE_URL + SYSTEM_PRICES_PATH.format(settlement_date=settlement_date.isoformat())
-    attempts = 3
-    last_error: Exception | None = None
-
-    for attempt in range(1, attempts + 1):
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            payload = response.json()
-            return _parse_response_payload(payload)
-        except Exception as exc:  # noqa: BLE001 - broad to include HTTP/JSON errors
-            last_error = exc
-            if attempt == attempts:
-                break
-            time.sleep(2 ** attempt)
-
-    assert last_error is not None
-    raise RuntimeError(f"Failed to fetch system prices for {settlement_date}: {last_error}")
-
-
-__all__ = ["fetch_system_prices_for_date", "SELL_PRICE_KEYS"]
+    # The settlement day ends at local midnight, so the TTL follows clock changes.
+    day_end = london_day_start(settlement_date + timedelta(days=1))
+    return fetch_records(
+        SYSTEM_PRICES_PATH.format(settlement_date=settlement_date.isoformat()),
+        None,
+        f"system prices for {settlement_date}",
+        cache_dataset="SYSTEM_PRICES",
+        window_end=day_end,
+        parse=parse_system_prices_payload,
+    )
+
+
+__all__ = [
+    "fetch_system_prices_for_date",
+    "parse_system_prices_payload",
+    "BASE_URL",
+    "BUY_PRICE_KEYS",
+    "SELL_PRICE_KEYS",
+]
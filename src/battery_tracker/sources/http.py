@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, TypeVar, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+from battery_tracker.observability.metrics import (
+    HTTP_CACHE_HITS_TOTAL,
+    HTTP_REQUEST_SECONDS,
+    HTTP_RESPONSE_BYTES_TOTAL,
+    HTTP_RETRIES_TOTAL,
+    endpoint_label,
+)
+from battery_tracker.sources.cache import cache_ttl, get_cache
+from battery_tracker.sources.retry import (
+    get_breaker,
+    get_policy,
+    get_token_bucket,
+    is_retryable,
+    retry_after_seconds,
+)
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# The live BMRS API. ``ELEXON_BASE_URL`` (or ``configure_base_url``) points every
+# client at another server instead, such as ``scripts/mock_elexon_server.py``.
+BASE_URL = "https://data.elexon.co.uk/bmrs/api/v1"
+DEFAULT_POOL_SIZE = 32
+REQUEST_TIMEOUT = 30
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_base_url: Optional[str] = None
+
+
+def configure_base_url(url: Optional[str]) -> str:
+    """Send Elexon requests to ``url``, or back to the live API when ``url`` is ``None``."""
+
+    global _base_url
+    _base_url = (url or BASE_URL).rstrip("/")
+    return _base_url
+
+
+def get_base_url() -> str:
+    """Return the API root, configured from ``ELEXON_BASE_URL`` on first use."""
+
+    if _base_url is None:
+        return configure_base_url(os.getenv("ELEXON_BASE_URL"))
+    return _base_url
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide keep-alive session shared by all Elexon clients."""
+
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(DEFAULT_POOL_SIZE)
+    return _session
+
+
+def configure_session(pool_size: int) -> requests.Session:
+    """Replace the shared session with one sized for ``pool_size`` concurrent requests."""
+
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = _build_session(pool_size)
+    return _session
+
+
+def parse_data_payload(payload: Any) -> List[Dict[str, Any]]:
+    if not isinstance(payload, dict):
+        raise ValueError("Unexpected response format: expected a JSON object with a 'data' key.")
+    if "data" not in payload:
+        raise ValueError("Unexpected response format: missing 'data' key.")
+
+    data = payload["data"]
+    if not isinstance(data, list):
+        raise ValueError("Unexpected response format: 'data' is not a list.")
+
+    for record in data:
+        if not isinstance(record, dict):
+            raise ValueError("Unexpected response format: record is not a JSON object.")
+    return data
+
+
+def request_with_retry(
+    url: str,
+    params: Optional[Mapping[str, str]],
+    description: str,
+    read: Callable[[requests.Response], T],
+    stream: bool = False,
+) -> T:
+    """GET ``url`` and return ``read(response)``, retrying per the shared retry policy.
+
+    Non-retryable failures (most 4xx, malformed payloads) fail immediately. 429 and
+    503 ``Retry-After`` hints pause every worker through the shared circuit breaker.
+    """
+
+    policy = get_policy()
+    breaker = get_breaker()
+    endpoint = endpoint_label(url)
+    last_error: Exception | None = None
+
+    for attempt in range(1, policy.max_attempts + 1):
+        breaker.wait()
+        bucket = get_token_bucket()
+        if bucket is not None:
+            bucket.acquire()
+        response = None
+        started = time.perf_counter()
+        try:
+            response = get_session().get(url, params=params, timeout=REQUEST_TIMEOUT, stream=stream)
+            response.raise_for_status()
+            result = read(response)
+        except Exception as exc:  # noqa: BLE001 - classified below
+            status = str(response.status_code) if response is not None else "error"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, status=status)
+            # Release the pooled connection, streamed or not, before backing off.
+            if response is not None:
+                response.close()
+            last_error = exc
+            if not is_retryable(exc):
+                break
+            retry_after = retry_after_seconds(response)
+            breaker.record_failure(retry_after)
+            if attempt == policy.max_attempts:
+                break
+            reason = status if isinstance(exc, requests.HTTPError) else type(exc).__name__
+            HTTP_RETRIES_TOTAL.inc(endpoint=endpoint, reason=reason)
+            delay = max(retry_after or 0.0, policy.backoff(attempt))
+            logger.warning(
+                "Retrying %s in %.1fs after attempt %d failed: %s",
+                description,
+                delay,
+                attempt,
+                exc,
+                extra={"endpoint": endpoint, "attempt": attempt, "reason": reason, "delay_seconds": delay},
+            )
+            time.sleep(delay)
+            continue
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint, status=str(response.status_code)
+        )
+        breaker.record_success()
+        return result
+
+    assert last_error is not None
+    raise RuntimeError(f"Failed to fetch {description}: {last_error}") from last_error
+
+
+def fetch_records(
+    path: str,
+    params: Optional[Mapping[str, str]],
+    description: str,
+    cache_dataset: Optional[str] = None,
+    window_end: Optional[Union[datetime, str]] = None,
+    parse: Callable[[Any], List[Dict[str, Any]]] = parse_data_payload,
+) -> List[Dict[str, Any]]:
+    """GET ``get_base_url() + path`` and return the parsed records.
+
+    When the response cache is enabled and ``cache_dataset`` is given, the raw body
+    is cached with a TTL derived from ``window_end``.
+    """
+
+    url = get_base_url() + path
+    cache = get_cache() if cache_dataset is not None else None
+    if cache is not None:
+        cached = cache.get(url, params)
+        if cached is not None:
+            HTTP_CACHE_HITS_TOTAL.inc(endpoint=endpoint_label(url))
+            return parse(json.loads(cached))
+
+    def read(response: requests.Response) -> Tuple[List[Dict[str, Any]], bytes]:
+        records = parse(response.json())
+        HTTP_RESPONSE_BYTES_TOTAL.inc(len(response.content), endpoint=endpoint_label(url))
+        return records, response.content
+
+    records, body = request_with_retry(url, params, description, read)
+    if cache is not None:
+        cache.put(url, params, body, cache_ttl(cache_dataset, window_end))
+    return records
+
+
+class _CountingReader:
+    def __init__(self, raw: Any) -> None:
+        self._raw = raw
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _iter_data_items(body: Any) -> Iterator[Dict[str, Any]]:
+    # ijson.items() yields nothing when there is no "data" array, so watch the
+    # parse events and raise the same errors as parse_data_payload once the body ends.
+    first_event: List[str] = []
+    data_event: List[str] = []
+
+    def events() -> Iterator[Any]:
+        for prefix, event, value in ijson.parse(body):
+            if not first_event:
+                first_event.append(event)
+            if prefix == "data" and not data_event:
+                data_event.append(event)
+            yield prefix, event, value
+
+    for record in ijson.items(events(), "data.item"):
+        if not isinstance(record, dict):
+            raise ValueError("Unexpected response format: record is not a JSON object.")
+        yield record
+    if first_event != ["start_map"]:
+        raise ValueError("Unexpected response format: expected a JSON object with a 'data' key.")
+    if not data_event:
+        raise ValueError("Unexpected response format: missing 'data' key.")
+    if data_event != ["start_array"]:
+        raise ValueError("Unexpected response format: 'data' is not a list.")
+
+
+def iter_records(
+    path: str,
+    params: Optional[Mapping[str, str]],
+    description: str,
+    cache_dataset: Optional[str] = None,
+    window_end: Optional[Union[datetime, str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield records from the ``data`` array while the response body is still downloading.
+
+    Only one record is held in memory at a time. Requires ``ijson``; without it,
+    or when the response cache is enabled, this falls back to ``fetch_records``.
+    Retries only cover opening the response: a body that fails part-way through
+    raises from the generator and is not retried, so the caller's window fails.
+    """
+
+    if ijson is None or (cache_dataset is not None and get_cache() is not None):
+        yield from fetch_records(path, params, description, cache_dataset, window_end)
+        return
+
+    url = get_base_url() + path
+    response = request_with_retry(url, params, description, lambda response: response, stream=True)
+    with response:
+        response.raw.decode_content = True
+        body = _CountingReader(response.raw)
+        try:
+            yield from _iter_data_items(body)
+        finally:
+            HTTP_RESPONSE_BYTES_TOTAL.inc(body.bytes_read, endpoint=endpoint_label(url))
+
+
+__all__ = [
+    "BASE_URL",
+    "DEFAULT_POOL_SIZE",
+    "configure_base_url",
+    "configure_session",
+    "fetch_records",
+    "get_base_url",
+    "get_session",
+    "iter_records",
+    "parse_data_payload",
+    "request_with_retry",
+]
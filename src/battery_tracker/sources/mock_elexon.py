@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from battery_tracker.ingest.settlement import (
+    PERIOD_LENGTH,
+    SETTLEMENT_TZ,
+    periods_in_day,
+    settlement_day_start,
+    settlement_period_to_utc,
+)
+from battery_tracker.ingest.windows import parse_iso_utc, to_iso
+from battery_tracker.sources.cache import ResponseCache
+from battery_tracker.sources.elexon import SYSTEM_PRICES_PATH
+from battery_tracker.sources.elexon_mid import DATASETS_PATH
+from battery_tracker.sources.elexon_physical import PHYSICAL_PATH
+from battery_tracker.sources.http import BASE_URL
+
+# A stand-in for the three BMRS endpoints the ingest pipeline calls, so fetches,
+# backfills and the daemon can run without network. Responses are either replayed
+# from a response cache recorded against the live API (ELEXON_CACHE_DIR) or
+# generated: synthetic values depend only on the seed and the request, so the same
+# request always returns the same body. Latency, 5xx errors and 429s are injected
+# per request from one seeded random stream.
+API_PREFIX = urlsplit(BASE_URL).path
+STATS_PATH = "/_mock/stats"
+DEFAULT_RETRY_AFTER = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MockConfig:
+    # Mean added latency per request in seconds, and +/- uniform jitter around it.
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fraction of requests answered with a 500/503, and with a 429 carrying Retry-After.
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = DEFAULT_RETRY_AFTER
+    # PN segments per settlement period, and filler bytes added to every record.
+    pn_segments: int = 1
+    padding_bytes: int = 0
+    seed: int = 0
+    # Response cache directory to replay recorded responses from, before generating.
+    replay_dir: Optional[str] = None
+    replay_only: bool = False
+
+    def __post_init__(self) -> None:
+        if self.error_rate + self.throttle_rate > 1:
+            raise ValueError("error_rate and throttle_rate must add up to at most 1")
+        if self.pn_segments < 1:
+            raise ValueError("pn_segments must be at least 1")
+
+
+def _settlement_slot(ts: datetime) -> Tuple[date, int]:
+    settlement_date = ts.astimezone(SETTLEMENT_TZ).date()
+    period = int((ts - settlement_day_start(settlement_date)) / PERIOD_LENGTH) + 1
+    return settlement_date, period
+
+
+def _half_hours(from_ts: str, to_ts: str) -> List[datetime]:
+    start = parse_iso_utc(from_ts)
+    end = parse_iso_utc(to_ts)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    ts = epoch + -(-(start - epoch) // PERIOD_LENGTH) * PERIOD_LENGTH
+    slots = []
+    while ts < end:
+        slots.append(ts)
+        ts += PERIOD_LENGTH
+    return slots
+
+
+class SyntheticElexon:
+    """Deterministic BMRS-shaped payloads for a seed."""
+
+    def __init__(self, seed: int = 0, pn_segments: int = 1, padding_bytes: int = 0) -> None:
+        self.seed = seed
+        self.pn_segments = pn_segments
+        self.padding = "x" * padding_bytes
+
+    def _rng(self, *key: object) -> random.Random:
+        return random.Random(zlib.crc32(repr((self.seed, *key)).encode("utf-8")))
+
+    def _price(self, kind: str, ts: datetime) -> float:
+        # Daily shape with an evening peak, plus noise that is stable per period.
+        local = ts.astimezone(SETTLEMENT_TZ)
+        hour = local.hour + local.minute / 60
+        shape = 60 + 25 * max(0.0, 1 - abs(hour - 18) / 4) - 15 * max(0.0, 1 - abs(hour - 4) / 4)
+        return round(shape + self._rng(kind, ts.isoformat()).gauss(0, 8), 2)
+
+    def _pad(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if self.padding:
+            record["padding"] = self.padding
+        return record
+
+    def mid(self, from_ts: str, to_ts: str, provider: str) -> List[Dict[str, Any]]:
+        records = []
+        for ts in _half_hours(from_ts, to_ts):
+            settlement_date, period = _settlement_slot(ts)
+            records.append(
+                self._pad(
+                    {
+                        "dataset": "MID",
+                        "startTime": to_iso(ts),
+                        "dataProvider": provider,
+                        "settlementDate": settlement_date.isoformat(),
+                        "settlementPeriod": period,
+                        "price": self._price(provider, ts),
+                        "volume": round(self._rng(provider, "volume", ts.isoformat()).uniform(0, 2000), 3),
+                    }
+                )
+            )
+        return records
+
+    def physical(self, from_ts: str, to_ts: str, bm_unit: str) -> List[Dict[str, Any]]:
+        step = PERIOD_LENGTH / self.pn_segments
+        records = []
+        for ts in _half_hours(from_ts, to_ts):
+            settlement_date, period = _settlement_slot(ts)
+            rng = self._rng(bm_unit, ts.isoformat())
+            levels = [round(rng.uniform(-50, 50), 3) for _ in range(self.pn_segments + 1)]
+            for i in range(self.pn_segments):
+                records.append(
+                    self._pad(
+                        {
+                            "dataset": "PN",
+                            "settlementDate": settlement_date.isoformat(),
+                            "settlementPeriod": period,
+                            "timeFrom": to_iso(ts + i * step),
+                            "timeTo": to_iso(ts + (i + 1) * step),
+                            "levelFrom": levels[i],
+                            "levelTo": levels[i + 1],
+                            "nationalGridBmUnit": bm_unit.split("_", 1)[-1],
+                            "bmUnit": bm_unit,
+                        }
+                    )
+                )
+        return records
+
+    def system_prices(self, settlement_date: date) -> List[Dict[str, Any]]:
+        records = []
+        for period in range(1, periods_in_day(settlement_date) + 1):
+            ts = settlement_period_to_utc(settlement_date, period)
+            rng = self._rng("system-prices", ts.isoformat())
+            price = self._price("SSP", ts)
+            niv = round(rng.gauss(0, 300), 3)
+            records.append(
+                self._pad(
+                    {
+                        "settlementDate": settlement_date.isoformat(),
+                        "settlementPeriod": period,
+                        "startTime": to_iso(ts),
+                        "createdDateTime": to_iso(ts + timedelta(minutes=45)),
+                        "systemSellPrice": price,
+                        "systemBuyPrice": price,
+                        "bsadDefaulted": False,
+                        "priceDerivationCode": "P" if niv < 0 else "N",
+                        "reserveScarcityPrice": 0,
+                        "netImbalanceVolume": niv,
+                        "sellPriceAdjustment": 0,
+                        "buyPriceAdjustment": 0,
+                        "replacementPrice": None,
+                        "replacementPriceReferenceVolume": None,
+                        "totalAcceptedOfferVolume": round(abs(rng.gauss(800, 200)), 3),
+                        "totalAcceptedBidVolume": -round(abs(rng.gauss(800, 200)), 3),
+                        "totalAdjustmentSellVolume": 0,
+                        "totalAdjustmentBuyVolume": 0,
+                        "totalSystemTaggedAcceptedOfferVolume": 0,
+                        "totalSystemTaggedAcceptedBidVolume": 0,
+                        "totalSystemTaggedAdjustmentSellVolume": 0,
+                        "totalSystemTaggedAdjustmentBuyVolume": 0,
+                    }
+                )
+            )
+        return records
+
+    def records(self, path: str, params: Mapping[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """Records for a GET of ``path`` with ``params``, or ``None`` for an unknown endpoint."""
+
+        if path == DATASETS_PATH:
+            return self.mid(params["from"], params["to"], params["dataProvider"])
+        if path == PHYSICAL_PATH:
+            return self.physical(params["from"], params["to"], params["bmUnit"])
+        prefix = SYSTEM_PRICES_PATH.split("{", 1)[0]
+        if path.startswith(prefix):
+            return self.system_prices(date.fromisoformat(path[len(prefix):]))
+        return None
+
+
+class MockElexonServer:
+    """HTTP server answering BMRS requests under ``url``; use as a context manager or ``serve_forever``."""
+
+    def __init__(self, config: MockConfig = MockConfig(), host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config
+        self.synthetic = SyntheticElexon(config.seed, config.pn_segments, config.padding_bytes)
+        self.replay = ResponseCache(config.replay_dir) if config.replay_dir else None
+        self._faults = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, outcome: str, body_bytes: int = 0) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats[outcome] += 1
+            self._stats["bytes"] += body_bytes
+
+    def _draw_fault(self) -> Tuple[float, Optional[int]]:
+        config = self.config
+        with self._lock:
+            delay = max(0.0, config.latency + self._faults.uniform(-config.jitter, config.jitter))
+            roll = self._faults.random()
+            error_status = self._faults.choice((500, 503))
+        if roll < config.error_rate:
+            return delay, error_status
+        if roll < config.error_rate + config.throttle_rate:
+            return delay, 429
+        return delay, None
+
+    def _recorded(self, path: str, params: Mapping[str, str]) -> Optional[bytes]:
+        if self.replay is None:
+            return None
+        return self.replay.get(BASE_URL + path, params or None, include_expired=True)
+
+    def respond(self, path: str, params: Mapping[str, str]) -> Tuple[int, bytes]:
+        """Return the status and JSON body for a GET of ``path`` (below the API prefix)."""
+
+        recorded = self._recorded(path, params)
+        if recorded is not None:
+            return 200, recorded
+        if self.config.replay_only:
+            return 404, json.dumps({"error": f"No recorded response for {path}"}).encode("utf-8")
+
+        try:
+            records = self.synthetic.records(path, params)
+        except (KeyError, ValueError) as exc:
+            return 400, json.dumps({"error": str(exc)}).encode("utf-8")
+        if records is None:
+            return 404, json.dumps({"error": f"Unknown endpoint {path}"}).encode("utf-8")
+        return 200, json.dumps({"data": records}, separators=(",", ":")).encode("utf-8")
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def start(self) -> "MockElexonServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-elexon", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockElexonServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def _handler_for(server: MockElexonServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            parts = urlsplit(self.path)
+            if parts.path == STATS_PATH:
+                self._send(200, json.dumps(server.stats()).encode("utf-8"))
+                return
+            if not parts.path.startswith(API_PREFIX):
+                server._count("404")
+                self._send(404, b'{"error": "Not found"}')
+                return
+
+            delay, fault = server._draw_fault()
+            if delay:
+                time.sleep(delay)
+            if fault is not None:
+                server._count(str(fault))
+                headers = {"Retry-After": f"{server.config.retry_after:g}"} if fault == 429 else {}
+                self._send(fault, json.dumps({"error": "Injected fault"}).encode("utf-8"), headers)
+                return
+
+            status, body = server.respond(parts.path[len(API_PREFIX):], dict(parse_qsl(parts.query)))
+            server._count(str(status), len(body))
+            self._send(status, body)
+
+        def _send(self, status: int, body: bytes, headers: Optional[Mapping[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - http.server API
+            logger.debug("%s " + format, self.address_string(), *args)
+
+    return Handler
+
+
+__all__ = [
+    "API_PREFIX",
+    "MockConfig",
+    "MockElexonServer",
+    "STATS_PATH",
+    "SyntheticElexon",
+]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+# Statuses worth retrying: timeouts, rate limiting and transient server errors.
+RETRYABLE_STATUS: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Network failures, truncated bodies and retryable HTTP statuses are retried; anything else is final."""
+
+    if isinstance(exc, requests.HTTPError):
+        response = exc.response
+        return response is not None and response.status_code in RETRYABLE_STATUS
+    if isinstance(exc, requests.JSONDecodeError):
+        return True
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def retry_after_seconds(response: Optional[requests.Response]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given either as seconds or as an HTTP date."""
+
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Process-wide request rate limiter allowing short bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Pauses every caller after repeated failures, or for as long as the API asks via ``Retry-After``."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block while the breaker is open."""
+
+        while True:
+            with self._lock:
+                remaining = self._open_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            pause = retry_after or 0.0
+            if self._failures >= self.failure_threshold:
+                pause = max(pause, self.cooldown)
+                self._failures = 0
+            if pause:
+                self._open_until = max(self._open_until, time.monotonic() + pause)
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+_policy = DEFAULT_POLICY
+_breaker = CircuitBreaker()
+_bucket: Optional[TokenBucket] = None
+_bucket_configured = False
+_config_lock = threading.Lock()
+
+
+def configure_retry(
+    policy: Optional[RetryPolicy] = None,
+    requests_per_second: Optional[float] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> None:
+    """Set the retry policy, global request rate (``None`` for unlimited) and circuit breaker."""
+
+    global _policy, _breaker, _bucket, _bucket_configured
+    with _config_lock:
+        _policy = policy or DEFAULT_POLICY
+        _breaker = breaker or CircuitBreaker()
+        _bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        _bucket_configured = True
+
+
+def configure_rate_limit(requests_per_second: Optional[float]) -> None:
+    """Set the global request rate (``None`` for unlimited), keeping the retry policy and breaker."""
+
+    global _bucket, _bucket_configured
+    with _config_lock:
+        _bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        _bucket_configured = True
+
+
+def get_policy() -> RetryPolicy:
+    return _policy
+
+
+def get_breaker() -> CircuitBreaker:
+    return _breaker
+
+
+def get_token_bucket() -> Optional[TokenBucket]:
+    """Return the global rate limiter, configured from ``ELEXON_MAX_REQUESTS_PER_SECOND`` on first use."""
+
+    global _bucket, _bucket_configured
+    if not _bucket_configured:
+        with _config_lock:
+            if not _bucket_configured:
+                rate = os.getenv("ELEXON_MAX_REQUESTS_PER_SECOND")
+                _bucket = TokenBucket(float(rate)) if rate else None
+                _bucket_configured = True
+    return _bucket
+
+
+__all__ = [
+    "CircuitBreaker",
+    "DEFAULT_POLICY",
+    "RETRYABLE_STATUS",
+    "RetryPolicy",
+    "TokenBucket",
+    "configure_rate_limit",
+    "configure_retry",
+    "get_breaker",
+    "get_policy",
+    "get_token_bucket",
+    "is_retryable",
+    "retry_after_seconds",
+]
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+# GB settlement days run from Europe/London midnight to Europe/London midnight,
+# so a day is 23 or 25 hours long across the clock changes.
+SETTLEMENT_TZ = ZoneInfo("Europe/London")
+
+
+def london_day_start(day: date) -> datetime:
+    """Return Europe/London midnight at the start of ``day`` in UTC."""
+
+    return datetime.combine(day, time(0, 0), tzinfo=SETTLEMENT_TZ).astimezone(timezone.utc)
+
+
+__all__ = ["SETTLEMENT_TZ", "london_day_start"]
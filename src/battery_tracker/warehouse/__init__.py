@@ -0,0 +1,13 @@
+"""Parquet copies of the warehouse tables for offline analytics."""
+
+from battery_tracker.warehouse.export import export_table
+from battery_tracker.warehouse.reader import load_pn_segments, read_arrays, read_table
+from battery_tracker.warehouse.tables import EXPORT_TABLES
+
+__all__ = [
+    "EXPORT_TABLES",
+    "export_table",
+    "load_pn_segments",
+    "read_arrays",
+    "read_table",
+]
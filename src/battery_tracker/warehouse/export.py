@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+from psycopg2 import sql
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from battery_tracker.warehouse.tables import (
+    FLOAT,
+    INT,
+    MANIFEST_FILE,
+    PART_FILE,
+    STRING,
+    TIMESTAMP,
+    ExportTable,
+    get_export_table,
+    month_start,
+    next_month,
+    partition_dir,
+)
+
+# A month is (re-)exported when its row count or latest ingested_at in the database
+# differs from what the manifest recorded at the last export. Rows are only
+# rewritten when their values change, so unchanged months are skipped.
+DEFAULT_EXPORT_DIR = "data/parquet"
+COMPRESSION = "zstd"
+
+logger = logging.getLogger(__name__)
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet export. Install it with `pip install pyarrow`.")
+
+
+def arrow_type(kind: str) -> "pa.DataType":
+    _require_pyarrow()
+    types = {
+        TIMESTAMP: pa.timestamp("us", tz="UTC"),
+        FLOAT: pa.float64(),
+        INT: pa.int32(),
+        STRING: pa.string(),
+    }
+    return types[kind]
+
+
+def arrow_schema(table: ExportTable) -> "pa.Schema":
+    return pa.schema([(name, arrow_type(kind)) for name, kind in table.columns])
+
+
+def _select_expression(name: str, kind: str) -> sql.Composable:
+    column = sql.Identifier(name)
+    if kind == TIMESTAMP:
+        return sql.SQL("(extract(epoch FROM {col}) * 1000000)::bigint AS {col}").format(col=column)
+    cast = {FLOAT: "float8", INT: "int4", STRING: "text"}[kind]
+    return sql.SQL("{col}::{cast} AS {col}").format(col=column, cast=sql.SQL(cast))
+
+
+def _filters(table: ExportTable, bm_units: Optional[Sequence[str]]) -> sql.Composable:
+    clauses = [sql.SQL("ts >= %(start)s"), sql.SQL("ts < %(end)s")]
+    if bm_units is not None:
+        clauses.append(sql.SQL("{key} = ANY(%(bm_units)s)").format(key=sql.Identifier(table.key_column)))
+    return sql.SQL(" AND ").join(clauses)
+
+
+def manifest_path(root: Union[str, Path], table_name: str) -> Path:
+    return Path(root) / table_name / MANIFEST_FILE
+
+
+def load_manifest(root: Union[str, Path], table_name: str) -> Dict[str, Any]:
+    path = manifest_path(root, table_name)
+    if not path.exists():
+        return {"table": table_name, "bm_units": None, "partitions": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_manifest(root: Union[str, Path], table_name: str, manifest: Dict[str, Any]) -> None:
+    path = manifest_path(root, table_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def month_stats(
+    conn,
+    table: ExportTable,
+    start: datetime,
+    end: datetime,
+    bm_units: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Row count and latest update per UTC month of ``ts`` in [start, end)."""
+
+    query = sql.SQL(
+        """
+        SELECT to_char(date_trunc('month', ts AT TIME ZONE 'UTC'), 'YYYY-MM'), COUNT(*), MAX({updated})
+        FROM {table}
+        WHERE {filters}
+        GROUP BY 1
+        """
+    ).format(
+        updated=sql.Identifier(table.updated_column),
+        table=sql.Identifier(table.name),
+        filters=_filters(table, bm_units),
+    )
+    with conn.cursor() as cur:
+        cur.execute(query, {"start": start, "end": end, "bm_units": list(bm_units or ())})
+        rows = cur.fetchall()
+    return {
+        month: {"rows": count, "updated_at": updated_at.isoformat() if updated_at else None}
+        for month, count, updated_at in rows
+    }
+
+
+def read_month(
+    conn,
+    table: ExportTable,
+    month: datetime,
+    bm_units: Optional[Sequence[str]] = None,
+) -> "pa.Table":
+    """Read one UTC month of ``table`` from the database as an Arrow table, via COPY."""
+
+    _require_pyarrow()
+    query = sql.SQL(
+        "COPY (SELECT {columns} FROM {table} WHERE {filters} ORDER BY {order}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    )
+    with conn.cursor() as cur:
+        select = query.format(
+            columns=sql.SQL(", ").join(_select_expression(name, kind) for name, kind in table.columns),
+            table=sql.Identifier(table.name),
+            filters=_filters(table, bm_units),
+            order=sql.SQL(", ").join(map(sql.Identifier, table.sort_columns)),
+        )
+        params = {"start": month, "end": next_month(month), "bm_units": list(bm_units or ())}
+        buffer = io.BytesIO()
+        cur.copy_expert(cur.mogrify(select.as_string(cur), params).decode(), buffer)
+    buffer.seek(0)
+
+    # Timestamps arrive as integer microseconds and are cast after parsing.
+    csv_types = {name: pa.int64() if kind == TIMESTAMP else arrow_type(kind) for name, kind in table.columns}
+    parsed = pa_csv.read_csv(
+        buffer,
+        convert_options=pa_csv.ConvertOptions(column_types=csv_types, strings_can_be_null=True),
+    )
+    return parsed.cast(arrow_schema(table))
+
+
+def _write_partition(path: Path, data: "pa.Table") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    pq.write_table(data, temp_path, compression=COMPRESSION)
+    os.replace(temp_path, path)
+
+
+def export_table(
+    conn,
+    root: Union[str, Path],
+    table_name: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bm_units: Optional[Sequence[str]] = None,
+    full: bool = False,
+) -> Dict[str, int]:
+    """Export the UTC months of ``table_name`` overlapping [start, end) to Parquet under ``root``.
+
+    Only months that are new or changed since the last export are written, unless
+    ``full``. Months are always exported whole. An export restricted to
+    ``bm_units`` must keep using the same units in the same ``root``. Returns rows
+    written per exported month (``YYYY-MM``).
+    """
+
+    _require_pyarrow()
+    table = get_export_table(table_name)
+    if bm_units is not None and table.key_column is None:
+        raise ValueError(f"{table_name} cannot be sliced by BM Unit")
+    units = sorted(set(bm_units)) if bm_units is not None else None
+
+    manifest = load_manifest(root, table_name)
+    if manifest["partitions"] and manifest.get("bm_units") != units:
+        raise ValueError(
+            f"{root} holds a {table_name} export for BM Units {manifest.get('bm_units') or 'all'}; "
+            "export a different slice to a different directory"
+        )
+    manifest["bm_units"] = units
+
+    start = month_start(start) if start is not None else datetime(1970, 1, 1, tzinfo=timezone.utc)
+    if end is None:
+        end = datetime(9999, 1, 1, tzinfo=timezone.utc)
+    elif month_start(end) < end:
+        end = next_month(month_start(end))
+    stats = month_stats(conn, table, start, end, units)
+
+    # Months in range that no longer have rows are dropped from the export.
+    for key in [key for key in manifest["partitions"] if key not in stats]:
+        month = datetime.strptime(key, "%Y-%m").replace(tzinfo=timezone.utc)
+        if start <= month < end:
+            shutil.rmtree(partition_dir(root, table_name, month), ignore_errors=True)
+            del manifest["partitions"][key]
+            _save_manifest(root, table_name, manifest)
+
+    exported: Dict[str, int] = {}
+    for key in sorted(stats):
+        previous = manifest["partitions"].get(key)
+        if not full and previous is not None and {k: previous.get(k) for k in stats[key]} == stats[key]:
+            continue
+        month = datetime.strptime(key, "%Y-%m").replace(tzinfo=timezone.utc)
+        data = read_month(conn, table, month, units)
+        _write_partition(partition_dir(root, table_name, month) / PART_FILE, data)
+        manifest["partitions"][key] = {**stats[key], "exported_at": datetime.now(timezone.utc).isoformat()}
+        _save_manifest(root, table_name, manifest)
+        exported[key] = data.num_rows
+        logger.info(
+            "%s %s: exported %d rows",
+            table_name,
+            key,
+            data.num_rows,
+            extra={"table": table_name, "month": key, "rows": data.num_rows},
+        )
+
+    if not exported:
+        logger.info("%s: Parquet export is up to date", table_name, extra={"table": table_name})
+    return exported
+
+
+__all__ = [
+    "COMPRESSION",
+    "DEFAULT_EXPORT_DIR",
+    "arrow_schema",
+    "arrow_type",
+    "export_table",
+    "load_manifest",
+    "month_stats",
+    "read_month",
+]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from battery_tracker.warehouse.export import arrow_schema
+from battery_tracker.warehouse.tables import PART_FILE, get_export_table, month_start
+
+# Partitions are opened memory-mapped, so loading a slice only reads the pages of
+# the months and columns it touches. ``start`` and ``end`` are timezone-aware.
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read Parquet exports. Install it with `pip install pyarrow`.")
+
+
+def partition_files(
+    root: Union[str, Path],
+    table_name: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Path]:
+    """Exported partition files of ``table_name`` whose month overlaps [start, end), oldest first."""
+
+    table_dir = Path(root) / table_name
+    if not table_dir.is_dir():
+        return []
+    first = month_start(start) if start is not None else None
+    files = []
+    for path in sorted(table_dir.glob(f"month=*/{PART_FILE}")):
+        month = datetime.strptime(path.parent.name.split("=", 1)[1], "%Y-%m").replace(tzinfo=timezone.utc)
+        if first is not None and month < first:
+            continue
+        if end is not None and month >= end:
+            continue
+        files.append(path)
+    return files
+
+
+def read_table(
+    root: Union[str, Path],
+    table_name: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bm_units: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> "pa.Table":
+    """Load rows of an exported table with ``ts`` in [start, end) as an Arrow table."""
+
+    _require_pyarrow()
+    table = get_export_table(table_name)
+    if bm_units is not None and table.key_column is None:
+        raise ValueError(f"{table_name} cannot be sliced by BM Unit")
+    schema = arrow_schema(table)
+    selected = list(columns) if columns is not None else list(schema.names)
+    needed = list(dict.fromkeys([*selected, "ts", *([table.key_column] if bm_units is not None else [])]))
+
+    parts = []
+    for path in partition_files(root, table_name, start, end):
+        part = pq.read_table(path, columns=needed, memory_map=True)
+        mask = None
+        if start is not None:
+            mask = pc.greater_equal(part["ts"], pa.scalar(start, type=schema.field("ts").type))
+        if end is not None:
+            before_end = pc.less(part["ts"], pa.scalar(end, type=schema.field("ts").type))
+            mask = before_end if mask is None else pc.and_(mask, before_end)
+        if bm_units is not None:
+            in_units = pc.is_in(part[table.key_column], value_set=pa.array(list(bm_units), type=pa.string()))
+            mask = in_units if mask is None else pc.and_(mask, in_units)
+        parts.append(part.filter(mask) if mask is not None else part)
+
+    if not parts:
+        return schema.empty_table().select(selected)
+    return pa.concat_tables(parts).select(selected)
+
+
+def read_arrays(
+    root: Union[str, Path],
+    table_name: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bm_units: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Dict[str, "np.ndarray"]:
+    """``read_table`` as NumPy arrays; timestamps are ``datetime64[us]`` and missing values NaT/NaN."""
+
+    data = read_table(root, table_name, start, end, bm_units, columns)
+    arrays = {}
+    for name in data.column_names:
+        column = data[name]
+        if pa.types.is_timestamp(column.type):
+            column = column.cast(pa.timestamp("us"))
+        arrays[name] = column.to_numpy()
+    return arrays
+
+
+def load_pn_segments(
+    root: Union[str, Path],
+    bm_units: Sequence[str],
+    start: datetime,
+    end: datetime,
+) -> Dict[str, "np.ndarray"]:
+    """Exported PN segments in the layout of ``analytics.revenue.load_pn_segments``.
+
+    Sorted by (bmu_id, time_from), times in epoch seconds and missing ends as NaN.
+    """
+
+    data = read_table(root, "final_physical_notifications", start, end, bm_units)
+    data = data.sort_by([("bmu_id", "ascending"), ("ts", "ascending")])
+
+    def epoch_seconds(name: str) -> "np.ndarray":
+        micros = data[name].cast(pa.int64()).to_numpy(zero_copy_only=False)
+        return np.asarray(micros, dtype=np.float64) / 1e6
+
+    return {
+        "bmu_id": data["bmu_id"].to_numpy(zero_copy_only=False).astype(str),
+        "time_from": epoch_seconds("ts"),
+        "time_to": epoch_seconds("time_to"),
+        "level_from": data["fpn_mw"].to_numpy(zero_copy_only=False).astype(np.float64),
+        "level_to": data["level_to"].to_numpy(zero_copy_only=False).astype(np.float64),
+    }
+
+
+__all__ = [
+    "load_pn_segments",
+    "partition_files",
+    "read_arrays",
+    "read_table",
+]
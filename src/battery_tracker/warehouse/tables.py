@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+# Warehouse tables are exported to Parquet partitioned by UTC month of ``ts``:
+#   <root>/<table>/month=YYYY-MM/part.parquet
+# Values are exported as float64 and timestamps as microseconds since the epoch in
+# UTC, so readers get flat arrays without Decimal or datetime objects.
+TIMESTAMP = "timestamp"
+FLOAT = "float"
+INT = "int"
+STRING = "string"
+
+PART_FILE = "part.parquet"
+MANIFEST_FILE = "_manifest.json"
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """A table that can be exported. ``columns`` are (name, kind) pairs; ``ts`` must be one of them."""
+
+    name: str
+    columns: Tuple[Tuple[str, str], ...]
+    # Rows within a partition are sorted by these columns.
+    sort_columns: Tuple[str, ...] = ("ts",)
+    # Column holding the BM Unit, for tables that can be sliced by unit.
+    key_column: Optional[str] = None
+    # Column that moves forward whenever a row is inserted or changed.
+    updated_column: str = "ingested_at"
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.columns)
+
+
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    table.name: table
+    for table in (
+        ExportTable(
+            "final_physical_notifications",
+            (("ts", TIMESTAMP), ("bmu_id", STRING), ("fpn_mw", FLOAT), ("time_to", TIMESTAMP), ("level_to", FLOAT)),
+            sort_columns=("bmu_id", "ts"),
+            key_column="bmu_id",
+        ),
+        ExportTable("system_sell_price", (("ts", TIMESTAMP), ("ssp_gbp_per_mwh", FLOAT))),
+        ExportTable("wholesale_day_ahead_price_n2ex", (("ts", TIMESTAMP), ("price_gbp_per_mwh", FLOAT))),
+        ExportTable("wholesale_intraday_price_apx", (("ts", TIMESTAMP), ("price_gbp_per_mwh", FLOAT))),
+        ExportTable(
+            "market_half_hourly",
+            (
+                ("ts", TIMESTAMP),
+                ("settlement_date", STRING),
+                ("settlement_period", INT),
+                ("ssp_gbp_per_mwh", FLOAT),
+                ("n2ex_gbp_per_mwh", FLOAT),
+                ("apx_gbp_per_mwh", FLOAT),
+                ("ssp_minus_n2ex", FLOAT),
+                ("apx_minus_n2ex", FLOAT),
+                ("ssp_minus_apx", FLOAT),
+            ),
+            updated_column="refreshed_at",
+        ),
+    )
+}
+
+
+def get_export_table(name: str) -> ExportTable:
+    try:
+        return EXPORT_TABLES[name]
+    except KeyError:
+        raise ValueError(f"Unknown export table {name}. Exportable tables: {', '.join(EXPORT_TABLES)}") from None
+
+
+def month_start(value: Union[date, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + (month.month == 12), month=month.month % 12 + 1)
+
+
+def iter_months(start: datetime, end: datetime) -> Iterator[datetime]:
+    """Yield the UTC month starts overlapping [start, end)."""
+
+    month = month_start(start)
+    while month < end:
+        yield month
+        month = next_month(month)
+
+
+def partition_dir(root: Union[str, Path], table_name: str, month: datetime) -> Path:
+    return Path(root) / table_name / f"month={month:%Y-%m}"
+
+
+__all__ = [
+    "EXPORT_TABLES",
+    "ExportTable",
+    "FLOAT",
+    "INT",
+    "MANIFEST_FILE",
+    "PART_FILE",
+    "STRING",
+    "TIMESTAMP",
+    "get_export_table",
+    "iter_months",
+    "month_start",
+    "next_month",
+    "partition_dir",
+]
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Run the tests against the source tree without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
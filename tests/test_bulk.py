@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from battery_tracker.ingest.bulk import UpsertCounts, _dedupe_rows  # noqa: E402
+
+
+def test_upsert_counts_total_and_sum():
+    counts = UpsertCounts(inserted=3, updated=2, unchanged=5) + UpsertCounts(inserted=1, unchanged=4)
+
+    assert counts == UpsertCounts(inserted=4, updated=2, unchanged=9)
+    assert counts.total == 15
+    assert UpsertCounts().total == 0
+
+
+def test_dedupe_rows_keeps_last_row_per_key():
+    rows = [("A", 1, 10.0), ("B", 1, 20.0), ("A", 1, 11.0), ("A", 2, 12.0)]
+
+    deduped = _dedupe_rows(rows, ("bmu_id", "ts", "mw"), ("bmu_id", "ts"))
+
+    assert deduped == [("A", 1, 11.0), ("B", 1, 20.0), ("A", 2, 12.0)]
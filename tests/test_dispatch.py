@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from battery_tracker.analytics.dispatch import BatteryConfig, optimize_days  # noqa: E402
+
+# A 1 MW / 1 MWh lossless battery that starts (and must end) empty; it moves
+# 0.5 MWh per half-hour period.
+BATTERY = BatteryConfig(power_mw=1.0, energy_mwh=1.0, round_trip_efficiency=1.0, initial_soc_fraction=0.0, soc_steps=2)
+
+
+def test_buys_low_and_sells_high():
+    revenue, charged, discharged, energy = optimize_days(np.array([[10.0, 10.0, 50.0, 50.0]]), BATTERY)
+
+    assert revenue.tolist() == pytest.approx([40.0])
+    assert charged.tolist() == pytest.approx([1.0])
+    assert discharged.tolist() == pytest.approx([1.0])
+    assert energy[0].tolist() == pytest.approx([-0.5, -0.5, 0.5, 0.5])
+
+
+def test_no_trade_when_prices_fall_or_are_missing():
+    prices = np.array([[50.0, 50.0, 10.0, 10.0], [10.0, np.nan, np.nan, 50.0]])
+    revenue, charged, discharged, energy = optimize_days(prices, BATTERY)
+
+    assert revenue[0] == pytest.approx(0.0)
+    assert not energy[0].any()
+    # Missing periods only allow holding charge, so day two trades once.
+    assert revenue[1] == pytest.approx(20.0)
+    assert energy[1].tolist() == pytest.approx([-0.5, 0.0, 0.0, 0.5])
+
+
+def test_cycle_limit_caps_discharge():
+    config = BatteryConfig(
+        power_mw=1.0,
+        energy_mwh=1.0,
+        round_trip_efficiency=1.0,
+        max_cycles_per_day=0.5,
+        initial_soc_fraction=0.0,
+        soc_steps=2,
+    )
+    revenue, charged, discharged, _ = optimize_days(np.array([[10.0, 10.0, 50.0, 50.0]]), config)
+
+    assert revenue.tolist() == pytest.approx([20.0])
+    assert discharged.tolist() == pytest.approx([0.5])
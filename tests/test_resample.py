@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from battery_tracker.analytics.resample import resample_segments  # noqa: E402
+
+
+def segments(bmu_id, time_from, time_to, level_from, level_to):
+    return {
+        "bmu_id": np.array(bmu_id, dtype=object),
+        "time_from": np.array(time_from, dtype=np.float64),
+        "time_to": np.array(time_to, dtype=np.float64),
+        "level_from": np.array(level_from, dtype=np.float64),
+        "level_to": np.array(level_to, dtype=np.float64),
+    }
+
+
+def test_flat_and_ramp_segments_per_period():
+    # A: 100 MW flat for one period, then a ramp from 0 to 100 MW over the next.
+    # B: starts mid-period with no end, so it holds 40 MW to the end of the period.
+    result = resample_segments(
+        segments(
+            ["A", "A", "B"],
+            [0, 1800, 900],
+            [1800, 3600, np.nan],
+            [100, 0, 40],
+            [100, 100, np.nan],
+        )
+    )
+
+    assert result["bmu_id"].tolist() == ["A", "A", "B"]
+    assert result["ts"].tolist() == [0, 1800, 0]
+    assert result["mwh"].tolist() == pytest.approx([50.0, 25.0, 10.0])
+    assert result["mw"].tolist() == pytest.approx([100.0, 50.0, 20.0])
+
+
+def test_ramp_split_across_smaller_bins():
+    result = resample_segments(segments(["A"], [1800], [3600], [0], [100]), bin_seconds=900)
+
+    assert result["ts"].tolist() == [1800, 2700]
+    assert result["mwh"].tolist() == pytest.approx([6.25, 18.75])
+    assert result["mw"].tolist() == pytest.approx([25.0, 75.0])
+
+
+def test_empty_input():
+    result = resample_segments(segments([], [], [], [], []))
+
+    assert len(result["ts"]) == 0
+    assert len(result["mwh"]) == 0
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from battery_tracker.ingest.settlement import periods_in_day, settlement_day_start, settlement_period_to_utc
+
+
+def utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_periods_in_day_across_clock_changes():
+    assert periods_in_day(date(2025, 1, 15)) == 48
+    assert periods_in_day(date(2025, 3, 30)) == 46
+    assert periods_in_day(date(2025, 10, 26)) == 50
+    assert periods_in_day(date(2025, 7, 1)) == 48
+
+
+def test_settlement_day_starts_at_london_midnight():
+    assert settlement_day_start(date(2025, 1, 15)) == utc(2025, 1, 15, 0, 0)
+    assert settlement_day_start(date(2025, 7, 1)) == utc(2025, 6, 30, 23, 0)
+
+
+def test_settlement_period_to_utc():
+    assert settlement_period_to_utc(date(2025, 1, 15), 1) == utc(2025, 1, 15, 0, 0)
+    assert settlement_period_to_utc(date(2025, 1, 15), 48) == utc(2025, 1, 15, 23, 30)
+    assert settlement_period_to_utc(date(2025, 7, 1), 1) == utc(2025, 6, 30, 23, 0)
+    # Spring forward: period 3 starts at 01:00 UTC, i.e. 02:00 BST.
+    assert settlement_period_to_utc(date(2025, 3, 30), 3) == utc(2025, 3, 30, 1, 0)
+    assert settlement_period_to_utc(date(2025, 3, 30), 46) == utc(2025, 3, 30, 22, 30)
+    # Fall back: 01:00-02:00 local time occurs twice, as periods 3-4 (BST) and 5-6 (GMT).
+    assert settlement_period_to_utc(date(2025, 10, 26), 3) == utc(2025, 10, 26, 0, 0)
+    assert settlement_period_to_utc(date(2025, 10, 26), 5) == utc(2025, 10, 26, 1, 0)
+    assert settlement_period_to_utc(date(2025, 10, 26), 50) == utc(2025, 10, 26, 23, 30)
+
+
+def test_settlement_period_out_of_range():
+    with pytest.raises(ValueError):
+        settlement_period_to_utc(date(2025, 3, 30), 47)
+    with pytest.raises(ValueError):
+        settlement_period_to_utc(date(2025, 1, 15), 0)